@@ -0,0 +1,57 @@
+"""
+Micro-benchmark for decoder dispatch.
+
+Compares the previous dispatch, which created a new decoder for every advertisement,
+with the shared decoders from the decoder registry.
+
+Usage:
+    python benchmarks/decoder_dispatch.py [-k FILTER] [--json results.json]
+"""
+
+from harness import run
+
+from ruuvitag_sensor.decoder import (
+    Df3Decoder,
+    Df5Decoder,
+    Df6Decoder,
+    DfE1Decoder,
+    UrlDecoder,
+    get_bytes_decoder,
+    get_decoder,
+)
+
+DF5_HEX = "0512FC5394C37C0004FFFC040CAC364200CDCBB8334C884FC6"
+DF5_BYTES = bytes.fromhex(DF5_HEX[:48])
+
+
+def _get_decoder_per_packet(data_format: int | str):
+    # Dispatch before the decoder registry: a match statement and a new decoder instance for each call
+    match data_format:
+        case 5:
+            return Df5Decoder()
+        case 6:
+            return Df6Decoder()
+        case "E1":
+            return DfE1Decoder()
+        case 2 | 4:
+            return UrlDecoder()
+        case 3:
+            return Df3Decoder()
+        case _:
+            raise ValueError(f"Unknown data format: {data_format}")
+
+
+def main() -> None:
+    benchmarks = {
+        "dispatch: new decoder per packet": (lambda: _get_decoder_per_packet(5), 1),
+        "dispatch: registry": (lambda: get_decoder(5), 1),
+        "decode hex: new decoder per packet": (lambda: _get_decoder_per_packet(5).decode_data(DF5_HEX), 1),
+        "decode hex: registry": (lambda: get_decoder(5).decode_data(DF5_HEX), 1),
+        "decode bytes: registry": (lambda: get_bytes_decoder(5).decode_bytes(DF5_BYTES, -58), 1),
+    }
+
+    run(benchmarks, __doc__ or "")
+
+
+if __name__ == "__main__":
+    main()
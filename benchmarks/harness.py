@@ -0,0 +1,99 @@
+"""
+Shared timeit harness for the benchmarks.
+
+Each benchmark is a function without arguments that processes a known number of packets and
+returns the decoded data. Results are reported as packets per second and peak traced memory per
+packet, including the returned data, and can be written to a JSON file to compare numbers between
+versions.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+
+@dataclass
+class Result:
+    name: str
+    packets_per_sec: float
+    us_per_packet: float
+    # Peak memory allocated during one call, including the returned data, divided by packets in the call
+    alloc_bytes_per_packet: float
+
+
+def measure(name: str, func: Callable[[], object], packets: int = 1, repeat: int = 5) -> Result:
+    """
+    Measure throughput and allocations of func.
+
+    Args:
+        name (str): Benchmark name
+        func (Callable): Function to measure
+        packets (int): Number of packets processed by a single call of func
+        repeat (int): Number of timing runs. The fastest run is reported
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    seconds = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    # Warm up caches outside of tracing, so only allocations of the call itself are counted
+    func()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Result(
+        name=name,
+        packets_per_sec=packets / seconds,
+        us_per_packet=seconds / packets * 1e6,
+        alloc_bytes_per_packet=max(peak - before, 0) / packets,
+    )
+
+
+def report(result: Result) -> None:
+    print(
+        f"{result.name:<60} {result.packets_per_sec:>12,.0f} packets/s "
+        f"{result.us_per_packet:>8.2f} us/packet {result.alloc_bytes_per_packet:>8.0f} B/packet"
+    )
+
+
+def run(benchmarks: dict[str, tuple[Callable[[], object], int]], description: str) -> list[Result]:
+    """
+    Run benchmarks from the command line.
+
+    Args:
+        benchmarks (dict): Benchmark name and a tuple of the function and packets per call
+        description (str): Description for the command line help
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("-k", dest="filter", default="", help="Run only benchmarks with the text in the name")
+    parser.add_argument("--json", dest="json_path", type=Path, help="Write results to a JSON file")
+    args = parser.parse_args()
+
+    results = []
+    for name, (func, packets) in benchmarks.items():
+        if args.filter not in name:
+            continue
+        result = measure(name, func, packets)
+        report(result)
+        results.append(result)
+
+    if args.json_path:
+        output = {
+            "python": sys.version,
+            "platform": platform.platform(),
+            "results": [asdict(result) for result in results],
+        }
+        args.json_path.write_text(json.dumps(output, indent=2))
+
+    return results
@@ -0,0 +1,94 @@
+"""
+Micro-benchmarks for the history decoders over synthetic logs.
+
+Usage:
+    python benchmarks/history.py [-k FILTER] [--json results.json]
+"""
+
+import struct
+from collections.abc import Callable
+
+from harness import run
+
+from ruuvitag_sensor.decoder import AirHistoryDecoder, HistoryDecoder
+
+RECORD_COUNT = 10_000
+# Ruuvi Air sends multiple records in one packet
+AIR_RECORDS_PER_PACKET = 6
+
+
+def create_tag_log(count: int) -> list[bytearray]:
+    # Temperature, humidity and pressure records, each in its own packet
+    return [
+        bytearray(struct.pack(">BBBIHH", 0x3A, 0x30 + i % 3, 0x10, 1733760000 + i // 3 * 300, 0, 2000 + i % 500))
+        for i in range(count)
+    ]
+
+
+def create_air_log(count: int) -> list[bytearray]:
+    records = [
+        struct.pack(
+            ">IBhHHHHHHHBB6x3sB5x",
+            1733760000 + i * 300,
+            0xE1,
+            4860 + i % 100,
+            21396,
+            50000,
+            50,
+            100,
+            80,
+            120,
+            450,
+            50,
+            25,
+            i.to_bytes(3, "big"),
+            0,
+        )
+        for i in range(count)
+    ]
+    packets = []
+    for i in range(0, count, AIR_RECORDS_PER_PACKET):
+        chunk = records[i : i + AIR_RECORDS_PER_PACKET]
+        packets.append(bytearray(bytes([0x3B, 0x3B, 0x20, len(chunk), 38]) + b"".join(chunk)))
+    return packets
+
+
+def main() -> None:
+    tag_log = create_tag_log(RECORD_COUNT)
+    air_log = create_air_log(RECORD_COUNT)
+    tag_decoder = HistoryDecoder()
+    air_decoder = AirHistoryDecoder()
+
+    def decode_tag_log() -> list:
+        return [tag_decoder.decode_data(packet) for packet in tag_log]
+
+    tag_buffer = b"".join(tag_log)
+
+    def decode_air_log() -> list:
+        return [air_decoder.decode_data(packet) for packet in air_log]
+
+    benchmarks: dict[str, tuple[Callable[[], object], int]] = {
+        "HistoryDecoder.decode_data": (decode_tag_log, RECORD_COUNT),
+        "HistoryDecoder.decode_buffer": (lambda: tag_decoder.decode_buffer(tag_buffer), RECORD_COUNT),
+        "AirHistoryDecoder.decode_data": (decode_air_log, RECORD_COUNT),
+        "AirHistoryDecoder.decode_columns: array": (
+            lambda: air_decoder.decode_columns(air_log, use_numpy=False),
+            RECORD_COUNT,
+        ),
+    }
+
+    try:
+        import numpy  # noqa: F401, PLC0415
+
+        benchmarks["AirHistoryDecoder.decode_columns: numpy"] = (
+            lambda: air_decoder.decode_columns(air_log, use_numpy=True),
+            RECORD_COUNT,
+        )
+    except ImportError:
+        pass
+
+    run(benchmarks, __doc__ or "")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Micro-benchmarks for the advertisement to sensor data hot path.
+
+Measures data format detection, decoders, RuuviTagSensor._parse_data and the BlueZ adapters
+over the hcidump captures in tests/.
+
+Usage:
+    python benchmarks/hot_path.py [-k FILTER] [--json results.json]
+"""
+
+import struct
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+
+from harness import run
+
+from ruuvitag_sensor.adapters.nix_hci import BleCommunicationNix
+from ruuvitag_sensor.adapters.nix_hci_file import BleCommunicationNixFile
+from ruuvitag_sensor.adapters.nix_hci_socket import BleCommunicationNixSocketFile
+from ruuvitag_sensor.data_formats import DataFormats
+from ruuvitag_sensor.decoder import get_bytes_decoder, get_decoder
+from ruuvitag_sensor.mac_blacklist import MacBlacklist
+from ruuvitag_sensor.ruuvi import RuuviTagSensor
+
+CAPTURES = sorted((Path(__file__).parent.parent / "tests").glob("hcidump-*.txt"))
+
+# Advertisement data after the MAC, as received from BleCommunicationNix
+ADVERTISEMENTS = {
+    3: "1902010415FF990403291A1ECE1E02DEF94202CA0B5300000000BB",
+    5: "1F0201061BFF99040512FC5394C37C0004FFFC040CAC364200CDCBB8334C884FC4",
+    6: "1702010613FF990406170C5668C79E007000C90501D9FFCD004C884F",
+    "E1": "2C0201062AFF9904E1170C5668C79E0065007004BD11CA00C90A0213E0ACFFFFFFDECDEE11FFFFFFFFFFCBB8334C884F",
+    2: "1E0201060303AAFE1616AAFE10EE037275752E76692F23416A7759414D4663CD",
+}
+
+# Advertisement data of other devices, which are most of the received advertisements in crowded places
+OTHER_ADVERTISEMENTS = {
+    "iBeacon": "1E02011A1AFF4C000215FDA50693A4E24FB1AFCFC6EB0764782500010002C5C4",
+    "Eddystone UID": "1D0201060303AAFE1516ABFE00E700010203040506070809000102030405C4",
+}
+
+# Sensor data as returned by DataFormats.convert_data
+SENSOR_DATA = {
+    3: "03291A1ECE1E02DEF94202CA0B5300000000BB",
+    5: "0512FC5394C37C0004FFFC040CAC364200CDCBB8334C884FC4",
+    6: "06170C5668C79E007000C90501D9FFCD004C884F",
+    "E1": "E1170C5668C79E0065007004BD11CA00C90A0213E0ACFFFFFFDECDEE11FFFFFFFFFFCBB8334C884F",
+    2: "AjwYAMFc",
+}
+
+MAC = "CB:B8:33:4C:88:4F"
+DF5_PAYLOAD = bytes.fromhex(SENSOR_DATA[5][:48])
+
+
+def _capture_lines(path: Path) -> list[str]:
+    with path.open("rb") as handle:
+        return [line for line in BleCommunicationNix.get_lines(handle) if line]
+
+
+def _write_btsnoop(lines: list[str], path: Path) -> None:
+    # hcidump lines start from the H4 packet type, so they can be written with the UART datalink
+    with path.open("wb") as handle:
+        handle.write(struct.pack(">8sII", b"btsnoop\x00", 1, 1002))
+        for line in lines:
+            packet = bytes.fromhex(line)
+            handle.write(struct.pack(">IIIIq", len(packet), len(packet), 0x03, 0, 0) + packet)
+
+
+def _consume(func: Callable[[], object]) -> Callable[[], list]:
+    # Keep the received data, so it is included in the measured allocations
+    def consume() -> list:
+        return list(func())  # type: ignore[call-overload]
+
+    return consume
+
+
+def _read_common_values(reading):
+    return (reading["temperature"], reading["humidity"], reading["battery"])
+
+
+def main() -> None:
+    blacklist = MacBlacklist()
+    benchmarks: dict[str, tuple[Callable[[], object], int]] = {}
+
+    for data_format, raw in ADVERTISEMENTS.items():
+        benchmarks[f"convert_data: {data_format}"] = (lambda raw=raw: DataFormats.convert_data(raw), 1)
+    for device, other in OTHER_ADVERTISEMENTS.items():
+        benchmarks[f"convert_data: {device}"] = (lambda other=other: DataFormats.convert_data(other), 1)
+
+    for name, advertisement in (("5", ADVERTISEMENTS[5]), ("iBeacon", OTHER_ADVERTISEMENTS["iBeacon"])):
+        # Advertising data without the total length byte and RSSI
+        ad_data = bytes.fromhex(advertisement)[1:-1]
+        benchmarks[f"convert_advertisement: {name}"] = (
+            lambda ad_data=ad_data: DataFormats.convert_advertisement(ad_data),
+            1,
+        )
+
+    for data_format, data in SENSOR_DATA.items():
+        decoder = get_decoder(data_format)
+        benchmarks[f"decode_data: {data_format}"] = (lambda decoder=decoder, data=data: decoder.decode_data(data), 1)
+
+    for data_format, data in SENSOR_DATA.items():
+        if data_format == 2:
+            continue
+        payload = bytes.fromhex(data)
+        decoder = get_bytes_decoder(data_format)
+        benchmarks[f"decode_bytes: {data_format}"] = (
+            lambda decoder=decoder, payload=payload: decoder.decode_bytes(payload),
+            1,
+        )
+
+    for data_format in (5, 6, "E1"):
+        payload = bytes.fromhex(SENSOR_DATA[data_format])
+        decoder = get_bytes_decoder(data_format)
+        benchmarks[f"decode_reading: {data_format}"] = (
+            lambda decoder=decoder, payload=payload: decoder.decode_reading(payload),  # type: ignore[union-attr]
+            1,
+        )
+
+    df5_decoder = get_bytes_decoder(5)
+    benchmarks["decode_lazy: 5"] = (lambda: df5_decoder.decode_lazy(DF5_PAYLOAD), 1)  # type: ignore[union-attr]
+    benchmarks["decode_lazy: 5 with 3 values"] = (
+        lambda: _read_common_values(df5_decoder.decode_lazy(DF5_PAYLOAD)),  # type: ignore[union-attr]
+        1,
+    )
+
+    benchmarks["convert_manufacturer_data: 5"] = (
+        lambda: DataFormats.convert_manufacturer_data(DF5_PAYLOAD),
+        1,
+    )
+    benchmarks["_parse_data: hex 5"] = (
+        lambda: RuuviTagSensor._parse_data((MAC, ADVERTISEMENTS[5]), blacklist),
+        1,
+    )
+    benchmarks["_parse_data: bytes 5"] = (
+        lambda: RuuviTagSensor._parse_data((MAC, DF5_PAYLOAD, -60), blacklist),
+        1,
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for capture in CAPTURES:
+            lines = _capture_lines(capture)
+            btsnoop = Path(tmp_dir) / f"{capture.stem}.btsnoop"
+            _write_btsnoop(lines, btsnoop)
+
+            benchmarks[f"BleCommunicationNix.get_data: {capture.name}"] = (
+                _consume(lambda capture=capture: BleCommunicationNixFile.get_data([], str(capture))),
+                len(lines),
+            )
+            benchmarks[f"BleCommunicationNixSocket.get_data_bytes: {capture.name}"] = (
+                _consume(lambda btsnoop=btsnoop: BleCommunicationNixSocketFile.get_data_bytes([], str(btsnoop))),
+                len(lines),
+            )
+
+        run(benchmarks, __doc__ or "")
+
+
+if __name__ == "__main__":
+    main()
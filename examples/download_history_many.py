@@ -0,0 +1,31 @@
+import asyncio
+from datetime import datetime, timezone
+
+import ruuvitag_sensor.log
+from ruuvitag_sensor.ruuvi import RuuviTagSensor
+
+ruuvitag_sensor.log.enable_console()
+
+
+async def main():
+    # MAC address and device type ("ruuvitag" or "ruuvi_air")
+    devices = {
+        "CA:F7:44:DE:EB:E1": "ruuvitag",
+        "D2:A3:6E:C8:E0:25": "ruuvitag",
+        "F1:2C:6A:1E:59:3D": "ruuvi_air",
+    }
+    # Time of the last successful download. Devices that have never been downloaded are downloaded first
+    last_downloaded: dict[str, datetime] = {}
+
+    async for result in RuuviTagSensor.download_history_many(
+        devices, max_concurrent=2, last_downloaded=last_downloaded
+    ):
+        if result.error:
+            print(f"{result.mac}: failed after {result.attempts} attempts - {result.error}")
+            continue
+        last_downloaded[result.mac] = datetime.now(timezone.utc)
+        print(f"{result.mac}: {len(result.data)} entries")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,3 +1,9 @@
-import importlib.metadata
+def __getattr__(name: str):
+    # Version is read on first access, as importlib.metadata takes longer to import than the package itself
+    if name == "__version__":
+        import importlib.metadata  # noqa: PLC0415
 
-__version__ = importlib.metadata.version(__package__ or __name__)
+        version = importlib.metadata.version(__package__ or __name__)
+        globals()["__version__"] = version
+        return version
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
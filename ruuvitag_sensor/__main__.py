@@ -63,8 +63,12 @@ if __name__ == "__main__":
     )
     parser.add_argument("--version", action="version", version=f"%(prog)s {ruuvitag_sensor.__version__}")
     parser.add_argument("--debug", action="store_true", dest="debug_action", help="Enable debug logging")
+    parser.add_argument("--log-file", dest="log_file", help="Log errors to a file")
     args = parser.parse_args()
 
+    if args.log_file:
+        ruuvitag_sensor.log.enable_file(args.log_file)
+
     if args.debug_action:
         log.setLevel(logging.DEBUG)
         for handler in log.handlers:
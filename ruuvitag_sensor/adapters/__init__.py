@@ -8,7 +8,7 @@ from ruuvitag_sensor.ruuvi_types import MacAndRawData, RawData
 # ruff: noqa: PLC0415
 
 
-def get_ble_adapter():
+def get_ble_adapter():  # noqa: PLR0911
     forced_ble_adapter = os.environ.get("RUUVI_BLE_ADAPTER", "").lower()
     use_ruuvi_nix_from_file = "RUUVI_NIX_FROMFILE" in os.environ
     is_ci_env = "CI" in os.environ
@@ -22,6 +22,10 @@ def get_ble_adapter():
             from ruuvitag_sensor.adapters.bleson import BleCommunicationBleson
 
             return BleCommunicationBleson()
+        if "bluez_socket" in forced_ble_adapter:
+            from ruuvitag_sensor.adapters.nix_hci_socket import BleCommunicationNixSocket
+
+            return BleCommunicationNixSocket()
         if "bluez" in forced_ble_adapter:
             from ruuvitag_sensor.adapters.nix_hci import BleCommunicationNix
 
@@ -51,6 +55,16 @@ def is_async_adapter(ble: object):
     return issubclass(type(ble), BleCommunicationAsync)
 
 
+def is_subprocess_adapter(ble: object):
+    """Adapter reads data in another process, so shared state must use multiprocessing proxies"""
+    return getattr(ble, "uses_subprocess", False)
+
+
+def is_bytes_adapter(ble: object):
+    """Adapter can deliver manufacturer specific data as bytes with get_data_bytes"""
+    return callable(getattr(ble, "get_data_bytes", None))
+
+
 def is_async_from_env():
     return "bleak" in os.environ.get("RUUVI_BLE_ADAPTER", "").lower()
 
@@ -70,14 +84,14 @@ class BleCommunication:
 
     __metaclass__ = abc.ABCMeta
 
-    @staticmethod
+    uses_subprocess = False
+
     @abc.abstractmethod
-    def get_first_data(mac: str, bt_device: str = "") -> RawData:
+    def get_first_data(self, mac: str, bt_device: str = "") -> RawData:
         pass
 
-    @staticmethod
     @abc.abstractmethod
-    def get_data(blacklist: list[str] | None = None, bt_device: str = "") -> Generator[MacAndRawData, None, None]:
+    def get_data(self, blacklist: list[str] | None = None, bt_device: str = "") -> Generator[MacAndRawData, None, None]:
         pass
 
 
@@ -86,14 +100,16 @@ class BleCommunicationAsync:
 
     __metaclass__ = abc.ABCMeta
 
-    @staticmethod
+    uses_subprocess = False
+
     @abc.abstractmethod
-    async def get_first_data(mac: str, bt_device: str = "") -> RawData:
+    async def get_first_data(self, mac: str, bt_device: str = "") -> RawData:
         pass
 
-    @staticmethod
     @abc.abstractmethod
-    async def get_data(blacklist: list[str] | None = None, bt_device: str = "") -> AsyncGenerator[MacAndRawData, None]:
+    async def get_data(
+        self, blacklist: list[str] | None = None, bt_device: str = ""
+    ) -> AsyncGenerator[MacAndRawData, None]:
         raise NotImplementedError("must implement get_data()")
         # https://github.com/python/mypy/issues/5070
         # if False: yield is a mypy fix for
@@ -3,7 +3,9 @@ import logging
 import os
 import re
 import sys
+import time
 from collections.abc import AsyncGenerator, Callable
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from enum import Enum
 
@@ -11,8 +13,12 @@ from bleak import BleakClient, BleakGATTCharacteristic, BleakScanner
 from bleak.backends.scanner import AdvertisementData, AdvertisementDataCallback, BLEDevice
 
 from ruuvitag_sensor.adapters import BleCommunicationAsync
+from ruuvitag_sensor.adapters.gatt_pool import GattConnection, GattConnectionPool
+from ruuvitag_sensor.adapters.history_frames import AirHistoryFrameReassembler
+from ruuvitag_sensor.adapters.history_transfer import AdaptiveTimeout, HistoryTransferStats, HistoryTransferTimeoutError
+from ruuvitag_sensor.adapters.scan_queue import OverflowPolicy, ScanQueue, ScanQueueStats
 from ruuvitag_sensor.adapters.utils import rssi_to_hex
-from ruuvitag_sensor.ruuvi_types import MacAndRawData, RawData
+from ruuvitag_sensor.ruuvi_types import MacAndRawBytes, MacAndRawData, RawData
 
 MAC_REGEX = "[0-9a-f]{2}([:])[0-9a-f]{2}(\\1[0-9a-f]{2}){4}$"
 RUUVI_HISTORY_SERVICE_UUID = "6E400001-B5A3-F393-E0A9-E50E24DCCA9E"
@@ -40,8 +46,6 @@ def _get_scanner(detection_callback: AdvertisementDataCallback, bt_device: str =
     return BleakScanner(detection_callback=detection_callback, scanning_mode=scanning_mode)  # type: ignore[arg-type]
 
 
-queue = asyncio.Queue[tuple[str, str]]()
-
 log = logging.getLogger(__name__)
 
 
@@ -55,6 +59,41 @@ class HistoryNotificationAction(str, Enum):
 
 
 class BleCommunicationBleak(BleCommunicationAsync):
+    """
+    Bluetooth LE communication with Bleak.
+
+    Each get_data call has its own bounded scan queue, so concurrent scanners don't share items and a slow
+    consumer can't grow memory without limit.
+
+    Args:
+        queue_maxsize (int): Maximum number of queued advertisements per scanner. 0 means unbounded. Default 1000
+        overflow_policy (OverflowPolicy): Which advertisement is dropped when the queue is full. Default DROP_OLDEST
+        connection_pool (GattConnectionPool): Keep GATT connections open between history reads.
+            Default None, which connects and disconnects for every read
+        history_stats_callback (Callable): Called with HistoryTransferStats when a history transfer ends
+        history_timeout_sec (float): Maximum time to wait for history data. Default 10
+        history_min_timeout_sec (float): Minimum time to wait for history data after the transfer has started.
+            Actual timeout adapts to the gaps between notifications. Default 2
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        queue_maxsize: int = 1000,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        connection_pool: GattConnectionPool | None = None,
+        history_stats_callback: Callable[[HistoryTransferStats], None] | None = None,
+        history_timeout_sec: float = 10.0,
+        history_min_timeout_sec: float = 2.0,
+    ):
+        self.queue_maxsize = queue_maxsize
+        self.overflow_policy = OverflowPolicy(overflow_policy)
+        self.connection_pool = connection_pool
+        self.history_stats_callback = history_stats_callback
+        self.history_timeout_sec = history_timeout_sec
+        self.history_min_timeout_sec = history_min_timeout_sec
+        # Counters are shared by all scanners of this adapter
+        self.queue_stats = ScanQueueStats()
+
     @staticmethod
     def _parse_data(data: bytes) -> str:
         # Bleak returns data in a different format than the nix_hci
@@ -76,8 +115,28 @@ class BleCommunicationBleak(BleCommunicationAsync):
         formatted = f"{(len(formatted) >> 1):02x}{formatted}"
         return formatted
 
-    @staticmethod
-    async def get_data(blacklist: list[str] | None = None, bt_device: str = "") -> AsyncGenerator[MacAndRawData, None]:
+    async def get_data(
+        self, blacklist: list[str] | None = None, bt_device: str = ""
+    ) -> AsyncGenerator[MacAndRawData, None]:
+        data_iter = self.get_data_bytes(blacklist, bt_device)
+        try:
+            async for mac, data, rssi in data_iter:
+                # Add RSSI to encoded data as hex. All adapters use a common decoder.
+                yield (mac, BleCommunicationBleak._parse_data(data) + rssi_to_hex(rssi or 0))
+        finally:
+            await data_iter.aclose()
+
+    async def get_data_bytes(
+        self, blacklist: list[str] | None = None, bt_device: str = ""
+    ) -> AsyncGenerator[MacAndRawBytes, None]:
+        """
+        Get Ruuvi manufacturer specific data as bytes without converting it to a hex string.
+
+        Yields:
+            tuple: MAC, manufacturer specific data without the company identifier and RSSI
+        """
+        queue = ScanQueue[MacAndRawBytes](self.queue_maxsize, self.overflow_policy, self.queue_stats)
+
         async def detection_callback(device: BLEDevice, advertisement_data: AdvertisementData):
             # On macOS device address is not a MAC address, but a system specific ID
             # https://github.com/hbldh/bleak/issues/140
@@ -92,11 +151,7 @@ class BleCommunicationBleak(BleCommunicationAsync):
 
             log.debug("Received data: %s", advertisement_data)
 
-            data = BleCommunicationBleak._parse_data(advertisement_data.manufacturer_data[1177])
-
-            # Add RSSI to encoded data as hex. All adapters use a common decoder.
-            data += rssi_to_hex(advertisement_data.rssi)
-            await queue.put((mac, data))
+            queue.put_nowait((mac, advertisement_data.manufacturer_data[1177], advertisement_data.rssi))
 
         scanner = _get_scanner(detection_callback, bt_device)
         await scanner.start()
@@ -105,7 +160,7 @@ class BleCommunicationBleak(BleCommunicationAsync):
 
         try:
             while True:
-                next_item: tuple[str, str] = await queue.get()
+                next_item: MacAndRawBytes = await queue.get()
                 yield next_item
         except KeyboardInterrupt:
             pass
@@ -113,20 +168,22 @@ class BleCommunicationBleak(BleCommunicationAsync):
             pass
         except Exception as ex:
             log.info(ex)
+        finally:
+            # Stop scanner also when the reading task is cancelled
+            await scanner.stop()
 
-        await scanner.stop()
-
-        log.debug("Bleak scanner stopped")
+            log.debug(
+                "Bleak scanner stopped. Received: %s, dropped: %s", self.queue_stats.received, self.queue_stats.dropped
+            )
 
-    @staticmethod
-    async def get_first_data(mac: str, bt_device: str = "") -> RawData:
+    async def get_first_data(self, mac: str, bt_device: str = "") -> RawData:
         """
         NOTE: get_first_data does not work on macOS.
 
         macOS doesn't return MAC address, as it uses system specific IDs
         """
         data = None
-        data_iter = BleCommunicationBleak.get_data([], bt_device)
+        data_iter = self.get_data([], bt_device)
         async for d in data_iter:
             if mac == d[0]:
                 log.info("Data found")
@@ -141,7 +198,7 @@ class BleCommunicationBleak(BleCommunicationAsync):
         start_time: datetime | None = None,
         max_items: int | None = None,
         device_type: str = "ruuvitag",
-    ) -> AsyncGenerator[bytearray, None]:
+    ) -> AsyncGenerator[bytearray | memoryview, None]:
         """
         Get history data from a RuuviTag or Ruuvi Air using GATT connection.
 
@@ -153,47 +210,87 @@ class BleCommunicationBleak(BleCommunicationAsync):
                 "ruuvitag" for RuuviTag (default: "ruuvitag")
 
         Yields:
-            bytearray: Raw history data entries (packets for Ruuvi Air, single records for RuuviTag)
+            bytearray | memoryview: Raw history data entries (packets for Ruuvi Air as memoryviews,
+                single records for RuuviTag)
 
         Raises:
             RuntimeError: If connection fails or required services not found
+            HistoryTransferTimeoutError: If the device stops sending history data before the end of the log
         """
-        client = None
+        is_ruuvi_air = device_type == "ruuvi_air"
+        stats = HistoryTransferStats(mac, device_type)
+        timeout = AdaptiveTimeout(self.history_timeout_sec, self.history_min_timeout_sec, self.history_timeout_sec)
         try:
-            log.debug("Connecting to device %s", mac)
-            client = await self._connect_gatt(mac)
-            log.debug("Connected to device %s", mac)
-
-            is_ruuvi_air = device_type == "ruuvi_air"
-
-            # Try to negotiate larger MTU for Ruuvi Air (recommended: 247+ bytes)
-            if is_ruuvi_air:
-                await self._try_set_ruuvi_air_mtu(client)
-
-            tx_char, rx_char = self._get_history_service_characteristics(client)
+            async with self._history_connection(mac, is_ruuvi_air) as connection:
+                stats.mtu = getattr(connection.client, "mtu_size", None)
+                data_queue: asyncio.Queue[bytearray | memoryview | None] = asyncio.Queue()
+                # Reassembles Ruuvi Air packets that are split across notifications
+                frames = AirHistoryFrameReassembler()
+                connection.notification_handler = self._create_history_notification_handler(
+                    is_ruuvi_air, frames, data_queue, stats, timeout
+                )
 
-            data_queue: asyncio.Queue[bytearray | None] = asyncio.Queue()
-            # Buffer for assembling split Ruuvi Air packets
-            packet_buffer = bytearray()
-            notification_handler = self._create_history_notification_handler(is_ruuvi_air, packet_buffer, data_queue)
-            await client.start_notify(tx_char, notification_handler)
+                command = self._create_send_history_command(start_time, use_air_format=is_ruuvi_air)
 
-            command = self._create_send_history_command(start_time, use_air_format=is_ruuvi_air)
+                log.debug("Sending command: %s", command.hex())
+                await connection.client.write_gatt_char(connection.rx_char, command)
+                log.debug("Sent history command to device")
 
-            log.debug("Sending command: %s", command.hex())
-            await client.write_gatt_char(rx_char, command)
-            log.debug("Sent history command to device")
+                async for packet in self._iter_history_queue(
+                    data_queue, max_items=max_items, timeout=timeout, stats=stats
+                ):
+                    yield packet
 
-            async for packet in self._iter_history_queue(data_queue, max_items=max_items):
-                yield packet
+                # Device doesn't send more history after the end marker, so the connection can be reused
+                connection.reusable = stats.finished
 
         except Exception as e:
             log.error("Failed to get history data from device %s: %r", mac, e)
             raise
         finally:
-            if client:
-                await client.disconnect()
-                log.debug("Disconnected from device %s", mac)
+            stats.ended = time.monotonic()
+            log.debug(
+                "History transfer from %s: %s records in %.1fs (%.0f bytes/s, %.0f records/s)",
+                mac,
+                stats.records,
+                stats.elapsed_sec,
+                stats.bytes_per_sec,
+                stats.records_per_sec,
+            )
+            if self.history_stats_callback:
+                self.history_stats_callback(stats)
+
+    @asynccontextmanager
+    async def _history_connection(self, mac: str, is_ruuvi_air: bool) -> AsyncGenerator[GattConnection, None]:
+        if self.connection_pool is not None:
+            async with self.connection_pool.connection(
+                mac, lambda address: self._open_history_connection(address, is_ruuvi_air)
+            ) as connection:
+                yield connection
+            return
+
+        connection = await self._open_history_connection(mac, is_ruuvi_air)
+        try:
+            yield connection
+        finally:
+            await connection.close()
+
+    async def _open_history_connection(self, mac: str, is_ruuvi_air: bool) -> GattConnection:
+        log.debug("Connecting to device %s", mac)
+        client = await self._connect_gatt(mac)
+        log.debug("Connected to device %s", mac)
+        try:
+            # Try to negotiate larger MTU for Ruuvi Air (recommended: 247+ bytes)
+            if is_ruuvi_air:
+                await self._try_set_ruuvi_air_mtu(client)
+
+            tx_char, rx_char = self._get_history_service_characteristics(client)
+            connection = GattConnection(client, tx_char, rx_char)
+            await client.start_notify(tx_char, connection.on_notification)
+        except Exception:
+            await client.disconnect()
+            raise
+        return connection
 
     async def _connect_gatt(self, mac: str, max_retries: int = 3) -> BleakClient:
         # Connect to a BLE device using GATT.
@@ -224,41 +321,62 @@ class BleCommunicationBleak(BleCommunicationAsync):
     def _create_history_notification_handler(
         self,
         is_ruuvi_air: bool,
-        packet_buffer: bytearray,
-        queue: asyncio.Queue[bytearray | None],
+        frames: AirHistoryFrameReassembler,
+        queue: asyncio.Queue[bytearray | memoryview | None],
+        stats: HistoryTransferStats,
+        timeout: AdaptiveTimeout,
     ) -> Callable[[BleakGATTCharacteristic, bytearray], None]:
         if is_ruuvi_air:
-            return self._create_ruuvi_air_history_notification_handler(packet_buffer, queue)
-        return self._create_ruuvitag_history_notification_handler(queue)
+            handler = self._create_ruuvi_air_history_notification_handler(frames, queue, stats)
+        else:
+            handler = self._create_ruuvitag_history_notification_handler(queue, stats)
+
+        def count_notification(char: BleakGATTCharacteristic, data: bytearray) -> None:
+            stats.notifications += 1
+            stats.bytes_received += len(data)
+            timeout.observe()
+            handler(char, data)
+
+        return count_notification
 
     def _create_ruuvi_air_history_notification_handler(
-        self, packet_buffer: bytearray, queue: asyncio.Queue[bytearray | None]
+        self,
+        frames: AirHistoryFrameReassembler,
+        queue: asyncio.Queue[bytearray | memoryview | None],
+        stats: HistoryTransferStats,
     ) -> Callable[[BleakGATTCharacteristic, bytearray], None]:
         def handler(_, data: bytearray) -> None:
             if data and data[0] == 0x05:
                 log.debug("Ignoring heartbeat data")
+                stats.heartbeats_ignored += 1
                 return
 
-            packet_buffer.extend(data)
-            for packet in self._extract_ruuvi_air_history_packets(packet_buffer):
+            for packet in frames.feed(data):
                 action, processed_data = self._process_history_notification(packet, True)
+                if action == HistoryNotificationAction.DATA:
+                    stats.packets += 1
+                    stats.records += packet[3]
                 if self._enqueue_history_notification(action, processed_data, queue):
-                    packet_buffer.clear()
+                    frames.clear()
                     break
 
         return handler
 
     def _create_ruuvitag_history_notification_handler(
-        self, queue: asyncio.Queue[bytearray | None]
+        self, queue: asyncio.Queue[bytearray | memoryview | None], stats: HistoryTransferStats
     ) -> Callable[[BleakGATTCharacteristic, bytearray], None]:
         def handler(_, data: bytearray) -> None:
             if data and data[0] == 0x05:
                 log.debug("Ignoring heartbeat data")
+                stats.heartbeats_ignored += 1
                 return
 
             action, processed_data = self._process_history_notification(data, False)
             if action == HistoryNotificationAction.IGNORE:
                 return
+            if action == HistoryNotificationAction.DATA:
+                stats.packets += 1
+                stats.records += 1
 
             log.debug("Received data: %s", processed_data)
             self._enqueue_history_notification(action, processed_data, queue)
@@ -267,20 +385,28 @@ class BleCommunicationBleak(BleCommunicationAsync):
 
     async def _iter_history_queue(
         self,
-        queue: asyncio.Queue[bytearray | None],
+        queue: asyncio.Queue[bytearray | memoryview | None],
         *,
         max_items: int | None,
-        timeout_sec: float = 10.0,
-    ) -> AsyncGenerator[bytearray, None]:
+        timeout: AdaptiveTimeout | None = None,
+        stats: HistoryTransferStats | None = None,
+    ) -> AsyncGenerator[bytearray | memoryview, None]:
+        timeout = timeout or AdaptiveTimeout()
         items_received = 0
         while True:
             try:
-                data = await asyncio.wait_for(queue.get(), timeout=timeout_sec)
-            except asyncio.TimeoutError:
-                log.error("Timeout waiting for history data")
-                return
+                data = await asyncio.wait_for(queue.get(), timeout=timeout.timeout_sec)
+            except asyncio.TimeoutError as err:
+                if stats is not None:
+                    stats.timed_out = True
+                # Raise instead of ending the data, so callers don't handle a partial transfer as complete
+                raise HistoryTransferTimeoutError(
+                    f"Timeout waiting for history data ({timeout.timeout_sec:.1f}s)"
+                ) from err
 
             if data is None:
+                if stats is not None:
+                    stats.finished = True
                 return
 
             yield data
@@ -291,8 +417,8 @@ class BleCommunicationBleak(BleCommunicationAsync):
     @staticmethod
     def _enqueue_history_notification(
         action: HistoryNotificationAction,
-        processed_data: bytearray | None,
-        queue: asyncio.Queue[bytearray | None],
+        processed_data: bytearray | memoryview | None,
+        queue: asyncio.Queue[bytearray | memoryview | None],
     ) -> bool:
         """Enqueue processed history data and signal end/error with a None sentinel."""
         if action == HistoryNotificationAction.IGNORE:
@@ -303,50 +429,6 @@ class BleCommunicationBleak(BleCommunicationAsync):
             return True
         return False
 
-    @staticmethod
-    def _extract_ruuvi_air_history_packets(buffer: bytearray) -> list[bytearray]:
-        """
-        Extract complete Ruuvi Air history packets from a buffer.
-
-        Ruuvi Air multi-record response packet framing (log write, multi-record):
-          0..2: 0x3B 0x3B 0x20
-          3:    num_records
-          4:    record_length (expected 38 bytes)
-          5..:  records (num_records * record_length)
-
-        Packets may arrive split across BLE notifications, so we accumulate into a buffer and slice
-        out complete frames when enough bytes are present.
-        """
-        header = b"\x3b\x3b\x20"
-        packets: list[bytearray] = []
-
-        while True:
-            pos = buffer.find(header)
-            if pos == -1:
-                # Keep last 2 bytes in case header spans notifications.
-                if len(buffer) > 2:
-                    del buffer[:-2]
-                return packets
-            if pos > 0:
-                del buffer[:pos]
-
-            if len(buffer) < 5:
-                return packets
-
-            num_records = buffer[3]
-            record_length = buffer[4]
-            if record_length == 0:
-                # Invalid; drop one byte and attempt to resync.
-                del buffer[0]
-                continue
-
-            expected_size = 5 + (num_records * record_length)
-            if len(buffer) < expected_size:
-                return packets
-
-            packets.append(bytearray(buffer[:expected_size]))
-            del buffer[:expected_size]
-
     def _get_history_service_characteristics(
         self, client: BleakClient
     ) -> tuple[BleakGATTCharacteristic, BleakGATTCharacteristic]:
@@ -413,8 +495,8 @@ class BleCommunicationBleak(BleCommunicationAsync):
 
     @staticmethod
     def _process_history_notification(
-        data: bytearray, is_ruuvi_air: bool = False
-    ) -> tuple[HistoryNotificationAction, bytearray | None]:
+        data: bytearray | memoryview, is_ruuvi_air: bool = False
+    ) -> tuple[HistoryNotificationAction, bytearray | memoryview | None]:
         """
         Process history notification data and determine the action to take.
 
@@ -432,7 +514,7 @@ class BleCommunicationBleak(BleCommunicationAsync):
         - Ruuvi Air: https://github.com/ruuvi/docs/blob/8161abb9a08840fceb409aab69d6a7c12d3d5511/communication/bluetooth-connection/nordic-uart-service-nus/read-logged-history-ruuvi-air.md
         """
         action = HistoryNotificationAction.DATA
-        processed: bytearray | None = data
+        processed: bytearray | memoryview | None = data
 
         # Ignore heartbeat data that starts with 0x05
         if data and data[0] == 0x05:
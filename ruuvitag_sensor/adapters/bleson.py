@@ -1,71 +1,121 @@
 import logging
-import sys
-import time
+import os
+import struct
 from collections.abc import Generator
-from multiprocessing import Manager, Process
+from enum import Enum
+from multiprocessing import Event, Pipe, Process
 from queue import Queue
 
 from bleson import Observer, get_provider
 
 from ruuvitag_sensor.adapters import BleCommunication
 from ruuvitag_sensor.adapters.utils import rssi_to_hex
-from ruuvitag_sensor.ruuvi_types import MacAndRawData, RawData
+from ruuvitag_sensor.ruuvi_types import MacAndRawBytes, MacAndRawData, RawData
 
 log = logging.getLogger(__name__)
 
+# Manufacturer specific data of Ruuvi Innovations starts with the company identifier 0x0499 (little-endian)
+RUUVI_COMPANY_ID_BYTES = b"\x99\x04"
+
+# Record sent from the background process: MAC, RSSI and manufacturer specific data
+_RECORD_HEADER = struct.Struct("<6sb")
+_NO_MAC = bytes(6)
+
+# MAC, manufacturer specific data with the company identifier and RSSI
+MacMfgDataAndRssi = tuple[str, bytes, int]
+
+
+class BlesonMode(str, Enum):
+    """Where the Bleson observer is run."""
+
+    THREAD = "thread"  # Observer thread in the current process
+    PROCESS = "process"  # Background process, data is sent through a pipe
+
+
+def _parse_advertisement(advertisement) -> MacMfgDataAndRssi | None:
+    if advertisement.mfg_data is None:
+        return None
+    # macOS doesn't return address on advertised package
+    mac = advertisement.address.address if advertisement.address is not None else ""
+    # Linux returns bytearray for mfg_data, but macOS returns _NSInlineData
+    # which casts to byte array
+    return (mac, bytes(advertisement.mfg_data), advertisement.rssi or 0)
+
+
+def _pack_record(mac: str, mfg_data: bytes, rssi: int) -> bytes:
+    mac_bytes = bytes.fromhex(mac.replace(":", "")) if mac else _NO_MAC
+    return _RECORD_HEADER.pack(mac_bytes, rssi) + mfg_data
+
+
+def _unpack_record(record: bytes) -> MacMfgDataAndRssi:
+    mac_bytes, rssi = _RECORD_HEADER.unpack_from(record)
+    mac = mac_bytes.hex(":").upper() if mac_bytes != _NO_MAC else ""
+    return (mac, record[_RECORD_HEADER.size :], rssi)
+
+
+def _to_raw_data(mfg_data: bytes, rssi: int) -> str:
+    # Bleson returns data in a different format than the nix_hci
+    # adapter. Since the rest of the processing pipeline is
+    # somewhat reliant on the additional data, add to the
+    # beginning of the actual data:
+    #
+    # - An FF type marker
+    # - A length marker, covering the vendor specific data
+    # - Another length marker, covering the length-marked
+    #   vendor data.
+    #
+    # Thus extended, the result can be parsed by the rest of
+    # the pipeline.
+    #
+    # TODO: This is kinda awkward, and should be handled better.
+    data = f"FF{mfg_data.hex()}"
+    data = f"{(len(data) >> 1):02x}{data}"
+    data = f"{(len(data) >> 1):02x}{data}"
+
+    # Add RSSI to encoded data as hex. All adapters use a common decoder.
+    data += rssi_to_hex(rssi)
+    return data.upper()
+
 
 class BleCommunicationBleson(BleCommunication):
-    """Bluetooth LE communication with Bleson"""
+    """
+    Bluetooth LE communication with Bleson
+
+    Args:
+        mode (BlesonMode): Run the observer in a thread of the current process or in a background process.
+            Default from RUUVI_BLESON_MODE environment variable or PROCESS
+    """
+
+    def __init__(self, mode: BlesonMode | str | None = None):
+        self.mode = BlesonMode(mode or os.environ.get("RUUVI_BLESON_MODE", BlesonMode.PROCESS).lower())
+        # Blacklist is shared with the background process
+        self.uses_subprocess = self.mode == BlesonMode.PROCESS
 
     @staticmethod
-    def _run_get_data_background(queue, shared_data, bt_device):
+    def _run_get_data_background(conn, stop_event, blacklist, bt_device):
         (observer, q) = BleCommunicationBleson.start(bt_device)
 
-        for advertisement in BleCommunicationBleson.get_lines(q):
-            log.debug("Data: %s", advertisement)
-            if shared_data["stop"]:
-                break
-            try:
-                # macOS doesn't return address on advertised package
-                mac = advertisement.address.address if advertisement.address is not None else None
-                if mac and mac in shared_data["blacklist"]:
-                    log.debug("MAC blacklised: %s", mac)
-                    continue
-                if advertisement.mfg_data is None:
+        try:
+            for advertisement in BleCommunicationBleson.get_lines(q):
+                if stop_event.is_set():
+                    break
+                try:
+                    parsed = _parse_advertisement(advertisement)
+                    if parsed is None:
+                        continue
+                    mac, mfg_data, rssi = parsed
+                    if mac and blacklist and mac in blacklist:
+                        log.debug("MAC blacklised: %s", mac)
+                        continue
+                    conn.send_bytes(_pack_record(mac, mfg_data, rssi))
+                except (BrokenPipeError, EOFError):
+                    break
+                except Exception:
+                    log.exception("Error in advertisement handling")
                     continue
-                # Linux returns bytearray for mfg_data, but macOS returns _NSInlineData
-                # which casts to byte array. We need to explicitly cast it to use hex
-                data = (
-                    bytearray(advertisement.mfg_data) if sys.platform.startswith("darwin") else advertisement.mfg_data
-                )
-                # Bleson returns data in a different format than the nix_hci
-                # adapter. Since the rest of the processing pipeline is
-                # somewhat reliant on the additional data, add to the
-                # beginning of the actual data:
-                #
-                # - An FF type marker
-                # - A length marker, covering the vendor specific data
-                # - Another length marker, covering the length-marked
-                #   vendor data.
-                #
-                # Thus extended, the result can be parsed by the rest of
-                # the pipeline.
-                #
-                # TODO: This is kinda awkward, and should be handled better.
-                data = f"FF{data.hex()}"
-                data = f"{(len(data) >> 1):02x}{data}"
-                data = f"{(len(data) >> 1):02x}{data}"
-
-                # Add RSSI to encoded data as hex. All adapters use a common decoder.
-                data += rssi_to_hex(advertisement.rssi)
-                queue.put((mac, data.upper()))
-            except GeneratorExit:
-                break
-            except Exception:
-                log.exception("Error in advertisement handling")
-                continue
-
-        BleCommunicationBleson.stop(observer)
+        finally:
+            BleCommunicationBleson.stop(observer)
+            conn.close()
 
     @staticmethod
     def start(bt_device=""):
@@ -105,35 +155,78 @@ class BleCommunicationBleson(BleCommunication):
             return
 
     @staticmethod
-    def get_data(blacklist: list[str] | None = None, bt_device: str = "") -> Generator[MacAndRawData, None, None]:
-        m = Manager()
-        q = m.Queue()
+    def _get_advertisements_thread(
+        blacklist: list[str] | None, bt_device: str
+    ) -> Generator[MacMfgDataAndRssi, None, None]:
+        (observer, q) = BleCommunicationBleson.start(bt_device)
+        try:
+            for advertisement in BleCommunicationBleson.get_lines(q):
+                parsed = _parse_advertisement(advertisement)
+                if parsed is None:
+                    continue
+                if parsed[0] and blacklist and parsed[0] in blacklist:
+                    log.debug("MAC blacklised: %s", parsed[0])
+                    continue
+                yield parsed
+        finally:
+            BleCommunicationBleson.stop(observer)
 
-        # Use Manager dict to share data between processes
-        shared_data = m.dict()
-        shared_data["blacklist"] = blacklist or []
-        shared_data["stop"] = False
+    @staticmethod
+    def _get_advertisements_process(
+        blacklist: list[str] | None, bt_device: str
+    ) -> Generator[MacMfgDataAndRssi, None, None]:
+        parent_conn, child_conn = Pipe(duplex=False)
+        stop_event = Event()
 
         # Start background process
-        proc = Process(target=BleCommunicationBleson._run_get_data_background, args=[q, shared_data, bt_device])
+        proc = Process(
+            target=BleCommunicationBleson._run_get_data_background,
+            args=[child_conn, stop_event, blacklist if blacklist is not None else [], bt_device],
+        )
         proc.start()
+        # Only the background process writes to the pipe, so EOFError is received when it exits
+        child_conn.close()
 
         try:
             while True:
-                while not q.empty():
-                    data = q.get()
-                    yield data
-                time.sleep(0.1)
-        except GeneratorExit:
-            pass
+                yield _unpack_record(parent_conn.recv_bytes())
+        except EOFError:
+            log.info("Bleson background process stopped")
+        finally:
+            stop_event.set()
+            parent_conn.close()
+            # Observer checks the stop flag when the next advertisement is received
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+
+    def _get_advertisements(
+        self, blacklist: list[str] | None, bt_device: str
+    ) -> Generator[MacMfgDataAndRssi, None, None]:
+        if self.mode == BlesonMode.THREAD:
+            return BleCommunicationBleson._get_advertisements_thread(blacklist, bt_device)
+        return BleCommunicationBleson._get_advertisements_process(blacklist, bt_device)
+
+    def get_data_bytes(
+        self, blacklist: list[str] | None = None, bt_device: str = ""
+    ) -> Generator[MacAndRawBytes, None, None]:
+        """
+        Get Ruuvi manufacturer specific data as bytes.
 
-        shared_data["stop"] = True
-        proc.join()
+        Yields:
+            tuple: MAC, manufacturer specific data without the company identifier and RSSI
+        """
+        for mac, mfg_data, rssi in self._get_advertisements(blacklist, bt_device):
+            if mfg_data[:2] == RUUVI_COMPANY_ID_BYTES:
+                yield (mac, mfg_data[2:], rssi)
 
-    @staticmethod
-    def get_first_data(mac: str, bt_device: str = "") -> RawData:
+    def get_data(self, blacklist: list[str] | None = None, bt_device: str = "") -> Generator[MacAndRawData, None, None]:
+        for mac, mfg_data, rssi in self._get_advertisements(blacklist, bt_device):
+            yield (mac, _to_raw_data(mfg_data, rssi))
+
+    def get_first_data(self, mac: str, bt_device: str = "") -> RawData:
         data = None
-        data_iter = BleCommunicationBleson.get_data([], bt_device)
+        data_iter = self.get_data([], bt_device)
         for d in data_iter:
             if mac == d[0]:
                 log.info("Data found")
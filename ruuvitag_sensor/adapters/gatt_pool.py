@@ -0,0 +1,161 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import asynccontextmanager
+
+from bleak import BleakClient, BleakGATTCharacteristic
+
+log = logging.getLogger(__name__)
+
+NotificationHandler = Callable[[BleakGATTCharacteristic, bytearray], None]
+
+
+class GattConnection:
+    """
+    Connected GATT client with the resolved history (NUS) characteristics.
+
+    Notifications of the TX characteristic are started once per connection and delivered to
+    notification_handler, so successive operations only replace the handler.
+
+    Args:
+        client (BleakClient): Connected client
+        tx_char (BleakGATTCharacteristic): Characteristic for reading and notifications
+        rx_char (BleakGATTCharacteristic): Characteristic for writing commands
+    """
+
+    def __init__(self, client: BleakClient, tx_char: BleakGATTCharacteristic, rx_char: BleakGATTCharacteristic):
+        self.client = client
+        self.tx_char = tx_char
+        self.rx_char = rx_char
+        self.notification_handler: NotificationHandler | None = None
+        # Operation left the device in a known state, e.g. history read received the end marker
+        self.reusable = False
+        self.in_use = False
+        self._idle_timer: asyncio.TimerHandle | None = None
+
+    @property
+    def is_connected(self) -> bool:
+        return self.client.is_connected
+
+    def on_notification(self, char: BleakGATTCharacteristic, data: bytearray) -> None:
+        if self.notification_handler:
+            self.notification_handler(char, data)
+        else:
+            log.debug("Ignoring notification without an active operation: %s", data.hex())
+
+    async def close(self) -> None:
+        self.cancel_idle_timer()
+        self.notification_handler = None
+        try:
+            await self.client.disconnect()
+            log.debug("Disconnected from device %s", self.client.address)
+        except Exception as e:
+            log.debug("Disconnect from device %s failed: %s", self.client.address, e)
+
+    def cancel_idle_timer(self) -> None:
+        if self._idle_timer:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+
+class GattConnectionPool:
+    """
+    Keep GATT connections open between operations, so successive history reads from the same device
+    don't pay for connecting, service discovery and MTU negotiation again.
+
+    Connections are closed after idle_timeout_sec without use. When the pool has max_connections
+    connections, the least recently used idle connection is closed before a new one is opened. If all
+    connections are in use, the new connection is opened anyway and the pool is trimmed when connections
+    are released. Each device has one operation at a time, as operations share the notifications.
+
+    The pool belongs to the event loop it is used in. Call close when the pool is no longer needed.
+
+    Args:
+        max_connections (int): Maximum number of open connections. Default 3
+        idle_timeout_sec (float): Time in seconds after which an unused connection is closed. Default 60
+    """
+
+    def __init__(self, max_connections: int = 3, idle_timeout_sec: float = 60.0):
+        self.max_connections = max_connections
+        self.idle_timeout_sec = idle_timeout_sec
+        # MAC and connection in least recently used order
+        self._connections: OrderedDict[str, GattConnection] = OrderedDict()
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._close_tasks: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._connections)
+
+    @asynccontextmanager
+    async def connection(
+        self, mac: str, open_connection: Callable[[str], Awaitable[GattConnection]]
+    ) -> AsyncGenerator[GattConnection, None]:
+        """
+        Get an open connection to the device or open a new one with open_connection.
+
+        Connection is kept open after the operation only if the operation marked it reusable.
+        """
+        lock = self._locks.setdefault(mac, asyncio.Lock())
+        async with lock:
+            connection = self._connections.pop(mac, None)
+            if connection:
+                connection.cancel_idle_timer()
+                if connection.is_connected:
+                    log.debug("Reusing connection to device %s", mac)
+                else:
+                    log.debug("Connection to device %s was lost", mac)
+                    await connection.close()
+                    connection = None
+            if connection is None:
+                await self._evict(self.max_connections - 1)
+                connection = await open_connection(mac)
+
+            self._connections[mac] = connection
+            connection.in_use = True
+            connection.reusable = False
+            try:
+                yield connection
+            finally:
+                connection.in_use = False
+                connection.notification_handler = None
+                if connection.reusable and connection.is_connected:
+                    self._schedule_idle_close(mac, connection)
+                    await self._evict(self.max_connections)
+                else:
+                    self._connections.pop(mac, None)
+                    await connection.close()
+
+    async def close(self) -> None:
+        """Close all connections"""
+        connections = list(self._connections.values())
+        self._connections.clear()
+        await asyncio.gather(*(connection.close() for connection in connections))
+
+    async def _evict(self, max_connections: int) -> None:
+        # Close least recently used idle connections until the pool has at most max_connections
+        for mac, connection in list(self._connections.items()):
+            if len(self._connections) <= max_connections:
+                return
+            if connection.in_use:
+                continue
+            # Another eviction may have removed or replaced the connection while this one was closing
+            if self._connections.get(mac) is not connection:
+                continue
+            log.debug("Closing least recently used connection to device %s", mac)
+            self._connections.pop(mac)
+            await connection.close()
+
+    def _schedule_idle_close(self, mac: str, connection: GattConnection) -> None:
+        def close_idle() -> None:
+            connection._idle_timer = None
+            if self._connections.get(mac) is not connection or connection.in_use:
+                return
+            log.debug("Closing idle connection to device %s", mac)
+            del self._connections[mac]
+            task = asyncio.ensure_future(connection.close())
+            self._close_tasks.add(task)
+            task.add_done_callback(self._close_tasks.discard)
+
+        connection.cancel_idle_timer()
+        connection._idle_timer = asyncio.get_running_loop().call_later(self.idle_timeout_sec, close_idle)
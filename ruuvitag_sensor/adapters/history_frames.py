@@ -0,0 +1,108 @@
+import logging
+
+log = logging.getLogger(__name__)
+
+# Ruuvi Air multi-record log write: destination, source and operation
+AIR_HISTORY_FRAME_HEADER = b"\x3b\x3b\x20"
+# Header, number of records and record length
+_FRAME_HEADER_SIZE = 5
+
+
+def _find_frames(buffer: bytes | bytearray, start: int, end: int) -> tuple[list[tuple[int, int]], int]:
+    """
+    Find complete frames from buffer[start:end].
+
+    Returns:
+        tuple: Start and end offsets of the complete frames and the offset of the first unconsumed byte
+    """
+    frames: list[tuple[int, int]] = []
+    while True:
+        pos = buffer.find(AIR_HISTORY_FRAME_HEADER, start, end)
+        if pos == -1:
+            # Keep the last 2 bytes in case the header is split between notifications
+            return frames, max(start, end - 2)
+        start = pos
+
+        if end - start < _FRAME_HEADER_SIZE:
+            return frames, start
+
+        num_records = buffer[start + 3]
+        record_length = buffer[start + 4]
+        if record_length == 0:
+            # Invalid, skip the header and attempt to resync
+            start += 1
+            continue
+
+        frame_end = start + _FRAME_HEADER_SIZE + num_records * record_length
+        if frame_end > end:
+            return frames, start
+
+        frames.append((start, frame_end))
+        start = frame_end
+
+
+class AirHistoryFrameReassembler:
+    """
+    Reassemble Ruuvi Air multi-record history frames from BLE notifications.
+
+    Frame format:
+      0..2: 0x3B 0x3B 0x20
+      3:    num_records
+      4:    record_length (expected 38 bytes)
+      5..:  records (num_records * record_length)
+
+    Frames that are complete in a notification are returned as views of the notification data without
+    copying. Only bytes of a frame that is split across notifications are kept in a preallocated buffer with
+    read and write offsets. The buffer is compacted only when the split frame doesn't fit at the end, and
+    frames reassembled in the buffer are copied once, as the buffer is reused for the next notifications.
+
+    Args:
+        capacity (int): Initial buffer size in bytes. Buffer grows if a split frame doesn't fit. Default 4096
+    """
+
+    def __init__(self, capacity: int = 4096) -> None:
+        self._buffer = bytearray(capacity)
+        self._start = 0
+        self._end = 0
+
+    def feed(self, data: bytes | bytearray) -> list[memoryview]:
+        """
+        Add notification data.
+
+        Returns:
+            list: Complete frames
+        """
+        if self._start == self._end:
+            frames, consumed = _find_frames(data, 0, len(data))
+            view = memoryview(data)
+            self._store(view[consumed:])
+            return [view[start:end] for start, end in frames]
+
+        self._store(memoryview(data))
+        frames, self._start = _find_frames(self._buffer, self._start, self._end)
+        with memoryview(self._buffer) as view:
+            result = [memoryview(bytes(view[start:end])) for start, end in frames]
+        if self._start == self._end:
+            self._start = self._end = 0
+        return result
+
+    def clear(self) -> None:
+        self._start = self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def _store(self, data: memoryview) -> None:
+        if not data:
+            return
+        size = len(data)
+        if self._end + size > len(self._buffer):
+            # Move the unconsumed bytes to the beginning of the buffer
+            pending = self._end - self._start
+            self._buffer[:pending] = self._buffer[self._start : self._end]
+            self._start, self._end = 0, pending
+            if pending + size > len(self._buffer):
+                log.debug("Growing history frame buffer to %d bytes", pending + size)
+                self._buffer.extend(bytes(pending + size - len(self._buffer)))
+        self._buffer[self._end : self._end + size] = data
+        self._end += size
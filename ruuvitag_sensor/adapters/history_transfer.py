@@ -0,0 +1,108 @@
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+
+class HistoryTransferTimeoutError(TimeoutError):
+    """
+    Device stopped sending history data before the end of the log.
+
+    Attributes:
+        history (list): History entries received before the timeout
+    """
+
+    def __init__(self, message: str, history: list[Any] | None = None):
+        super().__init__(message)
+        self.history = history if history is not None else []
+
+
+@dataclass
+class HistoryTransferStats:
+    """
+    Telemetry of one history transfer.
+
+    Attributes:
+        mac (str): MAC address or UUID of the device
+        device_type (str): Device type
+        mtu (int): MTU of the connection, if the backend reports it
+        notifications (int): Received notifications
+        bytes_received (int): Bytes in received notifications
+        heartbeats_ignored (int): Heartbeat notifications that were ignored
+        packets (int): RuuviTag record packets or reassembled Ruuvi Air frames with records
+        records (int): History records received
+        finished (bool): Device reported the end of history or an error
+        timed_out (bool): Transfer was aborted as no data was received in time
+        started (float): Start time of the transfer (time.monotonic)
+        ended (float): End time of the transfer (time.monotonic), None while the transfer is running
+    """
+
+    mac: str
+    device_type: str
+    mtu: int | None = None
+    notifications: int = 0
+    bytes_received: int = 0
+    heartbeats_ignored: int = 0
+    packets: int = 0
+    records: int = 0
+    finished: bool = False
+    timed_out: bool = False
+    started: float = field(default_factory=time.monotonic)
+    ended: float | None = None
+
+    @property
+    def elapsed_sec(self) -> float:
+        return (self.ended if self.ended is not None else time.monotonic()) - self.started
+
+    @property
+    def bytes_per_sec(self) -> float:
+        elapsed = self.elapsed_sec
+        return self.bytes_received / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def records_per_sec(self) -> float:
+        elapsed = self.elapsed_sec
+        return self.records / elapsed if elapsed > 0 else 0.0
+
+
+class AdaptiveTimeout:
+    """
+    Inactivity timeout derived from the observed gaps between notifications.
+
+    Gap average and variation are smoothed like the TCP retransmission timeout (RFC 6298), and the timeout
+    is the average plus four times the variation, limited to min_sec and max_sec. A link that stops sending
+    in the middle of a transfer is detected in about min_sec instead of waiting for the fixed timeout.
+
+    Args:
+        initial_sec (float): Timeout before the first notification, as the device needs time to start. Default 10
+        min_sec (float): Minimum timeout after the first notification. Default 2
+        max_sec (float): Maximum timeout after the first notification. Default 10
+    """
+
+    def __init__(self, initial_sec: float = 10.0, min_sec: float = 2.0, max_sec: float = 10.0):
+        self.initial_sec = initial_sec
+        self.min_sec = min_sec
+        self.max_sec = max_sec
+        self._last: float | None = None
+        self._gap: float | None = None
+        self._gap_variation = 0.0
+
+    @property
+    def timeout_sec(self) -> float:
+        if self._last is None:
+            return self.initial_sec
+        if self._gap is None:
+            return self.max_sec
+        return min(self.max_sec, max(self.min_sec, self._gap + 4 * self._gap_variation))
+
+    def observe(self, now: float | None = None) -> None:
+        """Notification received at now (time.monotonic)"""
+        now = time.monotonic() if now is None else now
+        if self._last is not None:
+            gap = now - self._last
+            if self._gap is None:
+                self._gap = gap
+                self._gap_variation = gap / 2
+            else:
+                self._gap_variation = 0.75 * self._gap_variation + 0.25 * abs(self._gap - gap)
+                self._gap = 0.875 * self._gap + 0.125 * gap
+        self._last = now
@@ -101,11 +101,12 @@ class BleCommunicationNix(BleCommunication):
             log.info(ex)
             return
 
-    @staticmethod
-    def get_data(blacklist: list[str] | None = None, bt_device: str = "") -> Generator[MacAndRawData, None, None]:
-        procs = BleCommunicationNix.start(bt_device)
+    @classmethod
+    def get_data(cls, blacklist: list[str] | None = None, bt_device: str = "") -> Generator[MacAndRawData, None, None]:
+        # Use cls, so BleCommunicationNixFile can replace start, stop and get_lines
+        procs = cls.start(bt_device)
         data = None
-        for line in BleCommunicationNix.get_lines(procs[1]):
+        for line in cls.get_lines(procs[1]):
             log.debug("Parsing line %s", line)
             try:
                 # Make sure we're in upper case
@@ -156,12 +157,12 @@ class BleCommunicationNix(BleCommunication):
             except Exception:
                 continue
 
-        BleCommunicationNix.stop(procs[0], procs[1])
+        cls.stop(procs[0], procs[1])
 
-    @staticmethod
-    def get_first_data(mac: str, bt_device: str = "") -> RawData:
+    @classmethod
+    def get_first_data(cls, mac: str, bt_device: str = "") -> RawData:
         data = None
-        data_iter = BleCommunicationNix.get_data([], bt_device)
+        data_iter = cls.get_data([], bt_device)
         for d in data_iter:
             if mac == d[0]:
                 log.info("Data found")
@@ -1,6 +1,5 @@
 import logging
-
-import Path
+from pathlib import Path
 
 from ruuvitag_sensor.adapters.nix_hci import BleCommunicationNix
 
@@ -21,7 +20,7 @@ class BleCommunicationNixFile(BleCommunicationNix):
            This is interpreted as a file to open
         """
         log.info("Start reading from file %s", bt_device)
-        handle = Path.open(bt_device, "rb")
+        handle = Path(bt_device).open("rb")  # noqa: SIM115
 
         return (None, handle)
 
@@ -0,0 +1,253 @@
+import logging
+import socket
+import struct
+from collections.abc import Generator
+from pathlib import Path
+from typing import BinaryIO
+
+from ruuvitag_sensor.adapters import BleCommunication
+from ruuvitag_sensor.data_formats import DataFormats
+from ruuvitag_sensor.ruuvi_types import MacAndRawBytes, MacAndRawData, RawData
+
+log = logging.getLogger(__name__)
+
+# HCI packet types (H4 packet indicator)
+HCI_COMMAND_PKT = 0x01
+HCI_EVENT_PKT = 0x04
+
+# HCI LE Meta event and LE Advertising Report subevent
+EVT_LE_META_EVENT = 0x3E
+EVT_LE_ADVERTISING_REPORT = 0x02
+
+# LE Controller commands (OGF 0x08)
+OCF_LE_SET_SCAN_PARAMETERS = 0x000B
+OCF_LE_SET_SCAN_ENABLE = 0x000C
+
+# Socket options from <bluetooth/hci.h>. Python doesn't export all of these on every build
+SOL_HCI = getattr(socket, "SOL_HCI", 0)
+HCI_FILTER = getattr(socket, "HCI_FILTER", 2)
+
+# btsnoop datalink types
+BTSNOOP_MAGIC = b"btsnoop\x00"
+BTSNOOP_HCI_UNENCAPSULATED = 1001
+BTSNOOP_HCI_UART = 1002
+
+# Event header: packet type, event code, parameter length, subevent, number of reports
+_EVENT_HEADER = struct.Struct("<BBBBB")
+# Report header: event type, address type, address
+_REPORT_HEADER = struct.Struct("<BB6s")
+_BTSNOOP_HEADER = struct.Struct(">8sII")
+_BTSNOOP_RECORD = struct.Struct(">IIIIq")
+
+
+def _le_command(ocf: int, params: bytes) -> bytes:
+    opcode = (0x08 << 10) | ocf
+    return struct.pack("<BHB", HCI_COMMAND_PKT, opcode, len(params)) + params
+
+
+def parse_advertising_reports(packet: bytes) -> Generator[tuple[str, memoryview, int], None, None]:
+    """
+    Parse HCI LE Advertising Report event. One event can contain multiple reports.
+
+    Args:
+        packet (bytes): HCI event packet starting from the H4 packet type
+    Yields:
+        tuple: MAC, advertising data and RSSI of each report
+    """
+    if len(packet) < _EVENT_HEADER.size:
+        return
+    packet_type, event_code, _, subevent, report_count = _EVENT_HEADER.unpack_from(packet)
+    if packet_type != HCI_EVENT_PKT or event_code != EVT_LE_META_EVENT or subevent != EVT_LE_ADVERTISING_REPORT:
+        return
+
+    view = memoryview(packet)
+    offset = _EVENT_HEADER.size
+    for _ in range(report_count):
+        if offset + _REPORT_HEADER.size + 1 > len(packet):
+            log.debug("Truncated advertising report")
+            return
+        _, _, address = _REPORT_HEADER.unpack_from(packet, offset)
+        offset += _REPORT_HEADER.size
+        data_length = packet[offset]
+        offset += 1
+        end = offset + data_length
+        if end >= len(packet):
+            log.debug("Truncated advertising report")
+            return
+        # Address is in little-endian byte order
+        mac = address[::-1].hex(":").upper()
+        rssi = struct.unpack_from("<b", packet, end)[0]
+        yield (mac, view[offset:end], rssi)
+        offset = end + 1
+
+
+def read_btsnoop(stream: BinaryIO) -> Generator[bytes, None, None]:
+    """
+    Read HCI packets from a btsnoop file, e.g. captured with btmon or Android HCI snoop log.
+
+    Yields:
+        bytes: HCI packets starting from the H4 packet type
+    """
+    header = stream.read(_BTSNOOP_HEADER.size)
+    if len(header) < _BTSNOOP_HEADER.size:
+        raise ValueError("Not a btsnoop file")
+    magic, _, datalink = _BTSNOOP_HEADER.unpack(header)
+    if magic != BTSNOOP_MAGIC:
+        raise ValueError("Not a btsnoop file")
+    if datalink not in (BTSNOOP_HCI_UNENCAPSULATED, BTSNOOP_HCI_UART):
+        raise ValueError(f"Unsupported btsnoop datalink type: {datalink}")
+
+    while True:
+        record = stream.read(_BTSNOOP_RECORD.size)
+        if len(record) < _BTSNOOP_RECORD.size:
+            return
+        _, included_length, flags, _, _ = _BTSNOOP_RECORD.unpack(record)
+        packet = stream.read(included_length)
+        if len(packet) < included_length:
+            return
+        if datalink == BTSNOOP_HCI_UART:
+            yield packet
+        # Unencapsulated packets don't have the packet type. Flag bit 1 is set for commands and events
+        # and bit 0 for received packets
+        elif flags & 0x03 == 0x03:
+            yield bytes((HCI_EVENT_PKT,)) + packet
+
+
+class BleCommunicationNixSocket(BleCommunication):
+    """
+    Bluetooth LE communication for Linux with a raw HCI socket.
+
+    Reads LE Advertising Report events directly from the socket without hcitool and hcidump processes.
+    Requires root or CAP_NET_RAW and CAP_NET_ADMIN capabilities.
+    """
+
+    @staticmethod
+    def start(bt_device: str = "") -> socket.socket:
+        """
+        Attributes:
+           device (string): BLE device (default hci0)
+        """
+        device_id = int(bt_device[3:]) if bt_device.startswith("hci") else 0
+        log.info("Start receiving broadcasts (device hci%s)", device_id)
+
+        try:
+            sock = socket.socket(socket.AF_BLUETOOTH, socket.SOCK_RAW, socket.BTPROTO_HCI)
+            sock.bind((device_id,))
+        except (AttributeError, OSError) as ex:
+            raise RuntimeError(f"Can't open HCI socket for hci{device_id}: {ex}") from ex
+
+        # Receive only LE Meta events. Filter: packet type mask, event mask (64 bits) and opcode
+        event_mask = 1 << EVT_LE_META_EVENT
+        hci_filter = struct.pack("<IIIH", 1 << HCI_EVENT_PKT, event_mask & 0xFFFFFFFF, event_mask >> 32, 0)
+        sock.setsockopt(SOL_HCI, HCI_FILTER, hci_filter)
+
+        # Passive scan, 10 ms interval and window, public address, accept all advertisements
+        sock.send(_le_command(OCF_LE_SET_SCAN_PARAMETERS, struct.pack("<BHHBB", 0x00, 0x10, 0x10, 0x00, 0x00)))
+        # Enable scan without duplicate filtering
+        sock.send(_le_command(OCF_LE_SET_SCAN_ENABLE, struct.pack("<BB", 0x01, 0x00)))
+
+        return sock
+
+    @staticmethod
+    def stop(sock) -> None:
+        log.info("Stop receiving broadcasts")
+        try:
+            sock.send(_le_command(OCF_LE_SET_SCAN_ENABLE, struct.pack("<BB", 0x00, 0x00)))
+        except OSError as ex:
+            log.info(ex)
+        sock.close()
+
+    @staticmethod
+    def get_packets(sock) -> Generator[bytes, None, None]:
+        try:
+            while True:
+                packet = sock.recv(260)
+                if not packet:
+                    return
+                yield packet
+        except KeyboardInterrupt:
+            return
+        except OSError as ex:
+            log.info(ex)
+            return
+
+    @classmethod
+    def get_data_bytes(
+        cls, blacklist: list[str] | None = None, bt_device: str = ""
+    ) -> Generator[MacAndRawBytes, None, None]:
+        """
+        Get Ruuvi manufacturer specific data as bytes.
+
+        Yields:
+            tuple: MAC, sensor data starting from the data format byte and RSSI
+        """
+        sock = cls.start(bt_device)
+        try:
+            for packet in cls.get_packets(sock):
+                for mac, data, rssi in parse_advertising_reports(packet):
+                    if blacklist and mac in blacklist:
+                        log.debug("MAC blacklisted: %s", mac)
+                        continue
+                    data_format, sensor_data = DataFormats.convert_advertisement(data)
+                    # Other devices and RuuviTag advertisements without sensor data
+                    if data_format is None or sensor_data is None:
+                        continue
+                    yield (mac, bytes(sensor_data), rssi)
+        finally:
+            cls.stop(sock)
+
+    @classmethod
+    def get_data(cls, blacklist: list[str] | None = None, bt_device: str = "") -> Generator[MacAndRawData, None, None]:
+        """
+        Get advertising data as hex strings in the same format as BleCommunicationNix.
+
+        Yields:
+            tuple: MAC and advertising data with length prefix and RSSI
+        """
+        sock = cls.start(bt_device)
+        try:
+            for packet in cls.get_packets(sock):
+                for mac, data, rssi in parse_advertising_reports(packet):
+                    if blacklist and mac in blacklist:
+                        log.debug("MAC blacklisted: %s", mac)
+                        continue
+                    yield (mac, bytes((len(data), *data, rssi & 0xFF)).hex().upper())
+        finally:
+            cls.stop(sock)
+
+    @classmethod
+    def get_first_data(cls, mac: str, bt_device: str = "") -> RawData:
+        data = None
+        data_iter = cls.get_data([], bt_device)
+        for d in data_iter:
+            if mac == d[0]:
+                log.info("Data found")
+                data_iter.close()
+                data = d[1]
+                break
+
+        return data or ""
+
+
+class BleCommunicationNixSocketFile(BleCommunicationNixSocket):
+    """
+    Emulate HCI socket communication by reading HCI packets from a btsnoop file
+    """
+
+    @staticmethod
+    def start(bt_device: str = ""):
+        """
+        Attributes:
+           device (string): Path of the btsnoop file
+        """
+        log.info("Start reading from file %s", bt_device)
+        return Path(bt_device).open("rb")
+
+    @staticmethod
+    def stop(sock) -> None:
+        log.info("Close file")
+        sock.close()
+
+    @staticmethod
+    def get_packets(sock) -> Generator[bytes, None, None]:
+        yield from read_btsnoop(sock)
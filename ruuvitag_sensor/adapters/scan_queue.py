@@ -0,0 +1,88 @@
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+from typing import Generic, TypeVar
+
+T = TypeVar("T", bound=tuple)
+
+
+class OverflowPolicy(str, Enum):
+    """Action when an advertisement is received and the scan queue is full."""
+
+    DROP_OLDEST = "drop_oldest"  # Drop the oldest queued advertisement
+    DROP_NEWEST = "drop_newest"  # Drop the received advertisement
+    COALESCE = "coalesce"  # Keep only the latest advertisement per MAC, drop the oldest if still full
+
+
+@dataclass
+class ScanQueueStats:
+    """Counters for advertisements received to a scan queue and dropped from it."""
+
+    received: int = 0
+    dropped: int = 0
+
+
+class ScanQueue(Generic[T]):
+    """
+    Bounded queue between a BLE scanner callback and a single consumer.
+
+    Scanner callbacks can't be blocked, so when the queue is full the overflow policy decides
+    which advertisement is dropped. Items are tuples with the MAC as the first element.
+
+    Args:
+        maxsize (int): Maximum number of queued advertisements. 0 means unbounded
+        policy (OverflowPolicy): Overflow policy. Default DROP_OLDEST
+        stats (ScanQueueStats): Optional counters, e.g. shared between queues of an adapter
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 0,
+        policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        stats: ScanQueueStats | None = None,
+    ):
+        self.maxsize = maxsize
+        self.policy = OverflowPolicy(policy)
+        self.stats = stats or ScanQueueStats()
+        # Key is MAC with COALESCE policy, otherwise a running number
+        self._items: OrderedDict[object, T] = OrderedDict()
+        self._counter = 0
+        self._not_empty = asyncio.Event()
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def put_nowait(self, item: T) -> None:
+        self.stats.received += 1
+
+        if self.policy == OverflowPolicy.COALESCE and item[0]:
+            key: object = item[0]
+            if key in self._items:
+                # Replace older advertisement of the same MAC in its place in the queue
+                self._items[key] = item
+                self.stats.dropped += 1
+                return
+        else:
+            # Advertisements without MAC (e.g. on macOS) are never coalesced
+            self._counter += 1
+            key = self._counter
+
+        if self.maxsize and len(self._items) >= self.maxsize:
+            self.stats.dropped += 1
+            if self.policy == OverflowPolicy.DROP_NEWEST:
+                return
+            self._items.popitem(last=False)
+
+        self._items[key] = item
+        self._not_empty.set()
+
+    async def get(self) -> T:
+        while not self._items:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+
+        return self._items.popitem(last=False)[1]
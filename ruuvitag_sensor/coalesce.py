@@ -0,0 +1,113 @@
+import time
+from collections.abc import AsyncGenerator
+from typing import Generic, TypeVar
+
+T = TypeVar("T", bound=tuple)
+
+
+class LatestByMac(Generic[T]):
+    """
+    Latest not yet delivered advertisement of each MAC.
+
+    Items are tuples with the MAC as the first element. Items without a MAC (e.g. on macOS) are all kept,
+    as advertisements from different devices can't be told apart before decoding.
+    """
+
+    def __init__(self) -> None:
+        # Key is MAC or a running number for items without MAC
+        self._items: dict[object, T] = {}
+        self._counter = 0
+
+    def put(self, item: T) -> None:
+        key: object = item[0]
+        if not key:
+            self._counter += 1
+            key = self._counter
+        # Updated MAC keeps its place, so sensors are delivered in the order they were first updated
+        self._items[key] = item
+
+    def pop(self) -> T:
+        """Remove and return the item that has waited longest"""
+        key = next(iter(self._items))
+        return self._items.pop(key)
+
+    def take_all(self) -> list[T]:
+        items = list(self._items.values())
+        self._items.clear()
+        return items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class IntervalLatestByMac(LatestByMac[T]):
+    """
+    Latest advertisement of each MAC, delivered once per interval.
+
+    Used with sync adapters, which are read only when data is received, so the interval is checked when
+    an item is added.
+    """
+
+    def __init__(self, interval_sec: float) -> None:
+        super().__init__()
+        self._interval_sec = interval_sec
+        self._next_delivery = time.monotonic() + interval_sec
+
+    def put_and_take_due(self, item: T) -> list[T]:
+        """Add item and return the latest items of all updated MACs if the interval has elapsed"""
+        self.put(item)
+        now = time.monotonic()
+        if now < self._next_delivery:
+            return []
+        self._next_delivery = now + self._interval_sec
+        return self.take_all()
+
+
+async def coalesce_async(data_iter: AsyncGenerator[T, None], interval_sec: float = 0) -> AsyncGenerator[T, None]:
+    """
+    Read data_iter in the background and keep only the latest item of each MAC.
+
+    Args:
+        data_iter (AsyncGenerator): Items with the MAC as the first element
+        interval_sec (float): 0 yields the latest item of the longest waiting MAC when the next item is requested.
+            With a positive value the latest items of all updated MACs are yielded once per interval.
+    Yields:
+        tuple: Latest item of a MAC
+    """
+    import asyncio  # noqa: PLC0415
+
+    latest = LatestByMac[T]()
+    updated = asyncio.Event()
+
+    async def read():
+        try:
+            async for item in data_iter:
+                latest.put(item)
+                updated.set()
+        finally:
+            updated.set()
+
+    reader = asyncio.create_task(read())
+
+    try:
+        while True:
+            if interval_sec:
+                await asyncio.wait({reader}, timeout=interval_sec)
+                items = latest.take_all()
+            else:
+                while not latest and not reader.done():
+                    updated.clear()
+                    await updated.wait()
+                items = [latest.pop()] if latest else []
+
+            for item in items:
+                yield item
+
+            if reader.done() and not latest:
+                # Raise the exception from the adapter, if any
+                reader.result()
+                return
+    finally:
+        reader.cancel()
+        await asyncio.gather(reader, return_exceptions=True)
+        await data_iter.aclose()
@@ -1,32 +1,69 @@
 import logging
 
-from ruuvitag_sensor.ruuvi_types import DataFormatAndRawSensorData, RawSensorData
+from ruuvitag_sensor.ruuvi_types import (
+    DataFormat,
+    DataFormatAndRawSensorBytes,
+    DataFormatAndRawSensorData,
+    RawBytes,
+    RawSensorData,
+)
 
 log = logging.getLogger(__name__)
 
 
+# Data format byte of Ruuvi manufacturer specific data to Data Format type
+_MANUFACTURER_DATA_FORMATS: dict[int, int | str] = {0x05: 5, 0x06: 6, 0xE1: "E1", 0x03: 3}
+
+
 class ShortDataError(Exception):
     pass
 
 
-def _dechunk(raw: str) -> tuple[str, str]:
-    """
-    Given a BLE advertisement in hex format, interpret the first
-    byte as a length byte, return the data indicated by the length
-    byte, and the remainder of the data in a tuple.
+# AD types that can contain Ruuvi data: manufacturer specific data (Data Formats 3, 5, 6 and E1),
+# service data (Data Formats 2 and 4) and complete local name (discovery advertisements of firmware 3.x)
+_AD_TYPE_MANUFACTURER_DATA = 0xFF
+_AD_TYPE_SERVICE_DATA = 0x16
+_AD_TYPE_COMPLETE_LOCAL_NAME = 0x09
+_CANDIDATE_AD_TYPES = frozenset((_AD_TYPE_MANUFACTURER_DATA, _AD_TYPE_SERVICE_DATA, _AD_TYPE_COMPLETE_LOCAL_NAME))
+
+# Ruuvi Innovations company identifier (0x0499) and Eddystone service UUID (0xFEAA) in little-endian byte order
+_RUUVI_COMPANY_ID = b"\x99\x04"
+_EDDYSTONE_SERVICE_UUID = b"\xaa\xfe"
+_RUUVI_LOCAL_NAME = b"Ruuvi"
 
-    The length byte itself is not included in the length.
 
-    If the length indicated is longer than the data, raise a ValueError
+def _find_candidate(data: RawBytes, offset: int, end: int) -> tuple[int, int] | None:
     """
-    if len(raw) < 2:
-        raise ShortDataError("Data too short")
+    Walk length:type:data AD structures of an advertisement by offsets and find the first structure
+    that can contain Ruuvi data. The data is not copied.
 
-    dlen = int(raw[:2], 16)
-    if (dlen + 1) * 2 > len(raw):
-        raise ShortDataError(f"Cannot read {dlen} bytes, data too short: {raw}")
+    The length byte itself is not included in the length.
 
-    return (raw[2 : (dlen * 2) + 2], raw[(dlen * 2) + 2 :])
+    Returns:
+        tuple (int, int): Offsets of the type byte and the end of the structure or None if not found
+    Raises:
+        ShortDataError: If the length indicated is longer than the data
+    """
+    while offset < end:
+        length = data[offset]
+        start = offset + 1
+        offset = start + length
+        if offset > end:
+            raise ShortDataError(f"Cannot read {length} bytes at offset {start}, data too short")
+        if length and data[start] in _CANDIDATE_AD_TYPES:
+            return (start, offset)
+    return None
+
+
+def _get_manufacturer_data_format(data: RawBytes, start: int, end: int) -> DataFormat:
+    """
+    Returns:
+        Data Format type of the manufacturer specific data structure or None if it is not from Ruuvi
+    """
+    # Type byte, company identifier and data format byte
+    if end - start < 4 or data[start + 1 : start + 3] != _RUUVI_COMPANY_ID:
+        return None
+    return _MANUFACTURER_DATA_FORMATS.get(data[start + 3])
 
 
 class DataFormats:
@@ -51,29 +88,24 @@ class DataFormats:
         log.debug("Parsing advertisement data: %s", raw)
 
         try:
+            data = bytes.fromhex(raw)
             # The data starts with a length byte, covering the data
             # length, minus the length byte itself. There might be additional
             # data at the end: the RSSI value
-            data, rssi = _dechunk(raw)
+            if not data:
+                raise ShortDataError("Data too short")
+            data_end = data[0] + 1
+            if data_end > len(data):
+                raise ShortDataError(f"Cannot read {data[0]} bytes, data too short: {raw}")
 
             # The remaining data is a list of length:type:data chunks.
             # We look for a chunk with vendor specific data (type 0xff),
-            # used by formats 3 and 5, or a chunk with service data (type 0x16)
+            # used by formats 3, 5, 6 and E1, or a chunk with service data (type 0x16)
             # used by formats 2 and 4.
             #
             # Firmware 3.x also sends advertisements that contain chunks
             # of type 0x09, followed by 'Ruuvi', in ASCII encoding.
-            candidate = None
-            while data != "":
-                cdata, data = _dechunk(data)
-
-                ctype = cdata[:2]
-                log.debug("Found chunk of type %s: %s", ctype, cdata)
-
-                # See if we found a potential candidate. Break the loop
-                if ctype in ("FF", "16", "09"):
-                    candidate = cdata
-                    break
+            candidate = _find_candidate(data, 1, data_end)
         except ShortDataError as ex:
             # Data might be from RuuviTag, but received data was invalid
             # e.g. it's possible that Bluetooth stack received only partial data
@@ -89,29 +121,34 @@ class DataFormats:
             log.debug("No candidate found")
             return (None, None)
 
-        log.debug("Found candidate %s", candidate)
-
-        # Ruuvi advertisements start with FF9904 (for format 3, 5, 6 and E1),
-        # or 16AAFE (for format 2 and 4).
-        match candidate:
-            # Data formats are ordered by priority, so the most common formats are at the top.
-            case _ if candidate.startswith("FF990405"):
-                return (5, (candidate[6:] + rssi) if rssi else candidate[6:])
-            case _ if candidate.startswith("FF990406"):
-                return (6, candidate[6:])
-            case _ if candidate.lower().startswith("ff9904e1"):
-                # Ruuvi Air sends E1 in lowercase, e.g. `FF9904e1...`
-                return ("E1", candidate[6:].lower())
-            case _ if candidate.startswith("FF990403"):
-                return (3, candidate[6:])
-            case _ if candidate.startswith("16AAFE"):
+        start, end = candidate
+        log.debug("Found candidate %s", raw[start * 2 : end * 2])
+
+        # Ruuvi advertisements have manufacturer specific data of company 0x0499 (for format 3, 5, 6 and E1),
+        # or Eddystone service data 0xFEAA (for format 2 and 4). Other devices are rejected after the few
+        # bytes of the candidate header, without converting the data.
+        match data[start]:
+            case 0xFF:
+                data_format = _get_manufacturer_data_format(data, start, end)
+                if data_format is None:
+                    return (None, None)
+                # Sensor data starts from the data format byte
+                payload = raw[(start + 3) * 2 : end * 2]
+                if data_format == 5:
+                    rssi = raw[data_end * 2 :]
+                    return (5, payload + rssi)
+                if data_format == "E1":
+                    # Ruuvi Air sends E1 in lowercase, e.g. `FF9904e1...`
+                    return ("E1", payload.lower())
+                return (data_format, payload)
+            case 0x16 if data[start + 1 : start + 3] == _EDDYSTONE_SERVICE_UUID:
                 # TODO: Check from raw data correct data format
                 # Now this returns 2 also for Data Format 4
                 url_data = DataFormats._get_data_format_2and4(DataFormats._parse_raw(raw))
                 if url_data is not None:
                     return (2, url_data)
                 return (None, None)
-            case _ if candidate.startswith("095275757669"):
+            case 0x09 if data[start + 1 : end].startswith(_RUUVI_LOCAL_NAME):
                 # This is a RuuviTag, but this advertisement does not contain any data.
                 # Set the format to None, and data to '', this allows the
                 # caller to determine that we did indeed see a RuuviTag.
@@ -119,6 +156,65 @@ class DataFormats:
             case _:
                 return (None, None)
 
+    @staticmethod
+    def convert_advertisement(data: RawBytes) -> DataFormatAndRawSensorBytes:
+        """
+        Validate that advertising data is from RuuviTag or Ruuvi Air and get correct data part.
+
+        This is the bytes counterpart of convert_data for adapters that receive the advertising data
+        as bytes. AD structures are walked by offsets and advertisements from other devices are rejected
+        after reading the type and company identifier of the first candidate structure. The data is not copied.
+        Data Formats 2 and 4 are only supported by convert_data.
+
+        Like convert_data, returns None for the data format and empty data when the advertisement is
+        from a RuuviTag but doesn't contain sensor data, or the received data was partial.
+
+        Args:
+            data: Advertising data without the total length byte or RSSI
+        Returns:
+            tuple (int, memoryview): Data Format type and Sensor data starting from the data format byte
+        """
+        try:
+            candidate = _find_candidate(data, 0, len(data))
+        except ShortDataError as ex:
+            log.debug("Error parsing advertisement data: %s", ex)
+            return (None, memoryview(b""))
+
+        if candidate is None:
+            return (None, None)
+
+        start, end = candidate
+        match data[start]:
+            case 0xFF:
+                data_format = _get_manufacturer_data_format(data, start, end)
+                if data_format is None:
+                    return (None, None)
+                return (data_format, memoryview(data)[start + 3 : end])
+            case 0x09 if data[start + 1 : end][: len(_RUUVI_LOCAL_NAME)] == _RUUVI_LOCAL_NAME:
+                return (None, memoryview(b""))
+            case _:
+                return (None, None)
+
+    @staticmethod
+    def convert_manufacturer_data(data: RawBytes) -> DataFormatAndRawSensorBytes:
+        """
+        Validate that manufacturer specific data is from RuuviTag or Ruuvi Air and get correct data part.
+
+        This is the bytes counterpart of convert_data for adapters that already receive
+        the manufacturer specific data of Ruuvi Innovations (company identifier 0x0499)
+        separated from the rest of the advertisement. The data is not copied.
+
+        Args:
+            data: Manufacturer specific data without the company identifier
+        Returns:
+            tuple (int, memoryview): Data Format type and Sensor data starting from the data format byte
+        """
+        data_format = _MANUFACTURER_DATA_FORMATS.get(data[0]) if data else None
+        if data_format is None:
+            return (None, None)
+
+        return (data_format, memoryview(data))
+
     @staticmethod
     def _parse_raw(raw: str) -> str:
         return raw
@@ -0,0 +1,88 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from ruuvitag_sensor.ruuvi_types import DataFormat, RawSensorBytes, RawSensorData, SensorData
+
+# Hex encoded Data Format 5 payload length. Hex payload can have RSSI appended after the payload
+_DF5_HEX_PAYLOAD_LENGTH = 48
+
+
+@dataclass
+class DecodeCacheStats:
+    """Counters for decode cache lookups"""
+
+    hits: int = 0
+    misses: int = 0
+
+
+class DecodeCache:
+    """
+    LRU cache of decoded sensor data, keyed by MAC and raw payload without RSSI.
+
+    Bluetooth stacks deliver the same advertisement many times. Repeated advertisements are not decoded again,
+    only the RSSI of the cached data is updated.
+
+    Args:
+        maxsize (int): Maximum number of cached advertisements. Default 1024
+        suppress_duplicates (bool): Drop repeated advertisements from the data stream. Default False
+    """
+
+    def __init__(self, maxsize: int = 1024, suppress_duplicates: bool = False) -> None:
+        self.maxsize = maxsize
+        self.suppress_duplicates = suppress_duplicates
+        self.stats = DecodeCacheStats()
+        self._items: OrderedDict[tuple, SensorData] = OrderedDict()
+
+    @staticmethod
+    def _get_key_and_rssi(
+        mac: str, data_format: DataFormat, data: RawSensorData | RawSensorBytes, rssi: int | None
+    ) -> tuple[tuple, int | None]:
+        if isinstance(data, str):
+            if data_format == 5 and len(data) > _DF5_HEX_PAYLOAD_LENGTH:
+                rssi = int.from_bytes(bytes.fromhex(data[_DF5_HEX_PAYLOAD_LENGTH:]), "big", signed=True)
+                data = data[:_DF5_HEX_PAYLOAD_LENGTH]
+            return (mac, data_format, data), rssi
+        return (mac, data_format, bytes(data or b"")), rssi
+
+    def get(
+        self, mac: str, data_format: DataFormat, data: RawSensorData | RawSensorBytes, rssi: int | None = None
+    ) -> SensorData | None:
+        """
+        Get cached data for a repeated advertisement.
+
+        Returns:
+            dict: Copy of the cached sensor data with updated RSSI or None if advertisement is not cached
+        """
+        key, rssi = self._get_key_and_rssi(mac, data_format, data, rssi)
+        cached = self._items.get(key)
+        if cached is None:
+            self.stats.misses += 1
+            return None
+
+        self.stats.hits += 1
+        self._items.move_to_end(key)
+        decoded = cached.copy()
+        if "rssi" in decoded:
+            decoded["rssi"] = rssi  # type: ignore[typeddict-unknown-key]
+        return decoded
+
+    def put(
+        self,
+        mac: str,
+        data_format: DataFormat,
+        data: RawSensorData | RawSensorBytes,
+        decoded: SensorData,
+        rssi: int | None = None,
+    ) -> None:
+        key, _ = self._get_key_and_rssi(mac, data_format, data, rssi)
+        # Store a copy, so changes to the delivered data don't change the cache
+        self._items[key] = decoded.copy()
+        self._items.move_to_end(key)
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
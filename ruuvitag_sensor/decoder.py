@@ -1,7 +1,7 @@
 """
 Decoder utilities and backward compatibility module.
 
-This module contains decoder utility functions (get_decoder, parse_mac) and
+This module contains the decoder registry, decoder utility functions (get_decoder, parse_mac) and
 re-exports all decoder classes from the decoders package for backward compatibility.
 """
 
@@ -35,12 +35,41 @@ __all__ = [
     "HistoryDecoder",
     "UrlDecoder",
     # Utility functions (defined in this module)
+    "get_bytes_decoder",
     "get_decoder",
     "parse_mac",
 ]
 
 
-def get_decoder(data_format: int | str) -> UrlDecoder | Df3Decoder | Df5Decoder | Df6Decoder | DfE1Decoder:
+Decoder = UrlDecoder | Df3Decoder | Df5Decoder | Df6Decoder | DfE1Decoder
+BytesDecoder = Df3Decoder | Df5Decoder | Df6Decoder | DfE1Decoder
+
+# Decoders are stateless, so a single instance of each decoder is shared by all callers.
+# Registry maps Data Format to the decoder and an optional warning logged on each use.
+# Data formats are ordered by priority, so the most common formats are at the top.
+_DECODERS: dict[int | str, tuple[Decoder, str | None]] = {
+    # https://docs.ruuvi.com/communication/bluetooth-advertisements/data-format-5-rawv2
+    5: (Df5Decoder(), None),
+    # https://docs.ruuvi.com/communication/bluetooth-advertisements/data-format-6
+    6: (Df6Decoder(), None),
+    # https://docs.ruuvi.com/communication/bluetooth-advertisements/data-format-e1.md
+    "E1": (DfE1Decoder(), None),
+    # https://github.com/ruuvi/ruuvi-sensor-protocols/blob/master/dataformat_04.md
+    2: (UrlDecoder(), "DATA TYPE 2 IS OBSOLETE. UPDATE YOUR TAG"),
+    # https://github.com/ruuvi/ruuvi-sensor-protocols/blob/master/dataformat_03.md
+    3: (Df3Decoder(), "DATA TYPE 3 IS DEPRECATED - UPDATE YOUR TAG"),
+    # https://github.com/ruuvi/ruuvi-sensor-protocols/blob/master/dataformat_04.md
+    4: (UrlDecoder(), "DATA TYPE 4 IS OBSOLETE. UPDATE YOUR TAG"),
+}
+
+_BYTES_DECODERS: dict[int | str, tuple[BytesDecoder, str | None]] = {
+    data_format: (decoder, warning)
+    for data_format, (decoder, warning) in _DECODERS.items()
+    if not isinstance(decoder, UrlDecoder)
+}
+
+
+def get_decoder(data_format: int | str) -> Decoder:
     """
     Get correct decoder for Data Format.
 
@@ -53,34 +82,40 @@ def get_decoder(data_format: int | str) -> UrlDecoder | Df3Decoder | Df5Decoder
     Raises:
         ValueError: If data_format is not a recognized format
     """
-    # Data formats are ordered by priority, so the most common formats are at the top.
-    match data_format:
-        case 5:
-            # https://docs.ruuvi.com/communication/bluetooth-advertisements/data-format-5-rawv2
-            return Df5Decoder()
-        case 6:
-            # https://docs.ruuvi.com/communication/bluetooth-advertisements/data-format-6
-            return Df6Decoder()
-        case "E1":
-            # https://docs.ruuvi.com/communication/bluetooth-advertisements/data-format-e1.md
-            return DfE1Decoder()
-        case 2:
-            log.warning("DATA TYPE 2 IS OBSOLETE. UPDATE YOUR TAG")
-            # https://github.com/ruuvi/ruuvi-sensor-protocols/blob/master/dataformat_04.md
-            return UrlDecoder()
-        case 3:
-            log.warning("DATA TYPE 3 IS DEPRECATED - UPDATE YOUR TAG")
-            # https://github.com/ruuvi/ruuvi-sensor-protocols/blob/master/dataformat_03.md
-            return Df3Decoder()
-        case 4:
-            log.warning("DATA TYPE 4 IS OBSOLETE. UPDATE YOUR TAG")
-            # https://github.com/ruuvi/ruuvi-sensor-protocols/blob/master/dataformat_04.md
-            return UrlDecoder()
-        case _:
-            # This should never happen in normal operation since DataFormats.convert_data()
-            # already validates and identifies the data format. If we reach here, it indicates
-            # a programming error (e.g., convert_data was bypassed or returned an unhandled format).
-            raise ValueError(f"Unknown data format: {data_format}")
+    entry = _DECODERS.get(data_format)
+    if entry is None:
+        # This should never happen in normal operation since DataFormats.convert_data()
+        # already validates and identifies the data format. If we reach here, it indicates
+        # a programming error (e.g., convert_data was bypassed or returned an unhandled format).
+        raise ValueError(f"Unknown data format: {data_format}")
+
+    decoder, warning = entry
+    if warning:
+        log.warning(warning)
+    return decoder
+
+
+def get_bytes_decoder(data_format: int | str) -> BytesDecoder:
+    """
+    Get correct decoder for Data Format that can decode raw bytes with decode_bytes.
+
+    Args:
+        data_format: The data format number (3, 5, 6, or "E1")
+
+    Returns:
+        object: Data decoder instance
+
+    Raises:
+        ValueError: If data_format is not a binary data format
+    """
+    entry = _BYTES_DECODERS.get(data_format)
+    if entry is None:
+        raise ValueError(f"Data format {data_format} can't be decoded from bytes")
+
+    decoder, warning = entry
+    if warning:
+        log.warning(warning)
+    return decoder
 
 
 def parse_mac(data_format: int | str, payload_mac: str) -> str:
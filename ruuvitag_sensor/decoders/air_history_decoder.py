@@ -1,11 +1,52 @@
 from __future__ import annotations
 
 import logging
+import struct
+from array import array
+from collections.abc import Iterable
+from functools import partial
+from types import ModuleType
+from typing import Any, cast
 
-from ruuvitag_sensor.ruuvi_types import SensorAirHistoryData
+from ruuvitag_sensor.decoders.columnar import NAN, decode_table, get_numpy
+from ruuvitag_sensor.ruuvi_types import ColumnarSensorData, RawBytes, SensorAirHistoryData
 
 log = logging.getLogger(__name__)
 
+# Record fields: timestamp, data format, temperature, humidity, pressure, PM1.0, PM2.5, PM4.0, PM10.0, CO2,
+# VOC, NOx, sequence counter (high byte and low bytes) and flags. Reserved bytes are skipped.
+_RECORD_STRUCT = struct.Struct(">IBhHHHHHHHBB6xBHB5x")
+
+# Rules for the sensor values of a record, shared by decode_data and decode_columns: name, value that marks
+# a missing value, offset, divisor and decimals. Values without a divisor are not scaled.
+_AIR_HISTORY_FIELDS: tuple[tuple[str, int, float, float | None, int | None], ...] = (
+    ("temperature", -32768, 0.0, 200.0, 2),
+    ("humidity", 0xFFFF, 0.0, 400.0, 3),
+    ("pressure", 0xFFFF, 50000.0, 100.0, 2),
+    ("pm_1", 0xFFFF, 0.0, 10.0, 1),
+    ("pm_2_5", 0xFFFF, 0.0, 10.0, 1),
+    ("pm_4", 0xFFFF, 0.0, 10.0, 1),
+    ("pm_10", 0xFFFF, 0.0, 10.0, 1),
+    ("co2", 0xFFFF, 0.0, None, None),
+    ("voc", 0x1FF, 0.0, None, None),
+    ("nox", 0x1FF, 0.0, None, None),
+    ("measurement_sequence_number", 0xFFFFFF, 0.0, None, None),
+)
+
+_AIR_HISTORY_COLUMNS = tuple(name for name, *_ in _AIR_HISTORY_FIELDS)
+
+# Field name and table of rounded values for NumPy columns
+_decode_tables: dict[str, Any] = {}
+
+
+def _decode_value(value: int, missing: int, offset: float, divisor: float | None, decimals: int | None) -> float | None:
+    """Decode a sensor value of a record with the rules of the field"""
+    if value == missing:
+        return None
+    if divisor is None:
+        return value
+    return round((value + offset) / divisor, decimals)
+
 
 class AirHistoryDecoder:
     """
@@ -40,98 +81,34 @@ class AirHistoryDecoder:
     - Bytes 33-37: Reserved
     """
 
-    def _is_end_marker(self, data: bytearray) -> bool:
+    def _is_end_marker(self, data: RawBytes) -> bool:
         """Check if this is an end marker packet (num_records = 0)."""
         if len(data) < 5:
             return False
         # End marker: destination=0x3B, source=0x3B, operation=0x20, num_records=0, record_length=38
         return data[0] == 0x3B and data[1] == 0x3B and data[2] == 0x20 and data[3] == 0x00 and data[4] == 0x26
 
-    def _get_timestamp(self, record_data: bytearray) -> int:
-        """Extract timestamp from record (bytes 0-3, big-endian)."""
-        return int.from_bytes(record_data[0:4], byteorder="big")
-
-    def _get_temperature(self, record_data: bytearray) -> float | None:
-        """Extract temperature from record (bytes 5-6, int16_t BE, x 200)."""
-        temp_raw = int.from_bytes(record_data[5:7], byteorder="big", signed=False)
-        if temp_raw == 0x8000:
+    @staticmethod
+    def _decode_fields(fields: tuple[int, ...]) -> SensorAirHistoryData | None:
+        """Decode the unpacked fields of a record"""
+        (timestamp, data_format, temperature, humidity, pressure, pm_1, pm_2_5, pm_4, pm_10, co2) = fields[:10]
+        (voc, nox, sequence_high, sequence_low, flags) = fields[10:]
+        if data_format != 0xE1:
+            log.debug("Invalid data format: 0x%02X (expected 0xE1)", data_format)
             return None
-        if temp_raw >= 0x8000:
-            temp_raw = temp_raw - 0x10000
-        return round(temp_raw / 200.0, 2)
-
-    def _get_humidity(self, record_data: bytearray) -> float | None:
-        """Extract humidity from record (bytes 7-8, uint16_t BE, x 400)."""
-        humidity_raw = int.from_bytes(record_data[7:9], byteorder="big")
-        return None if humidity_raw == 0xFFFF else round(humidity_raw / 400.0, 3)
-
-    def _get_pressure(self, record_data: bytearray) -> float | None:
-        """Extract pressure from record (bytes 9-10, uint16_t BE)."""
-        pressure_raw = int.from_bytes(record_data[9:11], byteorder="big")
-        return None if pressure_raw == 0xFFFF else round((pressure_raw + 50000) / 100.0, 2)
-
-    def _get_pm_value(self, record_data: bytearray, offset: int) -> float | None:
-        """Extract PM value from record (uint16_t BE, x 10)."""
-        pm_raw = int.from_bytes(record_data[offset : offset + 2], byteorder="big")
-        return None if pm_raw == 0xFFFF else round(pm_raw / 10.0, 1)
-
-    def _get_co2(self, record_data: bytearray) -> int | None:
-        """Extract CO2 from record (bytes 19-20, uint16_t BE)."""
-        co2_raw = int.from_bytes(record_data[19:21], byteorder="big")
-        return None if co2_raw == 0xFFFF else co2_raw
-
-    def _get_9bit_value(self, record_data: bytearray, byte_offset: int, flag_bit: int) -> int | None:
-        """Extract 9-bit value from record (8 bits in byte + 1 bit in flags)."""
-        flags = record_data[32] if len(record_data) > 32 else 0
-        value_byte = record_data[byte_offset]
-        value_bit9 = (flags >> flag_bit) & 0x01
-        value = value_byte | (value_bit9 << 8)
-        return None if value == 0x1FF else value
-
-    def _get_sequence(self, record_data: bytearray) -> int | None:
-        """Extract sequence counter from record (bytes 29-31, uint24_t BE)."""
-        seq_raw = int.from_bytes(record_data[29:32], byteorder="big")
-        return None if seq_raw == 0xFFFFFF else seq_raw
-
-    def _decode_record(self, record_data: bytearray) -> SensorAirHistoryData | None:
-        """
-        Decode a single 38-byte record.
-
-        Args:
-            record_data: 38-byte record data
 
-        Returns:
-            SensorAirHistoryData or None if invalid
-        """
-        if len(record_data) < 38:
-            log.debug("Record too short: %d bytes", len(record_data))
-            return None
+        # VOC and NOx are 9-bit values, the highest bit is in the flags
+        voc |= ((flags >> 6) & 0x01) << 8
+        nox |= ((flags >> 7) & 0x01) << 8
+        sequence = (sequence_high << 16) | sequence_low
 
-        try:
-            if record_data[4] != 0xE1:
-                log.debug("Invalid data format: 0x%02X (expected 0xE1)", record_data[4])
-                return None
-
-            return {
-                "timestamp": self._get_timestamp(record_data),
-                "temperature": self._get_temperature(record_data),
-                "humidity": self._get_humidity(record_data),
-                "pressure": self._get_pressure(record_data),
-                "pm_1": self._get_pm_value(record_data, 11),
-                "pm_2_5": self._get_pm_value(record_data, 13),
-                "pm_4": self._get_pm_value(record_data, 15),
-                "pm_10": self._get_pm_value(record_data, 17),
-                "co2": self._get_co2(record_data),
-                "voc": self._get_9bit_value(record_data, 21, 6),
-                "nox": self._get_9bit_value(record_data, 22, 7),
-                "measurement_sequence_number": self._get_sequence(record_data),
-            }
-
-        except Exception:
-            log.exception("Failed to decode record")
-            return None
+        values = (temperature, humidity, pressure, pm_1, pm_2_5, pm_4, pm_10, co2, voc, nox, sequence)
+        decoded: dict[str, float | int | None] = {"timestamp": timestamp}
+        for (name, missing, offset, divisor, decimals), value in zip(_AIR_HISTORY_FIELDS, values, strict=True):
+            decoded[name] = _decode_value(value, missing, offset, divisor, decimals)
+        return cast(SensorAirHistoryData, decoded)
 
-    def decode_data(self, data: bytearray) -> list[SensorAirHistoryData]:
+    def decode_data(self, data: RawBytes) -> list[SensorAirHistoryData]:
         """
         Decode a multi-record response packet.
 
@@ -164,16 +141,147 @@ class AirHistoryDecoder:
             log.debug("No records in packet")
             return []
 
-        records = []
+        # Records are unpacked from a view of the packet without copying each record
+        header_size = 5
+        view = memoryview(data)[header_size:]
+        available = min(num_records, len(view) // record_length)
+        if available < num_records:
+            log.debug("Not enough data for record %d", available)
+
+        decode_fields = self._decode_fields
+        return [
+            decoded
+            for fields in _RECORD_STRUCT.iter_unpack(view[: available * record_length])
+            if (decoded := decode_fields(fields)) is not None
+        ]
+
+    def decode_columns(self, data: RawBytes | Iterable[RawBytes], use_numpy: bool | None = None) -> ColumnarSensorData:
+        """
+        Decode multi-record response packets to columns.
+
+        Columns have the same names as the keys of the decode_data result. Timestamp is an integer column
+        and all other columns are float columns where missing values are NaN.
+
+        Args:
+            data: Packet, buffer of consecutive packets (e.g. a whole downloaded history) or list of packets
+            use_numpy: Return NumPy arrays. Default None uses NumPy if it is installed, otherwise
+                columns are array.array
+        Returns:
+            dict: Column of values for each sensor value
+        """
+        packets = [data] if isinstance(data, bytes | bytearray | memoryview) else data
+        regions: list[memoryview] = []
+        for packet in packets:
+            regions.extend(self._get_record_regions(memoryview(packet)))
+
+        np = get_numpy(use_numpy)
+        if np is not None:
+            return self._decode_columns_numpy(np, regions)
+        return self._decode_columns_array(regions)
+
+    def _get_record_regions(self, data: memoryview) -> list[memoryview]:
+        """Get views of the packed record data of each packet in the buffer."""
+        regions = []
         header_size = 5
-        for i in range(num_records):
-            record_start = header_size + (i * record_length)
-            record_end = record_start + record_length
-            if record_end > len(data):
-                log.debug("Not enough data for record %d", i)
+        offset = 0
+        while len(data) - offset >= header_size:
+            if data[offset] != 0x3B or data[offset + 1] != 0x3B or data[offset + 2] != 0x20:
+                log.debug("Invalid packet header at offset %d", offset)
+                break
+
+            num_records = data[offset + 3]
+            record_length = data[offset + 4]
+            if record_length != 38:
+                log.debug("Unexpected record length: %d (expected 38)", record_length)
+                break
+
+            start = offset + header_size
+            end = start + num_records * record_length
+            if end > len(data):
+                log.debug("Not enough data for %d records", num_records)
+                end = start + ((len(data) - start) // record_length) * record_length
+                regions.append(data[start:end])
                 break
-            record_data = data[record_start:record_end]
-            if decoded := self._decode_record(record_data):
-                records.append(decoded)
 
-        return records
+            regions.append(data[start:end])
+            offset = end
+
+        return regions
+
+    def _decode_columns_array(self, regions: list[memoryview]) -> ColumnarSensorData:
+        timestamps = array("q")
+        value_columns = [(name, array("d")) for name in _AIR_HISTORY_COLUMNS]
+
+        # Records are decoded with the same rules as decode_data, missing values are NaN
+        decode_fields = self._decode_fields
+        for region in regions:
+            for fields in _RECORD_STRUCT.iter_unpack(region):
+                decoded = decode_fields(fields)
+                if decoded is None:
+                    continue
+                timestamps.append(decoded["timestamp"])
+                for name, column in value_columns:
+                    value = decoded[name]  # type: ignore[literal-required]
+                    column.append(NAN if value is None else value)
+
+        columns: ColumnarSensorData = {"timestamp": timestamps}
+        columns.update(value_columns)
+        return columns
+
+    def _decode_columns_numpy(self, np: ModuleType, regions: list[memoryview]) -> ColumnarSensorData:
+        dtype = np.dtype(
+            [
+                ("timestamp", ">u4"),
+                ("data_format", "u1"),
+                ("temperature", ">i2"),
+                ("humidity", ">u2"),
+                ("pressure", ">u2"),
+                ("pm_1", ">u2"),
+                ("pm_2_5", ">u2"),
+                ("pm_4", ">u2"),
+                ("pm_10", ">u2"),
+                ("co2", ">u2"),
+                ("voc", "u1"),
+                ("nox", "u1"),
+                ("reserved_1", "V6"),
+                ("sequence_high", "u1"),
+                ("sequence_low", ">u2"),
+                ("flags", "u1"),
+                ("reserved_2", "V5"),
+            ]
+        )
+        if len(regions) == 1:
+            records = np.frombuffer(regions[0], dtype=dtype)
+        else:
+            records = np.concatenate([np.frombuffer(region, dtype=dtype) for region in regions] or [np.empty(0, dtype)])
+
+        valid = records["data_format"] == 0xE1
+        if not valid.all():
+            log.debug("Skipping %d records with invalid data format", np.count_nonzero(~valid))
+            records = records[valid]
+
+        flags = records["flags"].astype(np.uint16)
+        sequence_high = records["sequence_high"].astype(np.uint32)
+        values = {name: records[name] for name in _AIR_HISTORY_COLUMNS if name in records.dtype.names}
+        values["voc"] = records["voc"].astype(np.uint16) | (((flags >> 6) & 0x01) << 8)
+        values["nox"] = records["nox"].astype(np.uint16) | (((flags >> 7) & 0x01) << 8)
+        values["measurement_sequence_number"] = (sequence_high << 16) | records["sequence_low"].astype(np.uint32)
+
+        columns: ColumnarSensorData = {"timestamp": records["timestamp"].astype(np.int64)}
+        for name, missing, offset, divisor, decimals in _AIR_HISTORY_FIELDS:
+            column = values[name]
+            if divisor is None:
+                columns[name] = np.where(column == missing, np.nan, column)
+                continue
+            # Scaled values are 16-bit, so NumPy rounding is replaced with a table of values decoded like
+            # in decode_data. Only temperature is signed, its missing value is negative
+            table = _decode_tables.get(name)
+            if table is None:
+                table = decode_table(
+                    np,
+                    partial(_decode_value, missing=missing, offset=offset, divisor=divisor, decimals=decimals),
+                    signed=missing < 0,
+                )
+                _decode_tables[name] = table
+            columns[name] = table[column]
+        return columns
@@ -0,0 +1,90 @@
+"""
+Helpers for decoders that return columnar data.
+
+Columnar decoders return a dictionary of columns. Columns are NumPy arrays when NumPy is installed,
+otherwise array.array columns. Missing values are NaN in float columns.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from types import ModuleType
+from typing import Any
+
+# Disable imports at the top-level of a file
+# ruff: noqa: PLC0415
+
+NAN = float("nan")
+
+
+def get_numpy(use_numpy: bool | None = None) -> ModuleType | None:
+    """
+    Get NumPy module for columnar decoding.
+
+    Args:
+        use_numpy: True requires NumPy, False never uses it and None uses NumPy if it is installed
+    Returns:
+        module: NumPy module or None if NumPy is not used
+    """
+    if use_numpy is False:
+        return None
+
+    try:
+        import numpy
+    except ImportError:
+        if use_numpy:
+            raise
+        return None
+
+    return numpy
+
+
+def none_to_nan(value: float | None) -> float:
+    return NAN if value is None else value
+
+
+def decode_table(np: ModuleType, decode: Callable[[int], float | None], signed: bool = False) -> Any:
+    """
+    Get a table of decoded values for all 16-bit raw values.
+
+    NumPy rounding differs from Python round, so rounded columns are read from a table that is decoded with
+    the same function as single values. Index the table with the raw values. Negative indexes of signed
+    values wrap around to the end of the table.
+
+    Args:
+        np: NumPy module
+        decode: Function that decodes a raw value and returns None for a missing value
+        signed: Raw values are signed
+    Returns:
+        ndarray: Decoded values, missing values are NaN
+    """
+    raw_values = range(-32768, 32768) if signed else range(65536)
+    table = np.array([none_to_nan(decode(raw)) for raw in raw_values], dtype=np.float64)
+    # Table index of raw value 0 is 0, so negative raw values are at the end of the table
+    return np.roll(table, -32768) if signed else table
+
+
+def join_records(data: Any, record_size: int) -> bytes | bytearray | memoryview:
+    """
+    Get a contiguous buffer of fixed-size records.
+
+    Args:
+        data: Contiguous buffer of records or an iterable of payloads. Only the first
+            record_size bytes of each payload are used.
+        record_size: Size of a record in bytes
+    Returns:
+        bytes: Contiguous buffer of records
+    Raises:
+        ValueError: If buffer or payload size doesn't match the record size
+    """
+    if isinstance(data, bytes | bytearray | memoryview):
+        if len(data) % record_size:
+            raise ValueError(f"Buffer size {len(data)} is not a multiple of record size {record_size}")
+        return data
+
+    buffer = bytearray()
+    for index, payload in enumerate(data):
+        if len(payload) < record_size:
+            raise ValueError(f"Payload {index} is shorter than record size {record_size}")
+        buffer += memoryview(payload)[:record_size]
+    return buffer
@@ -4,10 +4,12 @@ import logging
 import math
 import struct
 
-from ruuvitag_sensor.ruuvi_types import ByteData, SensorData3
+from ruuvitag_sensor.ruuvi_types import ByteData, RawBytes, SensorData3
 
 log = logging.getLogger(__name__)
 
+_DF3_STRUCT = struct.Struct(">BBbBHhhhH")
+
 
 class Df3Decoder:
     """
@@ -58,7 +60,24 @@ class Df3Decoder:
             dict: Sensor values
         """
         try:
-            byte_data: ByteData = struct.unpack(">BBbBHhhhH", bytearray.fromhex(data[:28]))
+            payload = bytes.fromhex(data[:28])
+        except Exception:
+            log.exception("Value: %s not valid", data)
+            return None
+
+        return self.decode_bytes(payload)
+
+    def decode_bytes(self, data: RawBytes) -> SensorData3 | None:
+        """
+        Decode sensor data from raw bytes.
+
+        Args:
+            data: Sensor data starting from the data format byte
+        Returns:
+            dict: Sensor values
+        """
+        try:
+            byte_data: ByteData = _DF3_STRUCT.unpack_from(data)
             acc_x, acc_y, acc_z = self._get_acceleration(byte_data)
             return {
                 "data_format": 3,
@@ -72,5 +91,5 @@ class Df3Decoder:
                 "battery": self._get_battery(byte_data),
             }
         except Exception:
-            log.exception("Value: %s not valid", data)
+            log.exception("Value: %s not valid", bytes(data).hex())
             return None
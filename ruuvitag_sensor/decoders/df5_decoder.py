@@ -3,11 +3,37 @@ from __future__ import annotations
 import logging
 import math
 import struct
+from array import array
+from collections.abc import Callable, Iterable
+from types import ModuleType
+from typing import Any
 
-from ruuvitag_sensor.ruuvi_types import ByteData, SensorData5
+from ruuvitag_sensor.decoders.columnar import decode_table, get_numpy, join_records, none_to_nan
+from ruuvitag_sensor.readings import SensorReading, SensorReading5
+from ruuvitag_sensor.ruuvi_types import ByteData, ColumnarSensorData, RawBytes, SensorData5
 
 log = logging.getLogger(__name__)
 
+_DF5_STRUCT = struct.Struct(">BhHHhhhHBH6B")
+
+# Sensor values in the order of SensorReading5 arguments without MAC and RSSI
+_Values5 = tuple[
+    float | None,
+    float | None,
+    float | None,
+    float | None,
+    int | None,
+    int | None,
+    int | None,
+    int | None,
+    int | None,
+    int,
+    int,
+]
+
+# Decoder class and tables of rounded values for NumPy columns
+_decode_tables: dict[type, tuple[Any, Any, Any]] = {}
+
 
 class Df5Decoder:
     """
@@ -44,6 +70,14 @@ class Df5Decoder:
 
         return data[4:7]  # type: ignore
 
+    def _get_acceleration_total(self, data: ByteData) -> float | None:
+        """Return magnitude of acceleration mG"""
+        acc_x, acc_y, acc_z = self._get_acceleration(data)
+        if acc_x is None or acc_y is None or acc_z is None:
+            return None
+
+        return math.sqrt(acc_x * acc_x + acc_y * acc_y + acc_z * acc_z)
+
     def _get_powerinfo(self, data: ByteData) -> tuple[int, int]:
         """Return battery voltage and tx power"""
         battery_voltage = data[7] >> 5
@@ -83,6 +117,23 @@ class Df5Decoder:
             rssi = (256 - rssi) * -1
         return rssi
 
+    def _decode_values(self, data: ByteData) -> _Values5:
+        """Return sensor values except MAC in the order of SensorReading5 arguments"""
+        acc_x, acc_y, acc_z = self._get_acceleration(data)
+        return (
+            self._get_humidity(data),
+            self._get_temperature(data),
+            self._get_pressure(data),
+            self._get_acceleration_total(data),
+            acc_x,
+            acc_y,
+            acc_z,
+            self._get_txpower(data),
+            self._get_battery(data),
+            self._get_movementcounter(data),
+            self._get_measurementsequencenumber(data),
+        )
+
     def decode_data(self, data: str) -> SensorData5 | None:
         """
         Decode sensor data.
@@ -91,35 +142,276 @@ class Df5Decoder:
             dict: Sensor values
         """
         try:
-            byte_data: ByteData = struct.unpack(">BhHHhhhHBH6B", bytearray.fromhex(data[:48]))
-            rssi = data[48:]
-
-            acc_x, acc_y, acc_z = self._get_acceleration(byte_data)
-            acc = (
-                math.sqrt(acc_x * acc_x + acc_y * acc_y + acc_z * acc_z)
-                if acc_x is not None and acc_y is not None and acc_z is not None
-                else None
-            )
+            payload, rssi_value = self._split_hex(data)
+        except Exception:
+            log.exception("Value: %s not valid", data)
+            return None
+
+        return self.decode_bytes(payload, rssi_value)
+
+    def _split_hex(self, data: str) -> tuple[bytes, int | None]:
+        """Return payload and RSSI of hex encoded sensor data"""
+        rssi = data[48:]
+        return bytes.fromhex(data[:48]), self._get_rssi(rssi) if rssi else None
+
+    def decode_bytes(self, data: RawBytes, rssi: int | None = None) -> SensorData5 | None:
+        """
+        Decode sensor data from raw bytes.
+
+        Args:
+            data: Sensor data starting from the data format byte
+            rssi: RSSI value in dBm, if available
+        Returns:
+            dict: Sensor values
+        """
+        try:
+            byte_data: ByteData = _DF5_STRUCT.unpack_from(data)
 
             # NOTE: Value parsing methods can return None, but it shouldn't happen with the
             # production firmware. Therefore properties are not optional on SensorData-type.
+            values = (5, *self._decode_values(byte_data), self._get_mac(byte_data), rssi)
+            return dict(zip(SensorReading5._keys, values, strict=True))  # type: ignore[return-value]
+        except Exception:
+            log.exception("Value: %s not valid", bytes(data).hex())
+            return None
+
+    def decode_reading(self, data: str | RawBytes, rssi: int | None = None) -> SensorReading5 | None:
+        """
+        Decode sensor data to a compact reading instead of a dictionary.
+
+        Args:
+            data: Hex encoded sensor data, which can have RSSI at the end, or raw bytes starting from
+                the data format byte
+            rssi: RSSI value in dBm, if available. RSSI of hex encoded data is used if rssi is not given
+        Returns:
+            SensorReading5: Sensor values
+        """
+        if isinstance(data, str):
+            try:
+                data, hex_rssi = self._split_hex(data)
+            except Exception:
+                log.exception("Value: %s not valid", data)
+                return None
+            rssi = hex_rssi if rssi is None else rssi
 
-            return {
-                "data_format": 5,
-                "humidity": self._get_humidity(byte_data),  # type: ignore
-                "temperature": self._get_temperature(byte_data),  # type: ignore
-                "pressure": self._get_pressure(byte_data),  # type: ignore
-                "acceleration": acc,  # type: ignore
-                "acceleration_x": acc_x,  # type: ignore
-                "acceleration_y": acc_y,  # type: ignore
-                "acceleration_z": acc_z,  # type: ignore
-                "tx_power": self._get_txpower(byte_data),  # type: ignore
-                "battery": self._get_battery(byte_data),  # type: ignore
-                "movement_counter": self._get_movementcounter(byte_data),
-                "measurement_sequence_number": self._get_measurementsequencenumber(byte_data),
-                "mac": self._get_mac(byte_data),
-                "rssi": self._get_rssi(rssi) if rssi else None,
-            }
+        try:
+            byte_data: ByteData = _DF5_STRUCT.unpack_from(data)
+            return SensorReading5(*self._decode_values(byte_data), self._get_mac(byte_data), rssi)
         except Exception:
-            log.exception("Value: %s not valid", data)
+            log.exception("Value: %s not valid", bytes(data).hex())
+            return None
+
+    def decode_lazy(self, data: str | RawBytes, rssi: int | None = None) -> LazySensorReading5 | None:
+        """
+        Decode sensor data to a reading that decodes each value on first access.
+
+        Args:
+            data: Hex encoded sensor data, which can have RSSI at the end, or raw bytes starting from
+                the data format byte
+            rssi: RSSI value in dBm, if available. RSSI of hex encoded data is used if rssi is not given
+        Returns:
+            LazySensorReading5: Sensor values
+        """
+        if isinstance(data, str):
+            try:
+                data, hex_rssi = self._split_hex(data)
+            except Exception:
+                log.exception("Value: %s not valid", data)
+                return None
+            rssi = hex_rssi if rssi is None else rssi
+
+        try:
+            # Unpacked values don't refer to the payload, so adapters can reuse their buffers
+            byte_data: ByteData = _DF5_STRUCT.unpack_from(data)
+        except Exception:
+            log.exception("Value: %s not valid", bytes(data).hex())
             return None
+
+        return LazySensorReading5(byte_data, rssi)
+
+    def decode_batch(self, data: RawBytes | Iterable[RawBytes], use_numpy: bool | None = None) -> ColumnarSensorData:
+        """
+        Decode many sensor data payloads to columns.
+
+        Columns have the same names as the keys of the decode_data result, except MAC and RSSI
+        are not included. Missing values are NaN, so all columns except movement_counter and
+        measurement_sequence_number are float columns.
+
+        Args:
+            data: List of payloads starting from the data format byte or a contiguous buffer of 24-byte records
+            use_numpy: Return NumPy arrays. Default None uses NumPy if it is installed, otherwise
+                columns are array.array
+        Returns:
+            dict: Column of values for each sensor value
+        Raises:
+            ValueError: If data has records that are not Data Format 5 or have invalid length
+        """
+        buffer = join_records(data, _DF5_STRUCT.size)
+        np = get_numpy(use_numpy)
+        if np is not None:
+            return self._decode_batch_numpy(np, buffer)
+        return self._decode_batch_array(buffer)
+
+    def _decode_batch_array(self, buffer: RawBytes) -> ColumnarSensorData:
+        float_columns = (
+            "temperature",
+            "humidity",
+            "pressure",
+            "acceleration",
+            "acceleration_x",
+            "acceleration_y",
+            "acceleration_z",
+            "tx_power",
+            "battery",
+        )
+        columns: ColumnarSensorData = {name: array("d") for name in float_columns}
+        columns["movement_counter"] = array("B")
+        columns["measurement_sequence_number"] = array("H")
+
+        # Columns in the order of _decode_values
+        value_columns = [columns[name] for name in SensorReading5._keys[1:-2]]
+        for index, byte_data in enumerate(_DF5_STRUCT.iter_unpack(buffer)):
+            if byte_data[0] != 5:
+                raise ValueError(f"Record {index} is not Data Format 5")
+
+            for column, value in zip(value_columns, self._decode_values(byte_data), strict=True):
+                column.append(none_to_nan(value))
+
+        return columns
+
+    def _decode_batch_numpy(self, np: ModuleType, buffer: RawBytes) -> ColumnarSensorData:
+        records = np.frombuffer(
+            buffer,
+            dtype=np.dtype(
+                [
+                    ("data_format", "u1"),
+                    ("temperature", ">i2"),
+                    ("humidity", ">u2"),
+                    ("pressure", ">u2"),
+                    ("acceleration_x", ">i2"),
+                    ("acceleration_y", ">i2"),
+                    ("acceleration_z", ">i2"),
+                    ("power_info", ">u2"),
+                    ("movement_counter", "u1"),
+                    ("measurement_sequence_number", ">u2"),
+                    ("mac", "V6"),
+                ]
+            ),
+        )
+
+        invalid = np.flatnonzero(records["data_format"] != 5)
+        if invalid.size:
+            raise ValueError(f"Record {invalid[0]} is not Data Format 5")
+
+        temperature_table, humidity_table, pressure_table = self._get_decode_tables(np)
+        acc_x = records["acceleration_x"].astype(np.float64)
+        acc_y = records["acceleration_y"].astype(np.float64)
+        acc_z = records["acceleration_z"].astype(np.float64)
+        battery_voltage = records["power_info"] >> 5
+        tx_power = records["power_info"] & 0x001F
+
+        acc_missing = (acc_x == -32768) | (acc_y == -32768) | (acc_z == -32768)
+        acc_x[acc_missing] = np.nan
+        acc_y[acc_missing] = np.nan
+        acc_z[acc_missing] = np.nan
+
+        return {
+            "temperature": temperature_table[records["temperature"]],
+            "humidity": humidity_table[records["humidity"]],
+            "pressure": pressure_table[records["pressure"]],
+            "acceleration": np.sqrt(acc_x * acc_x + acc_y * acc_y + acc_z * acc_z),
+            "acceleration_x": acc_x,
+            "acceleration_y": acc_y,
+            "acceleration_z": acc_z,
+            "tx_power": np.where(tx_power == 0b11111, np.nan, -40 + (tx_power * 2.0)),
+            "battery": np.where(battery_voltage == 0b11111111111, np.nan, battery_voltage + 1600.0),
+            "movement_counter": records["movement_counter"].astype(np.uint8),
+            "measurement_sequence_number": records["measurement_sequence_number"].astype(np.uint16),
+        }
+
+    def _get_decode_tables(self, np: ModuleType) -> tuple[Any, Any, Any]:
+        """Return tables of temperature, humidity and pressure decoded with the same methods as decode_data"""
+        tables = _decode_tables.get(type(self))
+        if tables is None:
+            tables = (
+                decode_table(np, lambda raw: self._get_temperature((5, raw)), signed=True),
+                decode_table(np, lambda raw: self._get_humidity((5, 0, raw))),
+                decode_table(np, lambda raw: self._get_pressure((5, 0, 0, raw))),
+            )
+            _decode_tables[type(self)] = tables
+        return tables
+
+
+_DECODER = Df5Decoder()
+_NOT_DECODED = object()
+# Value name and function that decodes the value from the unpacked payload
+_LAZY_VALUES: dict[str, Callable[[ByteData], Any]] = {
+    "humidity": _DECODER._get_humidity,
+    "temperature": _DECODER._get_temperature,
+    "pressure": _DECODER._get_pressure,
+    "acceleration": _DECODER._get_acceleration_total,
+    "acceleration_x": lambda data: _DECODER._get_acceleration(data)[0],
+    "acceleration_y": lambda data: _DECODER._get_acceleration(data)[1],
+    "acceleration_z": lambda data: _DECODER._get_acceleration(data)[2],
+    "tx_power": _DECODER._get_txpower,
+    "battery": _DECODER._get_battery,
+    "movement_counter": _DECODER._get_movementcounter,
+    "measurement_sequence_number": _DECODER._get_measurementsequencenumber,
+    "mac": _DECODER._get_mac,
+}
+
+
+class LazySensorReading5(SensorReading):
+    """
+    Data Format 5 reading that keeps the unpacked payload and decodes each value when it is first accessed.
+
+    Decoded values are memoized, so a value is decoded only once. Consumers that read a few values skip
+    decoding the rest, e.g. the acceleration magnitude and the MAC. Reading has the same keys and values
+    as SensorReading5.
+
+    Args:
+        byte_data (tuple): Payload unpacked with the Data Format 5 struct
+        rssi (int): RSSI value in dBm, if available
+        bt_device (str): Bluetooth device that received the advertisement
+    """
+
+    __slots__ = ("_byte_data", "_values")
+
+    data_format = 5
+    _keys = SensorReading5._keys
+
+    def __init__(self, byte_data: ByteData, rssi: int | None = None, bt_device: str | None = None):
+        self._byte_data = byte_data
+        self._values: dict[str, Any] = {}
+        self.rssi = rssi
+        self.bt_device = bt_device
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._values.get(key, _NOT_DECODED)
+        if value is not _NOT_DECODED:
+            return value
+        decode = _LAZY_VALUES.get(key)
+        if decode is None:
+            return super().__getitem__(key)
+        value = self._values[key] = decode(self._byte_data)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _LAZY_VALUES:
+            self._values[key] = value
+        else:
+            super().__setitem__(key, value)
+
+    def __getattr__(self, name: str) -> Any:
+        # Called only for attributes that are not slots, so sensor values are decoded with __getitem__
+        if name in _LAZY_VALUES:
+            return self[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def copy(self) -> LazySensorReading5:
+        reading = LazySensorReading5(self._byte_data, self.rssi, self.bt_device)
+        reading._values = self._values.copy()
+        return reading
+
+    def to_dict(self) -> dict[str, Any]:
+        return {key: self[key] for key in self._current_keys()}
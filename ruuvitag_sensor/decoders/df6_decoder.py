@@ -4,10 +4,28 @@ import logging
 import math
 import struct
 
-from ruuvitag_sensor.ruuvi_types import ByteData, SensorData6
+from ruuvitag_sensor.readings import SensorReading6
+from ruuvitag_sensor.ruuvi_types import ByteData, RawBytes, SensorData6
 
 log = logging.getLogger(__name__)
 
+_DF6_STRUCT = struct.Struct(">BhHHHHBBBBBBBBB")
+
+# Sensor values in the order of SensorReading6 arguments without RSSI
+_Values6 = tuple[
+    float | None,
+    float | None,
+    float | None,
+    float | None,
+    int | None,
+    int | None,
+    int | None,
+    float | None,
+    int,
+    bool,
+    str,
+]
+
 
 class Df6Decoder:
     """
@@ -111,10 +129,43 @@ class Df6Decoder:
         """Return MAC address (last 3 bytes)"""
         return "".join(f"{x:02x}" for x in data[12:15])
 
+    def _decode_values(self, data: ByteData) -> _Values6:
+        """Return sensor values in the order of SensorReading6 arguments"""
+        return (
+            self._get_temperature(data),
+            self._get_humidity(data),
+            self._get_pressure(data),
+            self._get_pm_2_5(data),
+            self._get_co2(data),
+            self._get_voc(data),
+            self._get_nox(data),
+            self._get_luminosity(data),
+            self._get_measurement_sequence_number(data),
+            self._get_calibration_in_progress(data),
+            self._get_mac(data),
+        )
+
     def decode_data(self, data: str) -> SensorData6 | None:
         """
         Decode sensor data.
 
+        Returns:
+            dict: Sensor values
+        """
+        try:
+            payload = bytes.fromhex(data[:40])
+        except Exception:
+            log.exception("Value: %s not valid", data)
+            return None
+
+        return self.decode_bytes(payload)
+
+    def decode_bytes(self, data: RawBytes) -> SensorData6 | None:
+        """
+        Decode sensor data from raw bytes.
+
+        Args:
+            data: Sensor data starting from the data format byte
         Returns:
             dict: Sensor values
         """
@@ -133,22 +184,28 @@ class Df6Decoder:
             # 15: measurement_sequence (uint8)
             # 16: flags (uint8)
             # 17-19: mac (3 bytes)
-            byte_data: ByteData = struct.unpack(">BhHHHHBBBBBBBBB", bytearray.fromhex(data[:40]))
-
-            return {
-                "data_format": 6,
-                "temperature": self._get_temperature(byte_data),  # type: ignore
-                "humidity": self._get_humidity(byte_data),  # type: ignore
-                "pressure": self._get_pressure(byte_data),  # type: ignore
-                "pm_2_5": self._get_pm_2_5(byte_data),  # type: ignore
-                "co2": self._get_co2(byte_data),  # type: ignore
-                "voc": self._get_voc(byte_data),  # type: ignore
-                "nox": self._get_nox(byte_data),  # type: ignore
-                "luminosity": self._get_luminosity(byte_data),  # type: ignore
-                "measurement_sequence_number": self._get_measurement_sequence_number(byte_data),
-                "calibration_in_progress": self._get_calibration_in_progress(byte_data),
-                "mac": self._get_mac(byte_data),
-            }
+            byte_data: ByteData = _DF6_STRUCT.unpack_from(data)
+
+            values = (6, *self._decode_values(byte_data))
+            return dict(zip(SensorReading6._keys, values, strict=True))  # type: ignore[return-value]
         except Exception:
-            log.exception("Value: %s not valid", data)
+            log.exception("Value: %s not valid", bytes(data).hex())
+            return None
+
+    def decode_reading(self, data: str | RawBytes) -> SensorReading6 | None:
+        """
+        Decode sensor data to a compact reading instead of a dictionary.
+
+        Args:
+            data: Hex encoded sensor data or raw bytes starting from the data format byte
+        Returns:
+            SensorReading6: Sensor values
+        """
+        try:
+            payload = bytes.fromhex(data[:40]) if isinstance(data, str) else data
+            byte_data: ByteData = _DF6_STRUCT.unpack_from(payload)
+
+            return SensorReading6(*self._decode_values(byte_data))
+        except Exception:
+            log.exception("Value: %s not valid", data if isinstance(data, str) else bytes(data).hex())
             return None
@@ -3,10 +3,31 @@ from __future__ import annotations
 import logging
 import struct
 
-from ruuvitag_sensor.ruuvi_types import ByteData, SensorDataE1
+from ruuvitag_sensor.readings import SensorReadingE1
+from ruuvitag_sensor.ruuvi_types import ByteData, RawBytes, SensorDataE1
 
 log = logging.getLogger(__name__)
 
+_DFE1_STRUCT = struct.Struct(">BhHHHHHHHBB3s3s3sB5s6s")
+
+# Sensor values in the order of SensorReadingE1 arguments without RSSI
+_ValuesE1 = tuple[
+    float | None,
+    float | None,
+    float | None,
+    float | None,
+    float | None,
+    float | None,
+    float | None,
+    int | None,
+    int | None,
+    int | None,
+    float | None,
+    int | None,
+    bool,
+    str,
+]
+
 
 class DfE1Decoder:
     """
@@ -110,6 +131,25 @@ class DfE1Decoder:
     def _get_mac(self, data: ByteData) -> str:
         return ":".join(f"{b:02X}" for b in bytes(data[16]))
 
+    def _decode_values(self, data: ByteData) -> _ValuesE1:
+        """Return sensor values in the order of SensorReadingE1 arguments"""
+        return (
+            self._get_humidity(data),
+            self._get_temperature(data),
+            self._get_pressure(data),
+            self._get_pm1_ug_m3(data),
+            self._get_pm25_ug_m3(data),
+            self._get_pm4_ug_m3(data),
+            self._get_pm10_ug_m3(data),
+            self._get_co2_ppm(data),
+            self._get_voc_index(data),
+            self._get_nox_index(data),
+            self._get_luminosity_lux(data),
+            self._get_measurementsequencenumber(data),
+            self._get_calibration_in_progress(data),
+            self._get_mac(data),
+        )
+
     def decode_data(self, data: str) -> SensorDataE1 | None:
         """
         Decode sensor data.
@@ -118,24 +158,44 @@ class DfE1Decoder:
             dict: Sensor values
         """
         try:
-            byte_data: ByteData = struct.unpack(">BhHHHHHHHBB3s3s3sB5s6s", bytearray.fromhex(data[:80]))
-            return {
-                "data_format": "E1",
-                "humidity": self._get_humidity(byte_data),  # type: ignore
-                "temperature": self._get_temperature(byte_data),  # type: ignore
-                "pressure": self._get_pressure(byte_data),  # type: ignore
-                "pm_1": self._get_pm1_ug_m3(byte_data),  # type: ignore
-                "pm_2_5": self._get_pm25_ug_m3(byte_data),  # type: ignore
-                "pm_4": self._get_pm4_ug_m3(byte_data),  # type: ignore
-                "pm_10": self._get_pm10_ug_m3(byte_data),  # type: ignore
-                "co2": self._get_co2_ppm(byte_data),  # type: ignore
-                "voc": self._get_voc_index(byte_data),  # type: ignore
-                "nox": self._get_nox_index(byte_data),  # type: ignore
-                "luminosity": self._get_luminosity_lux(byte_data),  # type: ignore
-                "measurement_sequence_number": self._get_measurementsequencenumber(byte_data),  # type: ignore
-                "calibration_in_progress": self._get_calibration_in_progress(byte_data),
-                "mac": self._get_mac(byte_data),
-            }
+            payload = bytes.fromhex(data[:80])
         except Exception:
             log.exception("Value: %s not valid", data)
             return None
+
+        return self.decode_bytes(payload)
+
+    def decode_bytes(self, data: RawBytes) -> SensorDataE1 | None:
+        """
+        Decode sensor data from raw bytes.
+
+        Args:
+            data: Sensor data starting from the data format byte
+        Returns:
+            dict: Sensor values
+        """
+        try:
+            byte_data: ByteData = _DFE1_STRUCT.unpack_from(data)
+            values = ("E1", *self._decode_values(byte_data))
+            return dict(zip(SensorReadingE1._keys, values, strict=True))  # type: ignore[return-value]
+        except Exception:
+            log.exception("Value: %s not valid", bytes(data).hex())
+            return None
+
+    def decode_reading(self, data: str | RawBytes) -> SensorReadingE1 | None:
+        """
+        Decode sensor data to a compact reading instead of a dictionary.
+
+        Args:
+            data: Hex encoded sensor data or raw bytes starting from the data format byte
+        Returns:
+            SensorReadingE1: Sensor values
+        """
+        try:
+            payload = bytes.fromhex(data[:80]) if isinstance(data, str) else data
+            byte_data: ByteData = _DFE1_STRUCT.unpack_from(payload)
+
+            return SensorReadingE1(*self._decode_values(byte_data))
+        except Exception:
+            log.exception("Value: %s not valid", data if isinstance(data, str) else bytes(data).hex())
+            return None
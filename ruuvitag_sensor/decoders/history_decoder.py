@@ -1,11 +1,18 @@
 from __future__ import annotations
 
 import logging
+import struct
 
-from ruuvitag_sensor.ruuvi_types import SensorHistoryData
+from ruuvitag_sensor.ruuvi_types import RawBytes, SensorHistoryData
 
 log = logging.getLogger(__name__)
 
+# Command byte, packet type, header, timestamp, reserved and sensor value
+_PACKET_STRUCT = struct.Struct(">BBBIHH")
+
+COMMAND_BYTE = 0x3A
+HEADER_ERROR = 0xF0
+
 
 class HistoryDecoder:
     """
@@ -28,50 +35,46 @@ class HistoryDecoder:
     - End marker packet has command byte 0x3A followed by 0x3A
     """
 
-    def _is_error_packet(self, data: list[str]) -> bool:
-        """Check if this is an error packet"""
-        return data[2] == "F0" and all(b == "ff" for b in data[3:])
-
-    def _is_end_marker(self, data: list[str]) -> bool:
-        """Check if this is an end marker packet"""
-        return data[0] == "3a" and data[1] == "3a" and all(b == "ff" for b in data[3:])
-
-    def _get_timestamp(self, data: list[str]) -> int:
-        """Return timestamp"""
-        # The timestamp is a 4-byte value after the header byte, in seconds since Unix epoch
-        timestamp_bytes = bytes.fromhex("".join(data[3:7]))
-        timestamp = int.from_bytes(timestamp_bytes, "big")
-        return timestamp
-        # return datetime.fromtimestamp(timestamp, tz=timezone.utc)
-
-    def _get_temperature(self, data: list[str]) -> float | None:
-        """Return temperature in celsius"""
-        if data[1] != "30":  # '0' for temperature
-            return None
-        # Temperature is in 0.01°C units, big-endian
-        temp_bytes = bytes.fromhex("".join(data[9:11]))
-        temp_raw = int.from_bytes(temp_bytes, "big")
-        return round(temp_raw * 0.01, 2)
-
-    def _get_humidity(self, data: list[str]) -> float | None:
-        """Return humidity %"""
-        if data[1] != "31":  # '1' for humidity
+    @staticmethod
+    def _decode_packet(fields: tuple[int, ...]) -> SensorHistoryData | None:  # noqa: PLR0911
+        """Decode the unpacked fields of a packet"""
+        command, packet_type, header, timestamp, reserved, value = fields
+        if command != COMMAND_BYTE:
+            log.info("Invalid command byte: 0x%02X (expected 0x3A)", command)
             return None
-        # Humidity is in 0.01% units, big-endian
-        humidity_bytes = bytes.fromhex("".join(data[9:11]))
-        humidity_raw = int.from_bytes(humidity_bytes, "big")
-        return round(humidity_raw * 0.01, 2)
-
-    def _get_pressure(self, data: list[str]) -> float | None:
-        """Return air pressure hPa"""
-        if data[1] != "32":  # '2' for pressure
-            return None
-        # Pressure is in hPa units, big-endian
-        pressure_bytes = bytes.fromhex("".join(data[9:11]))
-        pressure_raw = int.from_bytes(pressure_bytes, "big")
-        return float(pressure_raw)
 
-    def decode_data(self, data: bytearray) -> SensorHistoryData | None:  # noqa: PLR0911
+        # Error and end marker packets have all bytes after the header set to 0xFF
+        if timestamp == 0xFFFFFFFF and reserved == 0xFFFF and value == 0xFFFF:
+            if header == HEADER_ERROR:
+                log.info("Device reported error in log reading")
+                return None
+            if packet_type == COMMAND_BYTE:
+                log.debug("End marker packet received")
+                return None
+
+        # Each packet type contains one measurement
+        match packet_type:
+            case 0x30:  # '0' temperature, 0.01°C units
+                return {
+                    "temperature": round(value * 0.01, 2),
+                    "humidity": None,
+                    "pressure": None,
+                    "timestamp": timestamp,
+                }
+            case 0x31:  # '1' humidity, 0.01% units
+                return {
+                    "temperature": None,
+                    "humidity": round(value * 0.01, 2),
+                    "pressure": None,
+                    "timestamp": timestamp,
+                }
+            case 0x32:  # '2' pressure, hPa units
+                return {"temperature": None, "humidity": None, "pressure": float(value), "timestamp": timestamp}
+            case _:
+                log.info("Invalid packet type: %02x", packet_type)
+                return None
+
+    def decode_data(self, data: RawBytes) -> SensorHistoryData | None:
         """
         Decode history data from RuuviTag.
 
@@ -84,59 +87,35 @@ class HistoryDecoder:
             SensorDataHistory: Decoded sensor values with timestamp, or None if decoding fails
             Returns None for both invalid data and end marker packets
         """
-        try:
-            hex_values = [format(x, "02x") for x in data]
-
-            if len(hex_values) != 11:
-                if len(data) >= 5 and (data[0] == 0x3B or data[0] == 0xE1 or (len(data) >= 38 and data[4] == 0xE1)):
-                    log.error(
-                        "Received data appears to be from Ruuvi Air device. "
-                        "Please use device_type='ruuvi_air' when calling get_history_async() or download_history()"
-                    )
-                else:
-                    log.info("History data unexpected length: %d bytes (expected 11)", len(hex_values))
-                return None
+        if len(data) != _PACKET_STRUCT.size:
+            if len(data) >= 5 and (data[0] == 0x3B or data[0] == 0xE1 or (len(data) >= 38 and data[4] == 0xE1)):
+                log.error(
+                    "Received data appears to be from Ruuvi Air device. "
+                    "Please use device_type='ruuvi_air' when calling get_history_async() or download_history()"
+                )
+            else:
+                log.info("History data unexpected length: %d bytes (expected 11)", len(data))
+            return None
 
-            if hex_values[0] != "3a":
-                log.info("Invalid command byte: 0x%02X (expected 0x3A)", data[0])
-                return None
+        return self._decode_packet(_PACKET_STRUCT.unpack(data))
 
-            if self._is_error_packet(hex_values):
-                log.info("Device reported error in log reading")
-                return None
+    def decode_buffer(self, data: RawBytes) -> list[SensorHistoryData]:
+        """
+        Decode a buffer of consecutive 11-byte packets, e.g. a whole downloaded history.
 
-            if self._is_end_marker(hex_values):
-                log.debug("End marker packet received")
-                return None
+        Args:
+            data: Concatenated raw history packets
 
-            # Each packet type contains one measurement
-            packet_type = hex_values[1]
-            match packet_type:
-                case "30":  # '0' temperature
-                    return {
-                        "temperature": self._get_temperature(hex_values),
-                        "humidity": None,
-                        "pressure": None,
-                        "timestamp": self._get_timestamp(hex_values),
-                    }
-                case "31":  # '1' humidity
-                    return {
-                        "temperature": None,
-                        "humidity": self._get_humidity(hex_values),
-                        "pressure": None,
-                        "timestamp": self._get_timestamp(hex_values),
-                    }
-                case "32":  # '2' pressure
-                    return {
-                        "temperature": None,
-                        "humidity": None,
-                        "pressure": self._get_pressure(hex_values),
-                        "timestamp": self._get_timestamp(hex_values),
-                    }
-                case _:
-                    log.info("Invalid packet type: %s - %s", packet_type, data)
-                    return None
-
-        except Exception:
-            log.exception("Value not valid: %s", data)
-            return None
+        Returns:
+            list: Decoded sensor values of valid packets. End marker, error and invalid packets are skipped
+        """
+        view = memoryview(data)
+        remainder = len(view) % _PACKET_STRUCT.size
+        if remainder:
+            log.info("History buffer has %d bytes of incomplete packet", remainder)
+            view = view[: len(view) - remainder]
+
+        decode_packet = self._decode_packet
+        return [
+            decoded for fields in _PACKET_STRUCT.iter_unpack(view) if (decoded := decode_packet(fields)) is not None
+        ]
@@ -0,0 +1,107 @@
+import logging
+from collections.abc import AsyncGenerator, Awaitable, Callable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from ruuvitag_sensor.ruuvi_types import DeviceType, SensorAirHistoryData, SensorHistoryData
+
+log = logging.getLogger(__name__)
+
+HistoryDownload = Callable[[str, DeviceType], Awaitable[list[SensorHistoryData | SensorAirHistoryData]]]
+
+
+@dataclass
+class HistoryDownloadResult:
+    """
+    Result of a history download from one device
+
+    Attributes:
+        mac (str): MAC address or UUID of the device
+        device_type (DeviceType): Device type
+        data (list): Downloaded history entries. Empty if the download failed
+        error (Exception): Error of the last attempt if all attempts failed, otherwise None
+        attempts (int): Number of download attempts
+    """
+
+    mac: str
+    device_type: DeviceType
+    data: list[SensorHistoryData | SensorAirHistoryData] = field(default_factory=list)
+    error: Exception | None = None
+    attempts: int = 0
+
+
+def order_by_staleness(
+    devices: Mapping[str, DeviceType], last_downloaded: Mapping[str, datetime] | None = None
+) -> list[tuple[str, DeviceType]]:
+    """
+    Order devices so that devices that have never been downloaded are first, followed by the device
+    with the oldest download. Devices with the same staleness keep their order.
+    """
+    if not last_downloaded:
+        return list(devices.items())
+
+    def staleness(item: tuple[str, DeviceType]) -> tuple[bool, float]:
+        downloaded = last_downloaded.get(item[0])
+        return (downloaded is not None, downloaded.timestamp() if downloaded else 0)
+
+    return sorted(devices.items(), key=staleness)
+
+
+async def download_many(
+    download: HistoryDownload,
+    devices: list[tuple[str, DeviceType]],
+    max_concurrent: int = 3,
+    max_retries: int = 2,
+    retry_delay_sec: float = 5.0,
+) -> AsyncGenerator[HistoryDownloadResult, None]:
+    """
+    Download history from multiple devices concurrently.
+
+    Devices get a connection slot in the list order. A failed device releases its slot while it waits
+    for the retry, so other devices are downloaded in the meantime, and the retry waits for a free slot
+    after the devices already waiting.
+
+    Args:
+        download (Callable): Coroutine function that downloads history of a MAC and device type
+        devices (list): MAC and device type in priority order
+        max_concurrent (int): Maximum number of simultaneous connections. Default 3
+        max_retries (int): Number of retries after a failed download. Default 2
+        retry_delay_sec (float): Delay before the first retry. Delay is doubled for each retry. Default 5
+    Yields:
+        HistoryDownloadResult: Result of each device when its download is finished
+    """
+    import asyncio  # noqa: PLC0415
+
+    slots = asyncio.Semaphore(max_concurrent)
+    results: asyncio.Queue[HistoryDownloadResult] = asyncio.Queue()
+
+    async def download_device(mac: str, device_type: DeviceType) -> None:
+        result = HistoryDownloadResult(mac, device_type)
+        while True:
+            result.attempts += 1
+            try:
+                async with slots:
+                    log.debug("Downloading history from %s (attempt %s)", mac, result.attempts)
+                    result.data = await download(mac, device_type)
+                    result.error = None
+                    break
+            except Exception as e:
+                result.error = e
+                if result.attempts > max_retries:
+                    log.error("Failed to download history from %s: %s", mac, e)
+                    break
+                delay = retry_delay_sec * 2 ** (result.attempts - 1)
+                log.info("History download from %s failed: %s - Retrying in %ss", mac, e, delay)
+                await asyncio.sleep(delay)
+        results.put_nowait(result)
+
+    # Tasks are created in priority order, and the semaphore gives free slots to the longest waiting task
+    tasks = [asyncio.create_task(download_device(mac, device_type)) for mac, device_type in devices]
+
+    try:
+        for _ in tasks:
+            yield await results.get()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,63 @@
+from collections.abc import AsyncGenerator, AsyncIterable
+from typing import Literal
+
+from ruuvitag_sensor.ruuvi_types import SensorHistoryData
+
+_VALUE_KEYS: tuple[Literal["temperature", "humidity", "pressure"], ...] = ("temperature", "humidity", "pressure")
+
+
+class HistoryRowMerger:
+    """
+    Merge RuuviTag history entries of the same timestamp into one row.
+
+    RuuviTag sends temperature, humidity and pressure as separate entries. Entries are sent in time order,
+    so only the row of the current timestamp is kept in memory. The row is complete when it has all values
+    or when an entry with another timestamp is received.
+    """
+
+    def __init__(self) -> None:
+        self._row: SensorHistoryData | None = None
+
+    def put(self, entry: SensorHistoryData) -> list[SensorHistoryData]:
+        """
+        Add entry to the row of its timestamp.
+
+        Returns:
+            list: Rows that are complete after the entry
+        """
+        completed = []
+        if self._row is not None and self._row["timestamp"] != entry["timestamp"]:
+            completed.append(self._row)
+            self._row = None
+
+        if self._row is None:
+            self._row = {"temperature": None, "humidity": None, "pressure": None, "timestamp": entry["timestamp"]}
+        for key in _VALUE_KEYS:
+            if entry[key] is not None:
+                self._row[key] = entry[key]
+
+        if all(self._row[key] is not None for key in _VALUE_KEYS):
+            completed.append(self._row)
+            self._row = None
+        return completed
+
+    def flush(self) -> list[SensorHistoryData]:
+        """Return the incomplete row of the latest timestamp, if any"""
+        row, self._row = self._row, None
+        return [row] if row is not None else []
+
+
+async def merge_history_rows(data_iter: AsyncIterable[SensorHistoryData]) -> AsyncGenerator[SensorHistoryData, None]:
+    """
+    Merge a stream of RuuviTag history entries into one row per timestamp.
+
+    Yields:
+        SensorHistoryData: Temperature, humidity and pressure of one timestamp. Values that the device
+            didn't send are None
+    """
+    merger = HistoryRowMerger()
+    async for entry in data_iter:
+        for row in merger.put(entry):
+            yield row
+    for row in merger.flush():
+        yield row
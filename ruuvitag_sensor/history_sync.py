@@ -0,0 +1,134 @@
+import abc
+import json
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+
+DEFAULT_WATERMARK_PATH = Path.home() / ".ruuvitag_sensor" / "history_watermarks.json"
+
+
+class WatermarkStore:
+    """
+    Store for the timestamp of the latest history entry received from each device.
+
+    History sync continues from the stored timestamp, so only new entries are downloaded.
+    """
+
+    __metaclass__ = abc.ABCMeta
+
+    @abc.abstractmethod
+    def get(self, mac: str) -> int | None:
+        """
+        Returns:
+            int: Unix timestamp of the latest received history entry or None if history has never been synced
+        """
+
+    @abc.abstractmethod
+    def set(self, mac: str, timestamp: int) -> None:
+        pass
+
+
+class MemoryWatermarkStore(WatermarkStore):
+    """Watermarks in memory for the lifetime of the store"""
+
+    def __init__(self) -> None:
+        self._watermarks: dict[str, int] = {}
+
+    def get(self, mac: str) -> int | None:
+        return self._watermarks.get(mac)
+
+    def set(self, mac: str, timestamp: int) -> None:
+        self._watermarks[mac] = timestamp
+
+
+class JsonWatermarkStore(WatermarkStore):
+    """
+    Watermarks in a JSON file. File is replaced atomically on every update, so an interrupted
+    write doesn't lose earlier watermarks.
+
+    Args:
+        path (str | Path): Path of the JSON file. Default ~/.ruuvitag_sensor/history_watermarks.json
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_WATERMARK_PATH) -> None:
+        self.path = Path(path)
+        self._watermarks: dict[str, int] = {}
+        if self.path.exists():
+            self._watermarks = json.loads(self.path.read_text())
+
+    def get(self, mac: str) -> int | None:
+        return self._watermarks.get(mac)
+
+    def set(self, mac: str, timestamp: int) -> None:
+        self._watermarks[mac] = timestamp
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix=".tmp")
+        with os.fdopen(fd, "w") as tmp_file:
+            json.dump(self._watermarks, tmp_file, indent=2, sort_keys=True)
+        Path(tmp_path).replace(self.path)
+
+
+class SqliteWatermarkStore(WatermarkStore):
+    """
+    Watermarks in a SQLite database.
+
+    Args:
+        path (str | Path): Path of the database file
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._connection = sqlite3.connect(self.path)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS history_watermark (mac TEXT PRIMARY KEY, timestamp INTEGER NOT NULL)"
+            )
+
+    def get(self, mac: str) -> int | None:
+        row = self._connection.execute("SELECT timestamp FROM history_watermark WHERE mac = ?", (mac,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, mac: str, timestamp: int) -> None:
+        with self._connection:
+            self._connection.execute(
+                "INSERT INTO history_watermark (mac, timestamp) VALUES (?, ?) "
+                "ON CONFLICT(mac) DO UPDATE SET timestamp = excluded.timestamp",
+                (mac, timestamp),
+            )
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class WatermarkTracker:
+    """
+    Track which history entries of a sync are new and which timestamps are complete.
+
+    RuuviTag sends temperature, humidity and pressure of the same time as separate entries, so a timestamp
+    is complete only when an entry with a newer timestamp is received or the download ends. Storing only
+    complete timestamps means that an interrupted sync doesn't skip the missing entries of the last timestamp.
+
+    Args:
+        watermark (int): Timestamp of the latest entry received in the previous sync or None
+    """
+
+    def __init__(self, watermark: int | None) -> None:
+        self.watermark = watermark
+        self.complete = watermark
+        self._current: int | None = None
+
+    def is_new(self, timestamp: int) -> bool:
+        """Check if the entry was not received in an earlier sync and track the latest complete timestamp"""
+        if self.watermark is not None and timestamp <= self.watermark:
+            return False
+        if self._current is not None and timestamp > self._current:
+            self.complete = self._current
+        if self._current is None or timestamp > self._current:
+            self._current = timestamp
+        return True
+
+    def finish(self) -> None:
+        """All entries have been received, so the latest timestamp is complete"""
+        if self._current is not None:
+            self.complete = self._current
@@ -2,8 +2,9 @@
 Module level logging configuration for ruuvitag_sensor package.
 
 This module provides:
-1. A root logger for the package with default ERROR level file logging
+1. A root logger for the package
 2. A function to enable console output, primarily for CLI usage
+3. A function to enable file logging
 
 Note: Applications using this package as a library should configure their own logging
 rather than relying on this module's configuration.
@@ -15,14 +16,13 @@ import logging
 log = logging.getLogger("ruuvitag_sensor")
 log.setLevel(logging.INFO)
 
-# Configure file logging for errors
-file_handler = logging.FileHandler("ruuvitag_sensor.log")
-file_handler.setLevel(logging.ERROR)
-
 # Set up a standard logging format with timestamp, logger name, level and message
 formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-file_handler.setFormatter(formatter)
-log.addHandler(file_handler)
+
+
+def _find_handler(handler_type: type[logging.Handler]) -> logging.Handler | None:
+    # FileHandler is a subclass of StreamHandler, so the exact type is compared
+    return next((handler for handler in log.handlers if type(handler) is handler_type), None)
 
 
 def enable_console(level: int = logging.INFO) -> None:
@@ -38,7 +38,32 @@ def enable_console(level: int = logging.INFO) -> None:
     if level < logging.INFO:
         log.setLevel(level)
 
-    if len(log.handlers) != 2:
+    if _find_handler(logging.StreamHandler) is None:
         console_handler = logging.StreamHandler()
         console_handler.setLevel(level)
         log.addHandler(console_handler)
+
+
+def enable_file(filename: str = "ruuvitag_sensor.log", level: int = logging.ERROR) -> logging.Handler:
+    """Enable logging to a file.
+
+    File logging is not enabled by default, so importing the package doesn't create a log file.
+    If the requested level is DEBUG, it will also set the root logger's level to DEBUG.
+    The function ensures only one file handler is added.
+
+    Args:
+        filename: Path of the log file. Defaults to ruuvitag_sensor.log.
+        level: The logging level for the file. Defaults to ERROR.
+    Returns:
+        logging.Handler: The file handler
+    """
+    if level < logging.INFO:
+        log.setLevel(level)
+
+    file_handler = _find_handler(logging.FileHandler)
+    if file_handler is None:
+        file_handler = logging.FileHandler(filename)
+        file_handler.setLevel(level)
+        file_handler.setFormatter(formatter)
+        log.addHandler(file_handler)
+    return file_handler
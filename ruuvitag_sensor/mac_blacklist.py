@@ -0,0 +1,56 @@
+import time
+from collections.abc import Iterator
+
+# Expiration time of a MAC that is not in the blacklist. None is the expiration time of a MAC that never expires
+_NOT_BLACKLISTED = -1.0
+
+
+class MacBlacklist:
+    """
+    Blacklist for MAC addresses of devices that don't send RuuviTag or Ruuvi Air data.
+
+    Blacklist is a set in the current process, so checking a MAC is a set lookup instead of
+    an IPC round-trip to a multiprocessing Manager. Use a Manager list only with adapters that
+    read data in another process.
+
+    Args:
+        ttl_sec (float): Optional time in seconds after which a MAC is removed from the blacklist,
+            so devices that sent transiently malformed data are retried. Default None keeps MACs forever.
+    """
+
+    def __init__(self, ttl_sec: float | None = None):
+        self._ttl_sec = ttl_sec
+        # MAC and expiration time (time.monotonic) or None if MAC never expires
+        self._macs: dict[str, float | None] = {}
+
+    def append(self, mac: str) -> None:
+        self._macs[mac] = time.monotonic() + self._ttl_sec if self._ttl_sec else None
+
+    def remove(self, mac: str) -> None:
+        self._macs.pop(mac, None)
+
+    def clear(self) -> None:
+        self._macs.clear()
+
+    def __contains__(self, mac: object) -> bool:
+        if not isinstance(mac, str):
+            return False
+
+        # Single lookup, as another thread can remove an expired MAC between a membership check and indexing
+        expires = self._macs.get(mac, _NOT_BLACKLISTED)
+        if expires is _NOT_BLACKLISTED:
+            return False
+        if expires is not None and expires <= time.monotonic():
+            self._macs.pop(mac, None)
+            return False
+
+        return True
+
+    def __len__(self) -> int:
+        # Expired MACs are removed lazily when they are checked
+        return len(self._macs)
+
+    def __iter__(self) -> Iterator[str]:
+        now = time.monotonic()
+        # Copy items, as adapter threads can add MACs while iterating
+        return iter([mac for mac, expires in list(self._macs.items()) if expires is None or expires > now])
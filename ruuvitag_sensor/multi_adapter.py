@@ -0,0 +1,175 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, Generator
+from queue import Full, Queue
+
+from ruuvitag_sensor.ruuvi_types import MacAndRawBytes, MacAndRawData, MacRawDataAndDevice
+
+log = logging.getLogger(__name__)
+
+# Maximum number of received advertisements waiting for the consumer
+_QUEUE_MAXSIZE = 1000
+
+
+def tag_with_device(ble_data: MacAndRawData | MacAndRawBytes, bt_device: str) -> MacRawDataAndDevice:
+    """
+    Add the Bluetooth device that received the advertisement to adapter data.
+
+    Returns:
+        tuple: MAC, raw data, RSSI and Bluetooth device
+    """
+    if len(ble_data) > 2:
+        return (ble_data[0], ble_data[1], ble_data[2], bt_device)  # type: ignore[misc]
+    # Hex data from the adapters has RSSI as the last byte
+    data = ble_data[1]
+    rssi = int.from_bytes(bytes.fromhex(data[-2:]), "big", signed=True) if len(data) >= 2 else None
+    return (ble_data[0], data, rssi, bt_device)
+
+
+class DuplicateFilter:
+    """
+    Filter for identical advertisements received by multiple adapters.
+
+    Advertisement is a duplicate if the same MAC sent the same data, ignoring RSSI, within the window and
+    another adapter received it first. Identical advertisements received by the same adapter are not duplicates,
+    so filtering doesn't reduce the data of a single adapter.
+    The first received advertisement is delivered, so the data has the adapter and RSSI of the fastest receiver.
+
+    Args:
+        window_sec (float): Time in seconds in which an identical advertisement is a duplicate. Default 0.5
+    """
+
+    def __init__(self, window_sec: float = 0.5):
+        self._window_sec = window_sec
+        # Key, and time (time.monotonic) and adapter of the latest delivered advertisement
+        self._seen: OrderedDict[tuple, tuple[float, str]] = OrderedDict()
+
+    def is_duplicate(self, ble_data: MacRawDataAndDevice) -> bool:
+        now = time.monotonic()
+        while self._seen:
+            seen_time, _ = next(iter(self._seen.values()))
+            if now - seen_time < self._window_sec:
+                break
+            self._seen.popitem(last=False)
+
+        mac, data, bt_device = ble_data[0], ble_data[1], ble_data[3]
+        # Hex data has RSSI as the last byte
+        key = (mac, data[:-2] if isinstance(data, str) else bytes(data))
+        seen = self._seen.get(key)
+        if seen is not None and seen[1] != bt_device:
+            return True
+        self._seen[key] = (now, bt_device)
+        self._seen.move_to_end(key)
+        return False
+
+
+async def merge_async(
+    data_iters: dict[str, AsyncGenerator[MacAndRawData | MacAndRawBytes, None]], window_sec: float = 0.5
+) -> AsyncGenerator[MacRawDataAndDevice, None]:
+    """
+    Read multiple adapters concurrently and merge the data into one stream without duplicates.
+
+    Args:
+        data_iters (dict): Bluetooth device and data from the adapter
+        window_sec (float): Time in seconds in which an identical advertisement is a duplicate
+    Yields:
+        tuple: MAC, raw data, RSSI and Bluetooth device that received the advertisement
+    """
+    # asyncio is imported on first use, so importing ruuvitag_sensor.ruuvi doesn't import it
+    import asyncio  # noqa: PLC0415
+
+    queue: asyncio.Queue[MacRawDataAndDevice | None] = asyncio.Queue(_QUEUE_MAXSIZE)
+    duplicates = DuplicateFilter(window_sec)
+
+    async def read(bt_device: str, data_iter: AsyncGenerator[MacAndRawData | MacAndRawBytes, None]):
+        try:
+            async for item in data_iter:
+                await queue.put(tag_with_device(item, bt_device))
+        except Exception:
+            log.exception("Error in adapter %s", bt_device)
+        finally:
+            await data_iter.aclose()
+            log.debug("Adapter %s stopped", bt_device)
+
+    def wake_up(_: asyncio.Task) -> None:
+        # Wake up the consumer waiting for data. A full queue is read before the consumer waits again
+        if not queue.full():
+            queue.put_nowait(None)
+
+    readers = [asyncio.create_task(read(bt_device, data_iter)) for bt_device, data_iter in data_iters.items()]
+    for reader in readers:
+        reader.add_done_callback(wake_up)
+
+    try:
+        while not (queue.empty() and all(reader.done() for reader in readers)):
+            item = await queue.get()
+            if item is None:
+                continue
+            if duplicates.is_duplicate(item):
+                log.debug("Duplicate advertisement from %s: %s", item[3], item[0])
+                continue
+            yield item
+    finally:
+        for reader in readers:
+            reader.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+
+
+def merge(
+    data_iters: dict[str, Generator[MacAndRawData | MacAndRawBytes, None, None]], window_sec: float = 0.5
+) -> Generator[MacRawDataAndDevice, None, None]:
+    """
+    Read multiple sync adapters in threads and merge the data into one stream without duplicates.
+
+    Adapters block while waiting for data, so a thread stops when its adapter receives the next item after
+    the stream is closed.
+
+    Args:
+        data_iters (dict): Bluetooth device and data from the adapter
+        window_sec (float): Time in seconds in which an identical advertisement is a duplicate
+    Yields:
+        tuple: MAC, raw data, RSSI and Bluetooth device that received the advertisement
+    """
+    queue: Queue[MacRawDataAndDevice | None] = Queue(_QUEUE_MAXSIZE)
+    duplicates = DuplicateFilter(window_sec)
+    stop = threading.Event()
+
+    def put(item: MacRawDataAndDevice | None) -> None:
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return
+            except Full:  # noqa: PERF203
+                continue
+
+    def read(bt_device: str, data_iter: Generator[MacAndRawData | MacAndRawBytes, None, None]):
+        try:
+            for item in data_iter:
+                if stop.is_set():
+                    break
+                put(tag_with_device(item, bt_device))
+        except Exception:
+            log.exception("Error in adapter %s", bt_device)
+        finally:
+            data_iter.close()
+            log.debug("Adapter %s stopped", bt_device)
+            put(None)
+
+    for bt_device, data_iter in data_iters.items():
+        threading.Thread(target=read, args=(bt_device, data_iter), name=f"ruuvi-{bt_device}", daemon=True).start()
+
+    try:
+        running = len(data_iters)
+        while running:
+            item = queue.get()
+            if item is None:
+                running -= 1
+                continue
+            if duplicates.is_duplicate(item):
+                log.debug("Duplicate advertisement from %s: %s", item[3], item[0])
+                continue
+            yield item
+    finally:
+        stop.set()
@@ -0,0 +1,246 @@
+"""
+Compact sensor readings.
+
+Readings have the same values as the sensor data dictionaries, but values are stored in __slots__
+attributes, so a reading takes a fraction of the memory of a dictionary and is faster to create.
+Readings are read-only mappings with the same keys as the dictionaries, so existing code that reads
+values with reading["temperature"] keeps working. to_dict returns the dictionary.
+"""
+
+from __future__ import annotations
+
+import copy
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+# Keys that are added when data is received with multiple Bluetooth devices
+_DEVICE_KEYS = ("bt_device", "rssi")
+# Keys of the sensor data dictionaries in the same order as the decoders add them
+_KEYS_5 = (
+    "data_format",
+    "humidity",
+    "temperature",
+    "pressure",
+    "acceleration",
+    "acceleration_x",
+    "acceleration_y",
+    "acceleration_z",
+    "tx_power",
+    "battery",
+    "movement_counter",
+    "measurement_sequence_number",
+    "mac",
+    "rssi",
+)
+_KEYS_6 = (
+    "data_format",
+    "temperature",
+    "humidity",
+    "pressure",
+    "pm_2_5",
+    "co2",
+    "voc",
+    "nox",
+    "luminosity",
+    "measurement_sequence_number",
+    "calibration_in_progress",
+    "mac",
+)
+_KEYS_E1 = (
+    "data_format",
+    "humidity",
+    "temperature",
+    "pressure",
+    "pm_1",
+    "pm_2_5",
+    "pm_4",
+    "pm_10",
+    "co2",
+    "voc",
+    "nox",
+    "luminosity",
+    "measurement_sequence_number",
+    "calibration_in_progress",
+    "mac",
+)
+
+
+class SensorReading(Mapping[str, Any]):
+    """
+    Base class for compact sensor readings.
+
+    Attributes:
+        bt_device (str): Bluetooth device that received the advertisement when scanning with multiple devices
+        rssi (int): RSSI of the advertisement
+    """
+
+    __slots__ = ("bt_device", "rssi")
+
+    data_format: int | str
+    # Keys of the sensor data dictionary of the Data Format
+    _keys: tuple[str, ...] = ()
+    _keys_with_device: tuple[str, ...] = ()
+
+    bt_device: str | None
+    rssi: int | None
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._keys_with_device = cls._keys + tuple(key for key in _DEVICE_KEYS if key not in cls._keys)
+
+    def _current_keys(self) -> tuple[str, ...]:
+        return self._keys if self.bt_device is None else self._keys_with_device
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._current_keys():
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key == "data_format" or key not in self._keys_with_device:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._current_keys())
+
+    def __len__(self) -> int:
+        return len(self._current_keys())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def copy(self) -> SensorReading:
+        return copy.copy(self)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Returns:
+            dict: Sensor data dictionary with the same content as the dictionary decoders return
+        """
+        return {key: getattr(self, key) for key in self._current_keys()}
+
+
+class SensorReading5(SensorReading):
+    """Sensor values of Data Format 5"""
+
+    __slots__ = _KEYS_5[1:-1]
+
+    data_format = 5
+    _keys = _KEYS_5
+
+    def __init__(  # noqa: PLR0913
+        self,
+        humidity: float | None,
+        temperature: float | None,
+        pressure: float | None,
+        acceleration: float | None,
+        acceleration_x: int | None,
+        acceleration_y: int | None,
+        acceleration_z: int | None,
+        tx_power: int | None,
+        battery: int | None,
+        movement_counter: int,
+        measurement_sequence_number: int,
+        mac: str,
+        rssi: int | None = None,
+        bt_device: str | None = None,
+    ):
+        self.humidity = humidity
+        self.temperature = temperature
+        self.pressure = pressure
+        self.acceleration = acceleration
+        self.acceleration_x = acceleration_x
+        self.acceleration_y = acceleration_y
+        self.acceleration_z = acceleration_z
+        self.tx_power = tx_power
+        self.battery = battery
+        self.movement_counter = movement_counter
+        self.measurement_sequence_number = measurement_sequence_number
+        self.mac = mac
+        self.rssi = rssi
+        self.bt_device = bt_device
+
+
+class SensorReading6(SensorReading):
+    """Sensor values of Data Format 6"""
+
+    __slots__ = _KEYS_6[1:]
+
+    data_format = 6
+    _keys = _KEYS_6
+
+    def __init__(  # noqa: PLR0913
+        self,
+        temperature: float | None,
+        humidity: float | None,
+        pressure: float | None,
+        pm_2_5: float | None,
+        co2: int | None,
+        voc: int | None,
+        nox: int | None,
+        luminosity: float | None,
+        measurement_sequence_number: int,
+        calibration_in_progress: bool,
+        mac: str,
+        rssi: int | None = None,
+        bt_device: str | None = None,
+    ):
+        self.temperature = temperature
+        self.humidity = humidity
+        self.pressure = pressure
+        self.pm_2_5 = pm_2_5
+        self.co2 = co2
+        self.voc = voc
+        self.nox = nox
+        self.luminosity = luminosity
+        self.measurement_sequence_number = measurement_sequence_number
+        self.calibration_in_progress = calibration_in_progress
+        self.mac = mac
+        self.rssi = rssi
+        self.bt_device = bt_device
+
+
+class SensorReadingE1(SensorReading):
+    """Sensor values of Data Format E1"""
+
+    __slots__ = _KEYS_E1[1:]
+
+    data_format = "E1"
+    _keys = _KEYS_E1
+
+    def __init__(  # noqa: PLR0913
+        self,
+        humidity: float | None,
+        temperature: float | None,
+        pressure: float | None,
+        pm_1: float | None,
+        pm_2_5: float | None,
+        pm_4: float | None,
+        pm_10: float | None,
+        co2: int | None,
+        voc: int | None,
+        nox: int | None,
+        luminosity: float | None,
+        measurement_sequence_number: int | None,
+        calibration_in_progress: bool,
+        mac: str,
+        rssi: int | None = None,
+        bt_device: str | None = None,
+    ):
+        self.humidity = humidity
+        self.temperature = temperature
+        self.pressure = pressure
+        self.pm_1 = pm_1
+        self.pm_2_5 = pm_2_5
+        self.pm_4 = pm_4
+        self.pm_10 = pm_10
+        self.co2 = co2
+        self.voc = voc
+        self.nox = nox
+        self.luminosity = luminosity
+        self.measurement_sequence_number = measurement_sequence_number
+        self.calibration_in_progress = calibration_in_progress
+        self.mac = mac
+        self.rssi = rssi
+        self.bt_device = bt_device
@@ -1,28 +1,92 @@
-import asyncio
+from __future__ import annotations
+
 import logging
 import time
-from collections.abc import AsyncGenerator, Callable, Generator
-from datetime import datetime
-from multiprocessing import Manager
-from multiprocessing.managers import ListProxy
+from collections.abc import AsyncGenerator, Callable, Generator, Iterable, Mapping
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any
 from warnings import warn
 
-from ruuvitag_sensor.adapters import get_ble_adapter, throw_if_not_async_adapter, throw_if_not_sync_adapter
+from ruuvitag_sensor.adapters import (
+    BleCommunication,
+    BleCommunicationAsync,
+    get_ble_adapter,
+    is_bytes_adapter,
+    is_subprocess_adapter,
+    throw_if_not_async_adapter,
+    throw_if_not_sync_adapter,
+)
+from ruuvitag_sensor.adapters.history_transfer import HistoryTransferTimeoutError
+from ruuvitag_sensor.coalesce import IntervalLatestByMac, coalesce_async
 from ruuvitag_sensor.data_formats import DataFormats
-from ruuvitag_sensor.decoder import AirHistoryDecoder, HistoryDecoder, get_decoder, parse_mac
+from ruuvitag_sensor.decode_cache import DecodeCache
+from ruuvitag_sensor.decoder import (
+    AirHistoryDecoder,
+    Decoder,
+    Df5Decoder,
+    HistoryDecoder,
+    get_bytes_decoder,
+    get_decoder,
+    parse_mac,
+)
+from ruuvitag_sensor.history_download import HistoryDownloadResult, download_many, order_by_staleness
+from ruuvitag_sensor.history_merge import HistoryRowMerger
+from ruuvitag_sensor.history_sync import JsonWatermarkStore, WatermarkStore, WatermarkTracker
+from ruuvitag_sensor.mac_blacklist import MacBlacklist
+from ruuvitag_sensor.multi_adapter import merge, merge_async
 from ruuvitag_sensor.ruuvi_types import (
     DataFormatAndRawSensorData,
     DeviceType,
     Mac,
+    MacAndRawBytes,
     MacAndRawData,
     MacAndSensorData,
+    MacRawDataAndDevice,
     SensorAirHistoryData,
     SensorData,
     SensorHistoryData,
 )
 
+if TYPE_CHECKING:
+    from multiprocessing.managers import ListProxy
+
 log = logging.getLogger(__name__)
-ble = get_ble_adapter()
+
+
+def _get_ble():
+    """
+    Get the BLE adapter. The adapter is resolved on first use, so importing this module doesn't import
+    the dependencies of the adapter, e.g. Bleak. Setting ruuvitag_sensor.ruuvi.ble replaces the adapter.
+    """
+    adapter = globals().get("ble")
+    if adapter is None:
+        adapter = get_ble_adapter()
+        globals()["ble"] = adapter
+    return adapter
+
+
+def __getattr__(name: str):
+    if name == "ble":
+        return _get_ble()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Decoder class and whether decode_bytes of the class is used for data received as bytes
+_bytes_decoder_types: dict[type, bool] = {}
+
+
+def _decodes_bytes(decoder: object) -> bool:
+    """
+    Check if decode_bytes of the decoder can be used for data received as bytes. decode_bytes must be defined by
+    the same class as decode_data or by a subclass, so an overridden decode_data is not bypassed.
+    """
+    decoder_type = type(decoder)
+    decodes_bytes = _bytes_decoder_types.get(decoder_type)
+    if decodes_bytes is None:
+        owner = next((cls for cls in decoder_type.__mro__ if {"decode_bytes", "decode_data"} & vars(cls).keys()), None)
+        decodes_bytes = owner is not None and "decode_bytes" in vars(owner)
+        _bytes_decoder_types[decoder_type] = decodes_bytes
+    return decodes_bytes
 
 
 class RunFlag:
@@ -36,64 +100,96 @@ class RunFlag:
     running = True
 
 
-class RuuviTagSensor:
+class RuuviClient:
     """
-    RuuviTag communication functionality
+    RuuviTag and Ruuvi Air communication with its own BLE adapter, decoders and settings.
+
+    Clients don't share state, so several independently configured clients can be used concurrently
+    in one process, e.g. a Bleak scanner and an adapter that replays recorded data. RuuviTagSensor static
+    methods use a default client with the ruuvitag_sensor.ruuvi.ble adapter and the settings of the
+    RuuviTagSensor class attributes. Methods have the same arguments as the RuuviTagSensor methods.
+
+    Attributes:
+        adapter (BleCommunication | BleCommunicationAsync): BLE adapter
+        decoders (dict): Data Format and decoder that is used instead of the default decoder of the Data Format.
+                         Custom decoders get the data as is, so compact_readings and lazy_readings are not used
+                         for the Data Format. Data received as bytes is decoded with decode_bytes only if the
+                         decoder class defines it, otherwise it is converted to hex for decode_data
+        filters (list): Functions that get the MAC and decoded data. Data is delivered only if all filters
+                        return True
+        blacklist_ttl_sec (float): Time in seconds after which blacklisted MACs are retried.
+                                   Default None keeps MACs blacklisted until the scan ends
+        decode_cache (DecodeCache): Cache for skipping decoding of repeated advertisements.
+                                    Default None decodes every advertisement
+        duplicate_window_sec (float): Time in seconds in which an identical advertisement received by another
+                                      Bluetooth device is dropped, when data is read from multiple devices.
+                                      Default 0.5
+        compact_readings (bool): Decode Data Format 5, 6 and E1 to compact SensorReading objects instead of
+                                 dictionaries. Default False
+        lazy_readings (bool): Decode Data Format 5 to LazySensorReading5 objects, which decode each value on
+                              first access. Default False
     """
 
-    @staticmethod
-    def get_first_raw_data(mac: str, bt_device: str = "") -> DataFormatAndRawSensorData:
+    def __init__(  # noqa: PLR0913
+        self,
+        adapter: BleCommunication | BleCommunicationAsync | None = None,
+        decoders: Mapping[int | str, Decoder] | None = None,
+        filters: Iterable[Callable[[Mac, SensorData], bool]] | None = None,
+        blacklist_ttl_sec: float | None = None,
+        decode_cache: DecodeCache | None = None,
+        duplicate_window_sec: float = 0.5,
+        compact_readings: bool = False,
+        lazy_readings: bool = False,
+    ):
         """
-        Get raw data for selected RuuviTag. This method is intended to be used only by
-        RuuviTag-class.
-
         Args:
-            mac (string): MAC address
-            bt_device (string): Bluetooth device id
-        Returns:
-            tuple (int, string): Data Format type and raw Sensor data
+            adapter (BleCommunication | BleCommunicationAsync): BLE adapter. Default is a new adapter selected
+                in the same way as ruuvitag_sensor.ruuvi.ble, e.g. with the RUUVI_BLE_ADAPTER environment variable
+            decoders (dict): Data Format and decoder that replaces the default decoder
+            filters (list): Functions that get the MAC and decoded data and return False to drop the data
         """
-        throw_if_not_sync_adapter(ble)
-
-        raw = ble.get_first_data(mac, bt_device)
-        return DataFormats.convert_data(raw)
-
-    @staticmethod
-    async def get_first_raw_data_async(mac: str, bt_device: str = "") -> DataFormatAndRawSensorData:
+        self.adapter: Any = adapter if adapter is not None else get_ble_adapter()
+        self.decoders: dict[int | str, Decoder] = dict(decoders or {})
+        self.filters: list[Callable[[Mac, SensorData], bool]] = list(filters or [])
+        self.blacklist_ttl_sec = blacklist_ttl_sec
+        self.decode_cache = decode_cache
+        self.duplicate_window_sec = duplicate_window_sec
+        self.compact_readings = compact_readings
+        self.lazy_readings = lazy_readings
+
+    def _create_mac_blacklist(self) -> MacBlacklist | ListProxy:
         """
-        Get raw data for selected RuuviTag. This method is intended to be used only by
-        RuuviTagAsync-class.
+        Create blacklist for MACs that don't send RuuviTag data. Manager list is used only when
+        the adapter reads data in another process, as every check is an IPC round-trip.
+        """
+        if is_subprocess_adapter(self.adapter):
+            from multiprocessing import Manager  # noqa: PLC0415
 
-        NOTE: This method is not working on macOS
+            return Manager().list()
+        return MacBlacklist(self.blacklist_ttl_sec)
 
-        Args:
-            mac (string): MAC address
-            bt_device (string): Bluetooth device id
-        Returns:
-            tuple (int, string): Data Format type and raw Sensor data
-        """
-        throw_if_not_async_adapter(ble)
+    def get_first_raw_data(self, mac: str, bt_device: str = "") -> DataFormatAndRawSensorData:
+        """Get raw data for selected RuuviTag"""
+        throw_if_not_sync_adapter(self.adapter)
 
-        raw = await ble.get_first_data(mac, bt_device)
+        raw = self.adapter.get_first_data(mac, bt_device)
         return DataFormats.convert_data(raw)
 
-    @staticmethod
-    def find_ruuvitags(bt_device: str = "") -> dict[Mac, SensorData]:
-        """
-        CLI helper function.
+    async def get_first_raw_data_async(self, mac: str, bt_device: str = "") -> DataFormatAndRawSensorData:
+        """Get raw data for selected RuuviTag"""
+        throw_if_not_async_adapter(self.adapter)
 
-        Find all RuuviTags. Function will print the MAC and the state of the sensors when found.
-        Function will execute as long as it is stopped. Stop execution with Ctrl+C.
+        raw = await self.adapter.get_first_data(mac, bt_device)
+        return DataFormats.convert_data(raw)
 
-        Returns:
-            dict: MAC and state of found sensors
-        """
-        throw_if_not_sync_adapter(ble)
+    def find_ruuvitags(self, bt_device: str | list[str] = "") -> dict[Mac, SensorData]:
+        """Find all RuuviTags. Function executes until it is stopped with Ctrl+C"""
+        throw_if_not_sync_adapter(self.adapter)
 
         log.info("Finding RuuviTags. Stop with Ctrl+C.")
 
         data: dict[str, SensorData] = {}
-        for new_data in RuuviTagSensor._get_ruuvitag_data(bt_device=bt_device):
+        for new_data in self._get_ruuvitag_data(bt_device=bt_device):
             mac, sensor_data = new_data
             if not mac or mac in data:
                 continue
@@ -103,31 +199,22 @@ class RuuviTagSensor:
 
         return data
 
-    @staticmethod
-    async def find_ruuvitags_async(bt_device: str = "") -> dict[Mac, MacAndSensorData]:
-        """
-        CLI helper function.
-
-        Find all RuuviTags. Function will print the MAC and the state of the sensors when found.
-        Function will execute as long as it is stopped. Stop execution with Ctrl+C.
-
-        Returns:
-            dict: MAC and state of found sensors
-        """
-        throw_if_not_async_adapter(ble)
+    async def find_ruuvitags_async(self, bt_device: str | list[str] = "") -> dict[Mac, MacAndSensorData]:
+        """Find all RuuviTags. Function executes until it is stopped with Ctrl+C"""
+        throw_if_not_async_adapter(self.adapter)
 
         log.info("Finding RuuviTags. Stop with Ctrl+C.")
 
         data: dict[Mac, MacAndSensorData] = {}
-        mac_blacklist = Manager().list()
-        data_iter = ble.get_data(mac_blacklist, bt_device)
+        mac_blacklist = self._create_mac_blacklist()
+        data_iter = self._get_ble_data_async(mac_blacklist, bt_device)
 
         try:
             async for new_data in data_iter:
                 if new_data[0] in data:
                     continue
 
-                parsed_data = RuuviTagSensor._parse_data(new_data, mac_blacklist)
+                parsed_data = self._parse_data(new_data, mac_blacklist)
                 if parsed_data:
                     data[new_data[0]] = parsed_data
                     log.info(new_data[0])
@@ -137,24 +224,14 @@ class RuuviTagSensor:
 
         return data
 
-    @staticmethod
     def get_data_for_sensors(
-        macs: list[str] | None = None, search_duration_sec: int = 5, bt_device: str = ""
+        self, macs: list[str] | None = None, search_duration_sec: int = 5, bt_device: str | list[str] = ""
     ) -> dict[Mac, SensorData]:
-        """
-        Get latest data for RuuviTag and Ruuvi Air sensors in the MAC address list.
-
-        Args:
-            macs (array): MAC addresses
-            search_duration_sec (int): Search duration in seconds. Default 5
-            bt_device (string): Bluetooth device id
-        Returns:
-            dict: MAC and state of found sensors
-        """
+        """Get latest data for RuuviTag and Ruuvi Air sensors in the MAC address list"""
         if macs is None:
             macs = []
 
-        throw_if_not_sync_adapter(ble)
+        throw_if_not_sync_adapter(self.adapter)
 
         log.info("Get latest data for sensors. Stop with Ctrl+C.")
         log.info("Stops automatically in %ss", search_duration_sec)
@@ -162,30 +239,20 @@ class RuuviTagSensor:
 
         data: dict[Mac, SensorData] = {}
 
-        for new_data in RuuviTagSensor._get_ruuvitag_data(macs, search_duration_sec, bt_device=bt_device):
+        for new_data in self._get_ruuvitag_data(macs, search_duration_sec, bt_device=bt_device):
             mac, sensor_data = new_data
             data[mac] = sensor_data
 
         return data
 
-    @staticmethod
     async def get_data_for_sensors_async(
-        macs: list[str] | None = None, search_duration_sec: int = 5, bt_device: str = ""
+        self, macs: list[str] | None = None, search_duration_sec: int = 5, bt_device: str | list[str] = ""
     ) -> dict[Mac, SensorData]:
-        """
-        Get latest data for RuuviTag and Ruuvi Air sensors in the MAC address list.
-
-        Args:
-            macs (array): MAC addresses
-            search_duration_sec (int): Search duration in seconds. Default 5
-            bt_device (string): Bluetooth device id
-        Returns:
-            dict: MAC and state of found sensors
-        """
+        """Get latest data for RuuviTag and Ruuvi Air sensors in the MAC address list"""
         if macs is None:
             macs = []
 
-        throw_if_not_async_adapter(ble)
+        throw_if_not_async_adapter(self.adapter)
 
         log.info("Get latest data for sensors. Stop with Ctrl+C.")
         log.info("Stops automatically in %ss", search_duration_sec)
@@ -194,7 +261,7 @@ class RuuviTagSensor:
         data: dict[Mac, SensorData] = {}
         start_time = time.time()
 
-        data_iter = RuuviTagSensor.get_data_async(macs, bt_device)
+        data_iter = self.get_data_async(macs, bt_device)
 
         try:
             async for new_data in data_iter:
@@ -207,30 +274,26 @@ class RuuviTagSensor:
 
         return data
 
-    @staticmethod
     async def get_data_async(
-        macs: list[str] | None = None, bt_device: str = ""
+        self,
+        macs: list[str] | None = None,
+        bt_device: str | list[str] = "",
+        coalesce_interval_sec: float | None = None,
     ) -> AsyncGenerator[MacAndSensorData, None]:
-        """
-        Get data for all RuuviTag and Ruuvi Air sensors or sensors in the MAC's list.
-
-        Args:
-            macs (list): MAC addresses
-            bt_device (string): Bluetooth device id
-        Returns:
-            AsyncGenerator: MAC and State of sensor data (tuple)
-        """
+        """Get data for all RuuviTag and Ruuvi Air sensors or sensors in the MAC's list"""
         if macs is None:
             macs = []
 
-        throw_if_not_async_adapter(ble)
+        throw_if_not_async_adapter(self.adapter)
 
-        mac_blacklist = Manager().list()
-        data_iter = ble.get_data(mac_blacklist, bt_device)
+        mac_blacklist = self._create_mac_blacklist()
+        data_iter = self._get_ble_data_async(mac_blacklist, bt_device)
+        if coalesce_interval_sec is not None:
+            data_iter = coalesce_async(data_iter, coalesce_interval_sec)
 
         try:
             async for ble_data in data_iter:
-                data = RuuviTagSensor._parse_data(ble_data, mac_blacklist, macs)
+                data = self._parse_data(ble_data, mac_blacklist, macs)
 
                 # Check MAC whitelist if advertised MAC available
                 if ble_data[0] and macs and ble_data[0] not in macs:
@@ -242,62 +305,64 @@ class RuuviTagSensor:
         finally:
             await data_iter.aclose()
 
-    @staticmethod
+    def _get_ble_data_async(
+        self, mac_blacklist: MacBlacklist | ListProxy, bt_device: str | list[str] = ""
+    ) -> AsyncGenerator[MacAndRawData | MacAndRawBytes | MacRawDataAndDevice, None]:
+        """
+        Get data from the async adapter. Adapters that can deliver manufacturer specific data as bytes
+        skip the conversion to a hex string. Data from a list of devices is merged into one stream.
+        """
+        if isinstance(bt_device, list):
+            data_iters = {device: self._get_ble_data_async(mac_blacklist, device) for device in bt_device}
+            return merge_async(data_iters, self.duplicate_window_sec)  # type: ignore[arg-type]
+        if is_bytes_adapter(self.adapter):
+            return self.adapter.get_data_bytes(mac_blacklist, bt_device)
+        return self.adapter.get_data(mac_blacklist, bt_device)
+
+    def _get_ble_data(
+        self, mac_blacklist: MacBlacklist | ListProxy, bt_device: str | list[str] = ""
+    ) -> Generator[MacAndRawData | MacAndRawBytes | MacRawDataAndDevice, None, None]:
+        """
+        Get data from the sync adapter. Adapters that can deliver manufacturer specific data as bytes
+        skip the conversion to a hex string. Data from a list of devices is read in threads and merged
+        into one stream.
+        """
+        if isinstance(bt_device, list):
+            data_iters = {device: self._get_ble_data(mac_blacklist, device) for device in bt_device}
+            return merge(data_iters, self.duplicate_window_sec)  # type: ignore[arg-type]
+        if is_bytes_adapter(self.adapter):
+            return self.adapter.get_data_bytes(mac_blacklist, bt_device)
+        return self.adapter.get_data(mac_blacklist, bt_device)
+
     def get_data(
+        self,
         callback: Callable[[MacAndSensorData], None],
         macs: list[str] | None = None,
         run_flag: RunFlag | None = None,
-        bt_device: str = "",
+        bt_device: str | list[str] = "",
+        coalesce_interval_sec: float | None = None,
     ) -> None:
-        """
-        Get data for all RuuviTag and Ruuvi Air sensors or sensors in the MAC's list.
-
-        Args:
-            callback (func): callback function to be called when new data is received
-            macs (list): MAC addresses
-            run_flag (object): RunFlag object. Function executes while run_flag.running
-            bt_device (string): Bluetooth device id
-        """
+        """Get data for all RuuviTag and Ruuvi Air sensors or sensors in the MAC's list"""
         if macs is None:
             macs = []
         if run_flag is None:
             run_flag = RunFlag()
 
-        throw_if_not_sync_adapter(ble)
+        throw_if_not_sync_adapter(self.adapter)
 
         log.info("Get latest data for sensors. Stop with Ctrl+C.")
         log.info("MACs: %s", macs)
 
-        for new_data in RuuviTagSensor._get_ruuvitag_data(macs, None, run_flag, bt_device):
+        for new_data in self._get_ruuvitag_data(macs, None, run_flag, bt_device, coalesce_interval_sec):
             callback(new_data)
 
-    @staticmethod
-    def get_datas(
-        callback: Callable[[MacAndSensorData], None],
-        macs: list[str] | None = None,
-        run_flag: RunFlag | None = None,
-        bt_device: str = "",
-    ) -> None:
-        """
-        DEPRECATED
-        This method will be removed in a future version.
-        Use get_data-method instead.
-        """
-        if macs is None:
-            macs = []
-        if run_flag is None:
-            run_flag = RunFlag()
-
-        warn("This method will be removed in a future version, use get_data() instead", FutureWarning, stacklevel=2)
-        throw_if_not_sync_adapter(ble)
-        return RuuviTagSensor.get_data(callback, macs, run_flag, bt_device)
-
-    @staticmethod
     def _get_ruuvitag_data(
+        self,
         macs: list[str] | None = None,
         search_duration_sec: int | None = None,
         run_flag: RunFlag | None = None,
-        bt_device: str = "",
+        bt_device: str | list[str] = "",
+        coalesce_interval_sec: float | None = None,
     ) -> Generator[MacAndSensorData, None, None]:
         """
         Get data from BluetoothCommunication and handle data encoding.
@@ -307,7 +372,10 @@ class RuuviTagSensor:
             search_duration_sec (int): Search duration in seconds. Default None
             run_flag (object): RunFlag object. Function executes while run_flag.running.
                                Default new RunFlag
-            bt_device (string): Bluetooth device id
+            bt_device (string): Bluetooth device id or list of ids. Devices in the list are scanned concurrently
+                and the data has the device that received the advertisement in bt_device and rssi fields
+            coalesce_interval_sec (float): Interval for delivering the latest data of updated sensors.
+                                           Default None delivers every advertisement
         Yields:
             tuple: MAC and State of sensor data
         """
@@ -316,9 +384,12 @@ class RuuviTagSensor:
         if run_flag is None:
             run_flag = RunFlag()
 
-        mac_blacklist = Manager().list()
+        mac_blacklist = self._create_mac_blacklist()
         start_time = time.time()
-        data_iter = ble.get_data(mac_blacklist, bt_device)
+        data_iter = self._get_ble_data(mac_blacklist, bt_device)
+        latest = None
+        if coalesce_interval_sec is not None:
+            latest = IntervalLatestByMac[MacAndRawData | MacAndRawBytes | MacRawDataAndDevice](coalesce_interval_sec)
 
         for ble_data in data_iter:
             if search_duration_sec and time.time() - start_time > search_duration_sec:
@@ -331,18 +402,32 @@ class RuuviTagSensor:
                 log.debug("MAC not whitelisted: %s", ble_data[0])
                 continue
 
-            data = RuuviTagSensor._parse_data(ble_data, mac_blacklist, macs)
+            ble_datas = latest.put_and_take_due(ble_data) if latest is not None else [ble_data]
+            for raw in ble_datas:
+                data = self._parse_data(raw, mac_blacklist, macs)
+                if data:
+                    yield data
+
+        # Deliver coalesced data that is still waiting when the adapter stops or the search ends
+        for raw in latest.take_all() if latest is not None else []:
+            data = self._parse_data(raw, mac_blacklist, macs)
             if data:
                 yield data
 
-    @staticmethod
-    def _parse_data(
-        ble_data: MacAndRawData, mac_blacklist: ListProxy, allowed_macs: list[str] | None = None
+    def _parse_data(  # noqa: PLR0911
+        self,
+        ble_data: MacAndRawData | MacAndRawBytes | MacRawDataAndDevice,
+        mac_blacklist: MacBlacklist | ListProxy,
+        allowed_macs: list[str] | None = None,
     ) -> MacAndSensorData | None:
         if allowed_macs is None:
             allowed_macs = []
-        (mac, payload) = ble_data
-        (data_format, data) = DataFormats.convert_data(payload)
+        mac, payload = ble_data[0], ble_data[1]
+        (data_format, data) = (
+            DataFormats.convert_data(payload)
+            if isinstance(payload, str)
+            else DataFormats.convert_manufacturer_data(payload)
+        )
 
         # Check that encoded data is valid RuuviTag data and it is sensor data
         # If data is not valid RuuviTag data add MAC to blacklist if MAC is available
@@ -357,7 +442,18 @@ class RuuviTagSensor:
             # any measurements. Ignore this.
             return None
 
-        decoded = get_decoder(data_format).decode_data(data)
+        rssi = ble_data[2] if len(ble_data) > 2 else None
+        decode_cache = self.decode_cache
+        decoded = decode_cache.get(mac, data_format, data, rssi) if decode_cache is not None else None
+        if decoded is not None:
+            if decode_cache is not None and decode_cache.suppress_duplicates:
+                log.debug("Duplicate data suppressed. MAC: %s", mac)
+                return None
+        else:
+            decoded = self._decode(data_format, data, rssi)
+            if decoded is not None and decode_cache is not None:
+                decode_cache.put(mac, data_format, data, decoded, rssi)
+
         if decoded is None:
             log.error("Decoded data is null. MAC: %s - Raw: %s", mac, payload)
             return None
@@ -376,20 +472,417 @@ class RuuviTagSensor:
             log.debug("MAC not whitelisted: %s", mac_to_send)
             return None
 
+        if self.filters and not all(accept(mac_to_send, decoded) for accept in self.filters):
+            log.debug("Data filtered. MAC: %s", mac_to_send)
+            return None
+
+        if len(ble_data) > 3:
+            # Data from multiple devices has the device that received the advertisement
+            decoded["bt_device"] = ble_data[3]  # type: ignore[typeddict-unknown-key, misc]
+            decoded["rssi"] = rssi  # type: ignore[typeddict-unknown-key]
+
         return (mac_to_send, decoded)
 
-    @staticmethod
+    def _decode(  # noqa: PLR0911
+        self, data_format: int | str, data: str | memoryview, rssi: int | None
+    ) -> SensorData | None:
+        decoder = self.decoders.get(data_format)
+        if decoder is None:
+            if self.lazy_readings and data_format == 5:
+                return get_decoder(data_format).decode_lazy(data, rssi)  # type: ignore[union-attr]
+
+            if self.compact_readings and data_format in (5, 6, "E1"):
+                decoder = get_decoder(data_format)
+                if isinstance(decoder, Df5Decoder):
+                    return decoder.decode_reading(data, rssi)
+                return decoder.decode_reading(data)  # type: ignore[union-attr]
+
+            decoder = get_decoder(data_format) if isinstance(data, str) else get_bytes_decoder(data_format)
+
+        if isinstance(data, str):
+            return decoder.decode_data(data)
+
+        if not _decodes_bytes(decoder):
+            # Same hex data as from DataFormats.convert_data. Data Format 5 data has RSSI as the last byte
+            hex_data = data.hex() if data_format == "E1" else data.hex().upper()
+            if data_format == 5 and rssi is not None:
+                hex_data += f"{rssi & 0xFF:02X}"
+            return decoder.decode_data(hex_data)
+
+        if isinstance(decoder, Df5Decoder):
+            # Only Data Format 5 has RSSI in the decoded data
+            return decoder.decode_bytes(data, rssi)
+        return decoder.decode_bytes(data)  # type: ignore[union-attr]
+
     async def get_history_async(
+        self,
+        mac: str,
+        start_time: datetime | None = None,
+        max_items: int | None = None,
+        device_type: DeviceType = "ruuvitag",
+        merge_rows: bool = False,
+    ) -> AsyncGenerator[SensorHistoryData | SensorAirHistoryData, None]:
+        """Get history data from a RuuviTag or Ruuvi Air as an async stream"""
+        throw_if_not_async_adapter(self.adapter)
+
+        if device_type not in {"ruuvitag", "ruuvi_air"}:
+            raise ValueError(f"Invalid device_type: {device_type}. Must be 'ruuvitag' or 'ruuvi_air'")
+
+        decoder = HistoryDecoder() if device_type == "ruuvitag" else AirHistoryDecoder()
+        # Ruuvi Air entries already have all measurements
+        merger = HistoryRowMerger() if merge_rows and device_type == "ruuvitag" else None
+
+        try:
+            data_iter = self.adapter.get_history_data(mac, start_time, max_items, device_type=device_type)
+            async for data in data_iter:
+                if decoded := decoder.decode_data(data):
+                    if isinstance(decoded, list):
+                        for record in decoded:
+                            yield record
+                    elif merger is not None:
+                        for row in merger.put(decoded):
+                            yield row
+                    else:
+                        yield decoded
+            for row in merger.flush() if merger is not None else []:
+                yield row
+        finally:
+            await data_iter.aclose()
+
+    async def sync_history_async(
+        self,
+        mac: str,
+        store: WatermarkStore | None = None,
+        start_time: datetime | None = None,
+        device_type: DeviceType = "ruuvitag",
+    ) -> AsyncGenerator[SensorHistoryData | SensorAirHistoryData, None]:
+        """Get history data that was not received in earlier syncs from a RuuviTag or Ruuvi Air"""
+        if store is None:
+            store = JsonWatermarkStore()
+
+        tracker = WatermarkTracker(store.get(mac))
+        if tracker.watermark is not None:
+            start_time = datetime.fromtimestamp(tracker.watermark, timezone.utc)
+        log.debug("Sync history from %s, start time: %s", mac, start_time)
+
+        data_iter = self.get_history_async(mac, start_time, device_type=device_type)
+        try:
+            async for entry in data_iter:
+                if tracker.is_new(entry["timestamp"]):
+                    yield entry
+            tracker.finish()
+        finally:
+            await data_iter.aclose()
+            # Store progress also when the sync is interrupted, so completely received timestamps are not
+            # downloaded again
+            if tracker.complete is not None and tracker.complete != tracker.watermark:
+                store.set(mac, tracker.complete)
+
+    async def download_history(
+        self,
+        mac: str,
+        start_time: datetime | None = None,
+        timeout: int = 300,
+        max_items: int | None = None,
+        device_type: DeviceType = "ruuvitag",
+    ) -> list[SensorHistoryData | SensorAirHistoryData]:
+        """Download complete history data from a RuuviTag or Ruuvi Air"""
+        import asyncio  # noqa: PLC0415
+
+        throw_if_not_async_adapter(self.adapter)
+
+        if device_type not in {"ruuvitag", "ruuvi_air"}:
+            raise ValueError(f"Invalid device_type: {device_type}. Must be 'ruuvitag' or 'ruuvi_air'")
+
+        decoder = HistoryDecoder() if device_type == "ruuvitag" else AirHistoryDecoder()
+
+        try:
+            history_data: list[SensorHistoryData | SensorAirHistoryData] = []
+
+            async def collect_history():
+                async for data in self.adapter.get_history_data(mac, start_time, max_items, device_type=device_type):
+                    if decoded := decoder.decode_data(data):
+                        # HistoryDecoder returns single record or None, AirHistoryDecoder returns list
+                        history_data.extend(decoded if isinstance(decoded, list) else [decoded])
+
+            await asyncio.wait_for(collect_history(), timeout=timeout)
+            return history_data
+
+        except HistoryTransferTimeoutError as err:
+            # Device stopped sending before the end of the log. Keep the entries received before the stall.
+            raise HistoryTransferTimeoutError(str(err), history_data) from err
+        except asyncio.TimeoutError as err:
+            raise TimeoutError(f"History download timed out after {timeout} seconds") from err
+        except Exception as e:
+            raise RuntimeError(f"Failed to download history: {e!s}") from e
+
+    async def download_history_many(  # noqa: PLR0913
+        self,
+        devices: Mapping[str, DeviceType],
+        start_time: datetime | None = None,
+        timeout: int = 300,
+        max_items: int | None = None,
+        max_concurrent: int = 3,
+        max_retries: int = 2,
+        retry_delay_sec: float = 5.0,
+        last_downloaded: Mapping[str, datetime] | None = None,
+        watermark_store: WatermarkStore | None = None,
+    ) -> AsyncGenerator[HistoryDownloadResult, None]:
+        """Download history data from multiple RuuviTags and Ruuvi Airs concurrently"""
+        throw_if_not_async_adapter(self.adapter)
+
+        for device_type in devices.values():
+            if device_type not in {"ruuvitag", "ruuvi_air"}:
+                raise ValueError(f"Invalid device_type: {device_type}. Must be 'ruuvitag' or 'ruuvi_air'")
+
+        async def download(mac: str, device_type: DeviceType) -> list[SensorHistoryData | SensorAirHistoryData]:
+            import asyncio  # noqa: PLC0415
+
+            if watermark_store is None:
+                return await self.download_history(mac, start_time, timeout, max_items, device_type)
+
+            history_data: list[SensorHistoryData | SensorAirHistoryData] = []
+
+            async def sync() -> None:
+                data_iter = self.sync_history_async(mac, watermark_store, start_time, device_type)
+                try:
+                    # Append one at a time, so the entries received before a stalled transfer are kept
+                    async for entry in data_iter:
+                        history_data.append(entry)  # noqa: PERF401
+                finally:
+                    # Store the progress also on timeout
+                    await data_iter.aclose()
+
+            try:
+                await asyncio.wait_for(sync(), timeout=timeout)
+                return history_data
+            except HistoryTransferTimeoutError as err:
+                raise HistoryTransferTimeoutError(str(err), history_data) from err
+            except asyncio.TimeoutError as err:
+                raise TimeoutError(f"History sync timed out after {timeout} seconds") from err
+
+        results = download_many(
+            download,
+            order_by_staleness(devices, last_downloaded),
+            max_concurrent,
+            max_retries,
+            retry_delay_sec,
+        )
+        try:
+            async for result in results:
+                yield result
+        finally:
+            await results.aclose()
+
+
+class RuuviTagSensor:
+    """
+    RuuviTag communication functionality
+
+    Static methods use a default RuuviClient with the ruuvitag_sensor.ruuvi.ble adapter and the settings
+    of the class attributes. Use RuuviClient instances for independently configured adapters and settings.
+
+    Attributes:
+        blacklist_ttl_sec (float): Time in seconds after which blacklisted MACs are retried.
+                                   Default None keeps MACs blacklisted until the scan ends
+        decode_cache (DecodeCache): Cache for skipping decoding of repeated advertisements.
+                                    Default None decodes every advertisement
+        duplicate_window_sec (float): Time in seconds in which an identical advertisement received by another
+                                      Bluetooth device is dropped, when data is read from multiple devices.
+                                      Default 0.5
+        compact_readings (bool): Decode Data Format 5, 6 and E1 to compact SensorReading objects instead of
+                                 dictionaries. Default False
+        lazy_readings (bool): Decode Data Format 5 to LazySensorReading5 objects, which decode each value on
+                              first access. Default False
+    """
+
+    blacklist_ttl_sec: float | None = None
+    decode_cache: DecodeCache | None = None
+    duplicate_window_sec: float = 0.5
+    compact_readings: bool = False
+    lazy_readings: bool = False
+
+    @staticmethod
+    def _create_mac_blacklist() -> MacBlacklist | ListProxy:
+        return _default_client._create_mac_blacklist()
+
+    @staticmethod
+    def get_first_raw_data(mac: str, bt_device: str = "") -> DataFormatAndRawSensorData:
+        """
+        Get raw data for selected RuuviTag. This method is intended to be used only by
+        RuuviTag-class.
+
+        Args:
+            mac (string): MAC address
+            bt_device (string): Bluetooth device id
+        Returns:
+            tuple (int, string): Data Format type and raw Sensor data
+        """
+        return _default_client.get_first_raw_data(mac, bt_device)
+
+    @staticmethod
+    async def get_first_raw_data_async(mac: str, bt_device: str = "") -> DataFormatAndRawSensorData:
+        """
+        Get raw data for selected RuuviTag. This method is intended to be used only by
+        RuuviTagAsync-class.
+
+        NOTE: This method is not working on macOS
+
+        Args:
+            mac (string): MAC address
+            bt_device (string): Bluetooth device id
+        Returns:
+            tuple (int, string): Data Format type and raw Sensor data
+        """
+        return await _default_client.get_first_raw_data_async(mac, bt_device)
+
+    @staticmethod
+    def find_ruuvitags(bt_device: str | list[str] = "") -> dict[Mac, SensorData]:
+        """
+        CLI helper function.
+
+        Find all RuuviTags. Function will print the MAC and the state of the sensors when found.
+        Function will execute as long as it is stopped. Stop execution with Ctrl+C.
+
+        Returns:
+            dict: MAC and state of found sensors
+        """
+        return _default_client.find_ruuvitags(bt_device)
+
+    @staticmethod
+    async def find_ruuvitags_async(bt_device: str | list[str] = "") -> dict[Mac, MacAndSensorData]:
+        """
+        CLI helper function.
+
+        Find all RuuviTags. Function will print the MAC and the state of the sensors when found.
+        Function will execute as long as it is stopped. Stop execution with Ctrl+C.
+
+        Returns:
+            dict: MAC and state of found sensors
+        """
+        return await _default_client.find_ruuvitags_async(bt_device)
+
+    @staticmethod
+    def get_data_for_sensors(
+        macs: list[str] | None = None, search_duration_sec: int = 5, bt_device: str | list[str] = ""
+    ) -> dict[Mac, SensorData]:
+        """
+        Get latest data for RuuviTag and Ruuvi Air sensors in the MAC address list.
+
+        Args:
+            macs (array): MAC addresses
+            search_duration_sec (int): Search duration in seconds. Default 5
+            bt_device (string): Bluetooth device id or list of ids
+        Returns:
+            dict: MAC and state of found sensors
+        """
+        return _default_client.get_data_for_sensors(macs, search_duration_sec, bt_device)
+
+    @staticmethod
+    async def get_data_for_sensors_async(
+        macs: list[str] | None = None, search_duration_sec: int = 5, bt_device: str | list[str] = ""
+    ) -> dict[Mac, SensorData]:
+        """
+        Get latest data for RuuviTag and Ruuvi Air sensors in the MAC address list.
+
+        Args:
+            macs (array): MAC addresses
+            search_duration_sec (int): Search duration in seconds. Default 5
+            bt_device (string): Bluetooth device id or list of ids
+        Returns:
+            dict: MAC and state of found sensors
+        """
+        return await _default_client.get_data_for_sensors_async(macs, search_duration_sec, bt_device)
+
+    @staticmethod
+    def get_data_async(
+        macs: list[str] | None = None, bt_device: str | list[str] = "", coalesce_interval_sec: float | None = None
+    ) -> AsyncGenerator[MacAndSensorData, None]:
+        """
+        Get data for all RuuviTag and Ruuvi Air sensors or sensors in the MAC's list.
+
+        Args:
+            macs (list): MAC addresses
+            bt_device (string): Bluetooth device id or list of ids. Devices in the list are scanned concurrently
+                and the data has the device that received the advertisement in bt_device and rssi fields
+            coalesce_interval_sec (float): Keep only the latest advertisement of each sensor and decode it
+                when it is delivered. 0 delivers the latest data when the next item is requested, a positive
+                value delivers the latest data of all updated sensors once per interval.
+                Default None delivers every advertisement
+        Returns:
+            AsyncGenerator: MAC and State of sensor data (tuple)
+        """
+        return _default_client.get_data_async(macs, bt_device, coalesce_interval_sec)
+
+    @staticmethod
+    def get_data(
+        callback: Callable[[MacAndSensorData], None],
+        macs: list[str] | None = None,
+        run_flag: RunFlag | None = None,
+        bt_device: str | list[str] = "",
+        coalesce_interval_sec: float | None = None,
+    ) -> None:
+        """
+        Get data for all RuuviTag and Ruuvi Air sensors or sensors in the MAC's list.
+
+        Args:
+            callback (func): callback function to be called when new data is received
+            macs (list): MAC addresses
+            run_flag (object): RunFlag object. Function executes while run_flag.running
+            bt_device (string): Bluetooth device id or list of ids. Devices in the list are scanned concurrently
+                and the data has the device that received the advertisement in bt_device and rssi fields
+            coalesce_interval_sec (float): Keep only the latest advertisement of each sensor and call callback
+                with the latest data of all updated sensors once per interval. Default None calls callback
+                for every advertisement
+        """
+        _default_client.get_data(callback, macs, run_flag, bt_device, coalesce_interval_sec)
+
+    @staticmethod
+    def get_datas(
+        callback: Callable[[MacAndSensorData], None],
+        macs: list[str] | None = None,
+        run_flag: RunFlag | None = None,
+        bt_device: str = "",
+    ) -> None:
+        """
+        DEPRECATED
+        This method will be removed in a future version.
+        Use get_data-method instead.
+        """
+        if macs is None:
+            macs = []
+        if run_flag is None:
+            run_flag = RunFlag()
+
+        warn("This method will be removed in a future version, use get_data() instead", FutureWarning, stacklevel=2)
+        throw_if_not_sync_adapter(_get_ble())
+        return RuuviTagSensor.get_data(callback, macs, run_flag, bt_device)
+
+    @staticmethod
+    def _parse_data(
+        ble_data: MacAndRawData | MacAndRawBytes | MacRawDataAndDevice,
+        mac_blacklist: MacBlacklist | ListProxy,
+        allowed_macs: list[str] | None = None,
+    ) -> MacAndSensorData | None:
+        return _default_client._parse_data(ble_data, mac_blacklist, allowed_macs)
+
+    @staticmethod
+    def _decode(data_format: int | str, data: str | memoryview, rssi: int | None) -> SensorData | None:
+        return _default_client._decode(data_format, data, rssi)
+
+    @staticmethod
+    def get_history_async(
         mac: str,
         start_time: datetime | None = None,
         max_items: int | None = None,
         device_type: DeviceType = "ruuvitag",
+        merge_rows: bool = False,
     ) -> AsyncGenerator[SensorHistoryData | SensorAirHistoryData, None]:
         """
         Get history data from a RuuviTag or Ruuvi Air as an async stream.
 
         For RuuviTag: Each history entry contains one measurement type (temperature, humidity, or pressure)
-        with Unix timestamp (integer). Requires firmware version 3.30.0 or newer.
+        with Unix timestamp (integer), unless merge_rows is set. Requires firmware version 3.30.0 or newer.
 
         For Ruuvi Air: Each history entry contains all sensor measurements (temperature, humidity, pressure,
         PM values, CO₂, VOC, NOx) with Unix timestamp (integer).
@@ -400,6 +893,8 @@ class RuuviTagSensor:
             max_items (Optional[int]): Maximum number of history entries to fetch. If None, gets all available data
             device_type (DeviceType): Device type - "ruuvi_air" for Ruuvi Air,
                 "ruuvitag" for RuuviTag (default: "ruuvitag")
+            merge_rows (bool): Merge RuuviTag temperature, humidity and pressure entries of the same timestamp
+                into one entry. Only the entry of the current timestamp is kept in memory (default: False)
 
         Yields:
             SensorHistoryData or SensorAirHistoryData: Individual history measurements.
@@ -409,24 +904,37 @@ class RuuviTagSensor:
         Raises:
             RuntimeError: If connection fails or device doesn't support history
         """
-        throw_if_not_async_adapter(ble)
+        return _default_client.get_history_async(mac, start_time, max_items, device_type, merge_rows)
 
-        if device_type not in {"ruuvitag", "ruuvi_air"}:
-            raise ValueError(f"Invalid device_type: {device_type}. Must be 'ruuvitag' or 'ruuvi_air'")
+    @staticmethod
+    def sync_history_async(
+        mac: str,
+        store: WatermarkStore | None = None,
+        start_time: datetime | None = None,
+        device_type: DeviceType = "ruuvitag",
+    ) -> AsyncGenerator[SensorHistoryData | SensorAirHistoryData, None]:
+        """
+        Get history data that was not received in earlier syncs from a RuuviTag or Ruuvi Air as an async stream.
 
-        decoder = HistoryDecoder() if device_type == "ruuvitag" else AirHistoryDecoder()
+        Timestamp of the latest received entry is stored per device in the store, and the next sync requests
+        history only from that time onwards. Entries that were already received are skipped.
 
-        try:
-            data_iter = ble.get_history_data(mac, start_time, max_items, device_type=device_type)
-            async for data in data_iter:
-                if decoded := decoder.decode_data(data):
-                    if isinstance(decoded, list):
-                        for record in decoded:
-                            yield record
-                    else:
-                        yield decoded
-        finally:
-            await data_iter.aclose()
+        Args:
+            mac (str): MAC address or UUID of the device. On macOS use UUID instead.
+            store (Optional[WatermarkStore]): Store for the latest received timestamps.
+                Default JsonWatermarkStore in ~/.ruuvitag_sensor/history_watermarks.json
+            start_time (Optional[datetime]): Start time for a device that has not been synced before.
+                Time should be in UTC. If None, gets all available data
+            device_type (DeviceType): Device type - "ruuvi_air" for Ruuvi Air,
+                "ruuvitag" for RuuviTag (default: "ruuvitag")
+
+        Yields:
+            SensorHistoryData or SensorAirHistoryData: History measurements that were not received earlier
+
+        Raises:
+            RuntimeError: If connection fails or device doesn't support history
+        """
+        return _default_client.sync_history_async(mac, store, start_time, device_type)
 
     @staticmethod
     async def download_history(
@@ -443,7 +951,7 @@ class RuuviTagSensor:
         For RuuviTag: Each history entry contains one measurement type (temperature, humidity, or pressure)
         with Unix timestamp (integer). Requires firmware version 3.30.0 or newer.
         Note: The RuuviTag sends each measurement type as separate entries.
-        If you need to combine measurements by timestamp, you'll need to post-process the data.
+        To combine measurements by timestamp while streaming, use get_history_async with merge_rows=True.
 
         For Ruuvi Air: Each history entry contains all sensor measurements (temperature, humidity, pressure,
         PM values, CO₂, VOC, NOx) with Unix timestamp (integer).
@@ -463,26 +971,94 @@ class RuuviTagSensor:
             RuntimeError: If connection fails or device doesn't support history
             TimeoutError: If download takes longer than timeout
         """
-        throw_if_not_async_adapter(ble)
+        return await _default_client.download_history(mac, start_time, timeout, max_items, device_type)
 
-        if device_type not in {"ruuvitag", "ruuvi_air"}:
-            raise ValueError(f"Invalid device_type: {device_type}. Must be 'ruuvitag' or 'ruuvi_air'")
+    @staticmethod
+    def download_history_many(  # noqa: PLR0913
+        devices: Mapping[str, DeviceType],
+        start_time: datetime | None = None,
+        timeout: int = 300,
+        max_items: int | None = None,
+        max_concurrent: int = 3,
+        max_retries: int = 2,
+        retry_delay_sec: float = 5.0,
+        last_downloaded: Mapping[str, datetime] | None = None,
+        watermark_store: WatermarkStore | None = None,
+    ) -> AsyncGenerator[HistoryDownloadResult, None]:
+        """
+        Download history data from multiple RuuviTags and Ruuvi Airs concurrently.
+        Results are yielded per device as the downloads finish.
 
-        decoder = HistoryDecoder() if device_type == "ruuvitag" else AirHistoryDecoder()
+        Devices that have never been downloaded are downloaded first, followed by the devices with the
+        oldest download in last_downloaded. Failed downloads are retried with exponential backoff and
+        a failed device doesn't stop the other downloads.
 
-        try:
-            history_data: list[SensorHistoryData | SensorAirHistoryData] = []
+        Args:
+            devices (dict): MAC address or UUID and device type ("ruuvitag" or "ruuvi_air") of the devices
+            start_time (Optional[datetime]): If provided, only get data from this time onwards. Time should be in UTC.
+            timeout (int): Maximum time in seconds to wait for history download of one device (default: 300)
+            max_items (Optional[int]): Maximum number of history entries to fetch from each device
+            max_concurrent (int): Maximum number of simultaneous connections (default: 3)
+            max_retries (int): Number of retries after a failed download (default: 2)
+            retry_delay_sec (float): Delay before the first retry. Delay is doubled for each retry (default: 5)
+            last_downloaded (Optional[dict]): MAC and time of the last download, used to prioritize stale devices
+            watermark_store (Optional[WatermarkStore]): If provided, download only entries that were not received
+                in earlier syncs, as with sync_history_async. max_items is not used with a store
 
-            async def collect_history():
-                async for data in ble.get_history_data(mac, start_time, max_items, device_type=device_type):
-                    if decoded := decoder.decode_data(data):
-                        # HistoryDecoder returns single record or None, AirHistoryDecoder returns list
-                        history_data.extend(decoded if isinstance(decoded, list) else [decoded])
+        Yields:
+            HistoryDownloadResult: MAC, device type, history data and error of the last attempt if all
+                attempts failed
+        """
+        return _default_client.download_history_many(
+            devices,
+            start_time,
+            timeout,
+            max_items,
+            max_concurrent,
+            max_retries,
+            retry_delay_sec,
+            last_downloaded,
+            watermark_store,
+        )
 
-            await asyncio.wait_for(collect_history(), timeout=timeout)
-            return history_data
 
-        except asyncio.TimeoutError as err:
-            raise TimeoutError(f"History download timed out after {timeout} seconds") from err
-        except Exception as e:
-            raise RuntimeError(f"Failed to download history: {e!s}") from e
+class _RuuviTagSensorSetting:
+    """Setting of the default client that is stored in the RuuviTagSensor class attribute with the same name"""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: object, owner: type | None = None) -> Any:
+        return getattr(RuuviTagSensor, self.name)
+
+    def __set__(self, instance: object, value: Any) -> None:
+        setattr(RuuviTagSensor, self.name, value)
+
+
+class _DefaultRuuviClient(RuuviClient):
+    """
+    Client of the RuuviTagSensor static methods. Adapter is ruuvitag_sensor.ruuvi.ble and settings are
+    the RuuviTagSensor class attributes, so changes to them are used also by scans that are already running.
+    """
+
+    blacklist_ttl_sec = _RuuviTagSensorSetting()
+    decode_cache = _RuuviTagSensorSetting()
+    duplicate_window_sec = _RuuviTagSensorSetting()
+    compact_readings = _RuuviTagSensorSetting()
+    lazy_readings = _RuuviTagSensorSetting()
+
+    def __init__(self) -> None:
+        # Adapter and settings are not set, as the adapter is resolved on first use
+        self.decoders = {}
+        self.filters = []
+
+    @property
+    def adapter(self) -> Any:
+        return _get_ble()
+
+    @adapter.setter
+    def adapter(self, adapter: Any) -> None:
+        globals()["ble"] = adapter
+
+
+_default_client = _DefaultRuuviClient()
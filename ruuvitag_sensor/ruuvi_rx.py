@@ -1,5 +1,4 @@
 import asyncio
-import time
 from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from multiprocessing import Manager
@@ -10,21 +9,37 @@ from threading import Thread
 from reactivex import Subject
 
 from ruuvitag_sensor.adapters import is_async_adapter
-from ruuvitag_sensor.ruuvi import RunFlag, RuuviTagSensor, ble
+from ruuvitag_sensor.ruuvi import RunFlag, RuuviTagSensor, _get_ble
 
 
-async def _run_get_data_background_async(macs: list[str], queue: Queue, shared_data: DictProxy, bt_device: str):
+def __getattr__(name: str):
+    # ble is kept for backward compatibility. It is the adapter of ruuvitag_sensor.ruuvi, resolved on first use
+    if name == "ble":
+        return _get_ble()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _add_time(data: tuple) -> tuple:
+    mac, sensor_data = data
+    if not isinstance(sensor_data, dict):
+        # Compact readings have a fixed set of keys, so time is added to a dictionary with the same data
+        sensor_data = dict(sensor_data)
+    sensor_data["time"] = datetime.now(timezone.utc).isoformat()
+    return (mac, sensor_data)
+
+
+async def _run_get_data_async(macs: list[str], subjects: list[Subject], run_flag: RunFlag, bt_device: str):
     """
-    Async background process function for RuuviTag Sensors
+    Async task for RuuviTag Sensors. Runs in the same event loop as the observers, so data is
+    delivered to subjects directly without a queue
     """
     data_iter = RuuviTagSensor.get_data_async(macs, bt_device)
     try:
         async for data in data_iter:
-            if not shared_data["run_flag"]:
+            if not run_flag.running:
                 break
 
-            data[1]["time"] = datetime.now(timezone.utc).isoformat()  # type: ignore
-            queue.put(data)
+            RuuviTagReactive._notify(subjects, _add_time(data))
     finally:
         await data_iter.aclose()
 
@@ -40,8 +55,7 @@ def _run_get_data_background(macs: list[str], queue: Queue, shared_data: DictPro
         if not shared_data["run_flag"]:
             run_flag.running = False
 
-        data[1]["time"] = datetime.now(timezone.utc).isoformat()
-        queue.put(data)
+        queue.put(_add_time(data))
 
     RuuviTagSensor.get_data(add_data, macs, run_flag, bt_device)
 
@@ -51,17 +65,22 @@ class RuuviTagReactive:
     Reactive wrapper and background process for RuuviTagSensor get_data
     """
 
+    @staticmethod
+    def _notify(subjects: list[Subject], data):
+        for subject in [s for s in subjects if not s.is_disposed]:
+            subject.on_next(data)
+
     @staticmethod
     def _data_update(subjects: list[Subject], queue: Queue, run_flag: RunFlag):
         """
-        Get data from background process and notify all subscribed observers with the new data
+        Get data from background process and notify all subscribed observers with the new data.
+        Waits on the queue until data is received. None in the queue stops the update.
         """
         while run_flag.running:
-            while not queue.empty():
-                data = queue.get()
-                for subject in [s for s in subjects if not s.is_disposed]:
-                    subject.on_next(data)
-            time.sleep(0.1)
+            data = queue.get()
+            if data is None:
+                break
+            RuuviTagReactive._notify(subjects, data)
 
     def __init__(self, macs: list[str] | None = None, bt_device: str = ""):
         """
@@ -76,9 +95,18 @@ class RuuviTagReactive:
 
         self._run_flag = RunFlag()
         self._subjects: list[Subject] = []
+        self._task: asyncio.Task | None = None
+        self._queue: Queue | None = None
+        self._shared_data: DictProxy | None = None
+
+        if is_async_adapter(_get_ble()):
+            # Notify observers directly from a task in the running event loop
+            loop = asyncio.get_running_loop()
+            self._task = loop.create_task(_run_get_data_async(macs, self._subjects, self._run_flag, bt_device))
+            return
 
         m = Manager()
-        q = m.Queue()
+        self._queue = m.Queue()
 
         # Use Manager dict to share data between processes
         self._shared_data = m.dict()
@@ -86,17 +114,13 @@ class RuuviTagReactive:
 
         # Start data updater
 
-        notify_thread = Thread(target=RuuviTagReactive._data_update, args=(self._subjects, q, self._run_flag))
+        notify_thread = Thread(target=RuuviTagReactive._data_update, args=(self._subjects, self._queue, self._run_flag))
         notify_thread.start()
 
         # Start background process
 
-        if is_async_adapter(ble):
-            loop = asyncio.get_running_loop()
-            loop.create_task(_run_get_data_background_async(macs, q, self._shared_data, bt_device))
-        else:
-            executor = ProcessPoolExecutor(1)
-            executor.submit(_run_get_data_background, macs, q, self._shared_data, bt_device)
+        executor = ProcessPoolExecutor(1)
+        executor.submit(_run_get_data_background, macs, self._queue, self._shared_data, bt_device)
 
     def get_subject(self) -> Subject:
         """
@@ -117,7 +141,13 @@ class RuuviTagReactive:
         """
 
         self._run_flag.running = False
-        self._shared_data["run_flag"] = False
+
+        if self._task:
+            self._task.cancel()
+        if self._shared_data is not None and self._queue is not None:
+            self._shared_data["run_flag"] = False
+            # Wake up the data updater
+            self._queue.put(None)
 
         for s in self._subjects:
             s.dispose()
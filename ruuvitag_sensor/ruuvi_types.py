@@ -1,4 +1,6 @@
-from typing import Literal, TypedDict
+from typing import Any, Literal, TypedDict
+
+from ruuvitag_sensor.readings import SensorReading
 
 DeviceType = Literal["ruuvitag", "ruuvi_air"]
 
@@ -83,7 +85,11 @@ class SensorAirHistoryData(TypedDict):
     timestamp: int
 
 
-SensorData = SensorDataUrl | SensorData3 | SensorData5 | SensorData6 | SensorDataE1
+# Column name to NumPy array or array.array of values
+ColumnarSensorData = dict[str, Any]
+
+# Decoded data is a dictionary or a compact reading when RuuviTagSensor.compact_readings is enabled
+SensorData = SensorDataUrl | SensorData3 | SensorData5 | SensorData6 | SensorDataE1 | SensorReading
 
 DataFormat = int | str | None
 RawSensorData = str | None
@@ -95,4 +101,12 @@ MacAndSensorData = tuple[Mac, SensorData]
 RawData = str
 MacAndRawData = tuple[str, str]
 
+RawBytes = bytes | bytearray | memoryview
+RawSensorBytes = memoryview | None
+DataFormatAndRawSensorBytes = tuple[DataFormat, RawSensorBytes]
+# MAC, Ruuvi manufacturer specific data without the company identifier and RSSI
+MacAndRawBytes = tuple[str, bytes, int | None]
+# MAC, hex data or manufacturer specific data, RSSI and the Bluetooth device that received the advertisement
+MacRawDataAndDevice = tuple[str, str | bytes, int | None, str]
+
 ByteData = tuple[int, ...]
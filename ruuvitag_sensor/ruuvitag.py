@@ -1,6 +1,5 @@
 import re
 
-from ruuvitag_sensor.decoder import get_decoder
 from ruuvitag_sensor.ruuvi import RuuviTagSensor
 from ruuvitag_sensor.ruuvi_types import DataFormat, SensorData
 
@@ -38,7 +37,7 @@ class RuuviTagBase:
         if self._data is None:
             self._state = {}
         elif data_format is not None:
-            self._state = get_decoder(data_format).decode_data(self._data)  # type: ignore[assignment]
+            self._state = RuuviTagSensor._decode(data_format, self._data, None)  # type: ignore[assignment]
 
         return self._state
 
@@ -1,3 +1,10 @@
+import math
+import random
+import struct
+from array import array
+
+import pytest
+
 from ruuvitag_sensor.decoder import AirHistoryDecoder
 
 
@@ -571,3 +578,123 @@ class TestAirHistoryDecoder:
 
         records = decoder.decode_data(incomplete_packet)
         assert len(records) == 0  # Incomplete record should be skipped
+
+
+def create_air_record(timestamp: int, **values: int) -> bytes:
+    record = {
+        "data_format": 0xE1,
+        "temperature": 4860,
+        "humidity": 21396,
+        "voc": 50,
+        "nox": 25,
+        "sequence": 12345,
+        "flags": 0,
+    }
+    record.update(values)
+    return struct.pack(
+        ">IBhHHHHHHHBB6x3sB5x",
+        timestamp,
+        record["data_format"],
+        record["temperature"],
+        record["humidity"],
+        50000,
+        50,
+        100,
+        80,
+        120,
+        450,
+        record["voc"],
+        record["nox"],
+        record["sequence"].to_bytes(3, "big"),
+        record["flags"],
+    )
+
+
+def create_air_packet(records: list[bytes]) -> bytes:
+    return bytes([0x3B, 0x3B, 0x20, len(records), 38]) + b"".join(records)
+
+
+class TestAirHistoryDecoderColumns:
+    packets = (
+        create_air_packet(
+            [
+                create_air_record(1733760000),
+                # VOC and NOx 9th bits set in flags
+                create_air_record(1733760300, temperature=-200, voc=0x10, nox=0x20, flags=0xC0),
+            ]
+        ),
+        create_air_packet(
+            [
+                # Invalid values
+                create_air_record(1733760600, temperature=-32768, humidity=0xFFFF, voc=0xFF, nox=0xFF, flags=0xC0),
+                create_air_record(1733760900, sequence=0xFFFFFF),
+                # Invalid data format is skipped
+                create_air_record(1733761200, data_format=0xE0),
+            ]
+        ),
+        # End marker
+        bytes([0x3B, 0x3B, 0x20, 0x00, 0x26]),
+    )
+
+    def assert_columns(self, columns):
+        decoder = AirHistoryDecoder()
+        expected = [record for packet in self.packets for record in decoder.decode_data(bytearray(packet))]
+
+        assert len(columns["timestamp"]) == len(expected) == 4
+        for index, record in enumerate(expected):
+            for name, column in columns.items():
+                if record[name] is None:
+                    assert math.isnan(column[index])
+                else:
+                    assert column[index] == record[name]
+
+    def test_decode_columns_array_from_buffer(self):
+        columns = AirHistoryDecoder().decode_columns(b"".join(self.packets), use_numpy=False)
+
+        assert isinstance(columns["temperature"], array)
+        assert list(columns["voc"])[:2] == [50, 272]
+        self.assert_columns(columns)
+
+    def test_decode_columns_array_from_packets(self):
+        columns = AirHistoryDecoder().decode_columns(list(self.packets), use_numpy=False)
+
+        self.assert_columns(columns)
+
+    def test_decode_columns_numpy(self):
+        np = pytest.importorskip("numpy")
+        columns = AirHistoryDecoder().decode_columns(b"".join(self.packets), use_numpy=True)
+
+        assert isinstance(columns["temperature"], np.ndarray)
+        self.assert_columns(columns)
+
+    def test_decode_columns_numpy_array_and_dict_are_identical(self):
+        pytest.importorskip("numpy")
+        rng = random.Random(4)
+        packets = []
+        for _ in range(200):
+            records = [bytes(4) + b"\xe1" + rng.randbytes(33) for _ in range(rng.randint(1, 6))]
+            packets.append(bytes([0x3B, 0x3B, 0x20, len(records), 38]) + b"".join(records))
+        decoder = AirHistoryDecoder()
+
+        expected = [record for packet in packets for record in decoder.decode_data(packet)]
+        numpy_columns = decoder.decode_columns(packets, use_numpy=True)
+        array_columns = decoder.decode_columns(packets, use_numpy=False)
+
+        assert len(numpy_columns["timestamp"]) == len(array_columns["timestamp"]) == len(expected)
+        for index, record in enumerate(expected):
+            for name, value in record.items():
+                expected_value = math.nan if value is None else value
+                assert float(numpy_columns[name][index]) == pytest.approx(expected_value, rel=0, abs=0, nan_ok=True)
+                assert array_columns[name][index] == pytest.approx(expected_value, rel=0, abs=0, nan_ok=True)
+
+    def test_decode_columns_truncated_buffer(self):
+        buffer = b"".join(self.packets)[:-10]
+        columns = AirHistoryDecoder().decode_columns(buffer, use_numpy=False)
+
+        # Last complete record of the second packet is decoded
+        assert len(columns["timestamp"]) == 4
+
+    def test_decode_columns_invalid_header(self):
+        columns = AirHistoryDecoder().decode_columns(b"\x3a\x3a\x20\x01\x26" + bytes(38), use_numpy=False)
+
+        assert len(columns["timestamp"]) == 0
@@ -78,3 +78,9 @@ class TestDf3Decoder:
         assert data["acceleration_y"] == -1000
         assert data["acceleration_z"] == -1000
         assert data["acceleration"] != 0
+
+    def test_df3decode_bytes_matches_hex(self):
+        decoder = Df3Decoder()
+        payload = "03291A1ECE1E02DEF94202CA0B53"
+
+        assert decoder.decode_bytes(bytes.fromhex(payload)) == decoder.decode_data(payload)
@@ -1,4 +1,11 @@
+import math
+import random
+from array import array
+
+import pytest
+
 from ruuvitag_sensor.decoder import Df5Decoder, parse_mac
+from ruuvitag_sensor.decoders.df5_decoder import LazySensorReading5
 
 
 class TestDf5Decoder:
@@ -67,9 +74,140 @@ class TestDf5Decoder:
         assert data["acceleration_z"] == 0
         assert data["acceleration"] == 0.0  # Magnitude should be 0.0, not None
 
+    def test_df5decode_bytes_matches_hex(self):
+        decoder = Df5Decoder()
+        payload = "0512FC5394C37C0004FFFC040CAC364200CDCBB8334C884F"
+
+        from_hex = decoder.decode_data(f"{payload}C6")
+        from_bytes = decoder.decode_bytes(memoryview(bytes.fromhex(payload)), -58)
+
+        assert from_bytes == from_hex
+        assert decoder.decode_bytes(bytes.fromhex(payload))["rssi"] is None
+
+    def test_df5decode_bytes_too_short(self):
+        decoder = Df5Decoder()
+        assert decoder.decode_bytes(bytes.fromhex("0512FC5394")) is None
+
     def test_parse_df5_mac(self):
         mac_payload = "e62eb92e73e5"
         mac = "E6:2E:B9:2E:73:E5"
 
         parsed = parse_mac(5, mac_payload)
         assert parsed == mac
+
+
+BATCH_PAYLOADS = [
+    bytes.fromhex("0512FC5394C37C0004FFFC040CAC364200CDCBB8334C884F"),
+    # Invalid values
+    bytes.fromhex("058000FFFFFFFF800080008000FFFFFFFFFFFFFFFFFFFFFF"),
+    bytes.fromhex("0513844533c43dffe0ffd804189ff645fcffeba5d102ce68"),
+]
+
+
+class TestDf5DecoderBatch:
+    def assert_columns(self, columns):
+        decoder = Df5Decoder()
+        for index, payload in enumerate(BATCH_PAYLOADS):
+            expected = decoder.decode_bytes(payload)
+            for name, column in columns.items():
+                value = column[index]
+                if expected[name] is None:
+                    assert math.isnan(value)
+                else:
+                    assert value == expected[name]
+
+    def test_decode_batch_array(self):
+        columns = Df5Decoder().decode_batch(BATCH_PAYLOADS, use_numpy=False)
+
+        assert isinstance(columns["temperature"], array)
+        assert list(columns["measurement_sequence_number"]) == [205, 65535, 64767]
+        self.assert_columns(columns)
+
+    def test_decode_batch_contiguous_buffer(self):
+        columns = Df5Decoder().decode_batch(b"".join(BATCH_PAYLOADS), use_numpy=False)
+
+        assert len(columns["temperature"]) == 3
+        self.assert_columns(columns)
+
+    def test_decode_batch_numpy(self):
+        np = pytest.importorskip("numpy")
+        columns = Df5Decoder().decode_batch(b"".join(BATCH_PAYLOADS), use_numpy=True)
+
+        assert isinstance(columns["temperature"], np.ndarray)
+        self.assert_columns(columns)
+
+    def test_decode_batch_numpy_array_and_dict_are_identical(self):
+        pytest.importorskip("numpy")
+        rng = random.Random(5)
+        payloads = [b"\x05" + rng.randbytes(23) for _ in range(3000)]
+        decoder = Df5Decoder()
+
+        numpy_columns = decoder.decode_batch(payloads, use_numpy=True)
+        array_columns = decoder.decode_batch(payloads, use_numpy=False)
+
+        for index, payload in enumerate(payloads):
+            expected = decoder.decode_bytes(payload)
+            for name in numpy_columns:
+                expected_value = math.nan if expected[name] is None else expected[name]
+                assert float(numpy_columns[name][index]) == pytest.approx(expected_value, rel=0, abs=0, nan_ok=True)
+                assert array_columns[name][index] == pytest.approx(expected_value, rel=0, abs=0, nan_ok=True)
+
+    def test_decode_batch_invalid_data(self):
+        decoder = Df5Decoder()
+        with pytest.raises(ValueError, match="Record 1 is not Data Format 5"):
+            decoder.decode_batch([BATCH_PAYLOADS[0], b"\x06" + BATCH_PAYLOADS[0][1:]], use_numpy=False)
+        with pytest.raises(ValueError, match="not a multiple of record size 24"):
+            decoder.decode_batch(b"".join(BATCH_PAYLOADS)[:-1], use_numpy=False)
+        with pytest.raises(ValueError, match="Payload 0 is shorter than record size 24"):
+            decoder.decode_batch([BATCH_PAYLOADS[0][:10]], use_numpy=False)
+
+
+class TestDf5DecoderLazy:
+    @pytest.mark.parametrize("payload", BATCH_PAYLOADS)
+    def test_lazy_matches_dict(self, payload):
+        decoder = Df5Decoder()
+
+        reading = decoder.decode_lazy(memoryview(payload), -58)
+
+        assert reading == decoder.decode_bytes(payload, -58)
+        assert list(reading.to_dict()) == list(decoder.decode_bytes(payload, -58))
+
+    def test_lazy_from_hex(self):
+        decoder = Df5Decoder()
+
+        reading = decoder.decode_lazy("0512FC5394C37C0004FFFC040CAC364200CDCBB8334C884FC6")
+
+        assert reading["rssi"] == -58
+        assert reading.temperature == 24.3
+
+    def test_values_are_decoded_on_access(self):
+        reading = Df5Decoder().decode_lazy(BATCH_PAYLOADS[0])
+
+        assert reading.temperature == 24.3
+        assert reading["humidity"] == 53.49
+
+        assert set(reading._values) == {"temperature", "humidity"}
+        with pytest.raises(AttributeError):
+            reading.unknown  # noqa: B018
+
+    def test_payload_is_copied(self):
+        buffer = bytearray(BATCH_PAYLOADS[0])
+        reading = Df5Decoder().decode_lazy(memoryview(buffer))
+        buffer[1:3] = b"\x00\x00"
+
+        assert reading.temperature == 24.3
+
+    def test_lazy_copy(self):
+        reading = Df5Decoder().decode_lazy(BATCH_PAYLOADS[0])
+        assert reading.temperature == 24.3
+
+        copied = reading.copy()
+        copied["rssi"] = -70
+
+        assert isinstance(copied, LazySensorReading5)
+        assert copied.mac == "cbb8334c884f"
+        assert copied.rssi == -70
+        assert reading.rssi is None
+
+    def test_lazy_too_short(self):
+        assert Df5Decoder().decode_lazy(bytes.fromhex("0512FC5394")) is None
@@ -107,3 +107,9 @@ class TestDf6Decoder:
         """Test that get_decoder returns Df6Decoder for data format 6"""
         decoder = get_decoder(6)
         assert isinstance(decoder, Df6Decoder)
+
+    def test_df6_decode_bytes_matches_hex(self):
+        decoder = Df6Decoder()
+        payload = "06170C5668C79E007000C90501D9FFCD004C884F"
+
+        assert decoder.decode_bytes(bytes.fromhex(payload)) == decoder.decode_data(payload)
@@ -111,3 +111,9 @@ class TestDfE1Decoder:
         """Test that get_decoder returns DfE1Decoder for data format E1"""
         decoder = get_decoder("E1")
         assert isinstance(decoder, DfE1Decoder)
+
+    def test_dfE1_decode_bytes_matches_hex(self):
+        decoder = DfE1Decoder()
+        payload = "E1170C5668C79E0065007004BD11CA00C90A0213E0ACFFFFFFDECDEE11FFFFFFFFFFCBB8334C884F"
+
+        assert decoder.decode_bytes(bytearray.fromhex(payload)) == decoder.decode_data(payload)
@@ -6,6 +6,7 @@ from ruuvitag_sensor.decoder import (
     Df6Decoder,
     DfE1Decoder,
     UrlDecoder,
+    get_bytes_decoder,
     get_decoder,
 )
 
@@ -27,3 +28,15 @@ class TestGetDecoder:
         # Test unknown format raises ValueError
         with pytest.raises(ValueError, match="Unknown data format: 99"):
             get_decoder(99)
+
+    def test_get_decoder_returns_shared_instance(self):
+        assert get_decoder(5) is get_decoder(5)
+        assert get_decoder("E1") is get_decoder("E1")
+
+    def test_get_bytes_decoder(self):
+        assert get_bytes_decoder(5) is get_decoder(5)
+        assert isinstance(get_bytes_decoder(3), Df3Decoder)
+        assert isinstance(get_bytes_decoder(6), Df6Decoder)
+        assert isinstance(get_bytes_decoder("E1"), DfE1Decoder)
+        with pytest.raises(ValueError, match="Data format 2 can't be decoded from bytes"):
+            get_bytes_decoder(2)
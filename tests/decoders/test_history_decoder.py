@@ -82,6 +82,27 @@ class TestHistoryDecoder:
         result = decoder.decode_data(data)
         assert result is None
 
+    def test_history_device_error(self):
+        decoder = HistoryDecoder()
+        data = bytearray(b":0\xf0\xff\xff\xff\xff\xff\xff\xff\xff")
+        assert decoder.decode_data(data) is None
+
+    def test_history_decode_buffer(self):
+        decoder = HistoryDecoder()
+        packets = [
+            bytearray(b':0\x10g\x9d\xb5"\x00\x00\x08\xe3'),
+            bytearray.fromhex("3a31105D57FEAD0000098D"),
+            bytearray.fromhex("3a32105D57FEAD0000098D"),
+            bytearray(b"::\x10\xff\xff\xff\xff\xff\xff\xff\xff"),
+        ]
+        # Incomplete packet at the end is skipped
+        buffer = b"".join(packets) + b":0"
+
+        result = decoder.decode_buffer(buffer)
+
+        assert result == [decoder.decode_data(packet) for packet in packets[:3]]
+        assert [entry["temperature"] for entry in result] == [22.75, None, None]
+
     def test_history_decode_is_error(self):
         decoder = HistoryDecoder()
 
@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("bleson")
+
+from ruuvitag_sensor.adapters.bleson import (
+    BleCommunicationBleson,
+    BlesonMode,
+    _pack_record,
+    _to_raw_data,
+    _unpack_record,
+)
+from ruuvitag_sensor.data_formats import DataFormats
+
+MFG_DATA = bytes.fromhex("99040512FC5394C37C0004FFFC040CAC364200CDCBB8334C884F")
+
+
+def create_advertisement(mac: str | None, mfg_data: bytes | None, rssi: int = -60):
+    address = SimpleNamespace(address=mac) if mac else None
+    return SimpleNamespace(address=address, mfg_data=mfg_data, rssi=rssi)
+
+
+class TestBleson:
+    def test_record_round_trip(self):
+        assert _unpack_record(_pack_record("CB:B8:33:4C:88:4F", MFG_DATA, -60)) == ("CB:B8:33:4C:88:4F", MFG_DATA, -60)
+        assert _unpack_record(_pack_record("", MFG_DATA, -60)) == ("", MFG_DATA, -60)
+
+    def test_raw_data_is_parsed_by_data_formats(self):
+        data_format, data = DataFormats.convert_data(_to_raw_data(MFG_DATA, -60))
+
+        assert data_format == 5
+        assert data == "0512FC5394C37C0004FFFC040CAC364200CDCBB8334C884FC4"
+
+    def test_thread_mode(self):
+        advertisements = [
+            create_advertisement("CB:B8:33:4C:88:4F", MFG_DATA),
+            create_advertisement("11:22:33:44:55:66", None),
+            create_advertisement("AA:BB:CC:DD:EE:FF", MFG_DATA),
+        ]
+        adapter = BleCommunicationBleson(BlesonMode.THREAD)
+
+        with (
+            patch.object(BleCommunicationBleson, "start", return_value=(None, None)),
+            patch.object(BleCommunicationBleson, "stop") as stop,
+            patch.object(BleCommunicationBleson, "get_lines", return_value=iter(advertisements)),
+        ):
+            data = list(adapter.get_data_bytes(["AA:BB:CC:DD:EE:FF"]))
+
+        assert not adapter.uses_subprocess
+        assert data == [("CB:B8:33:4C:88:4F", MFG_DATA[2:], -60)]
+        stop.assert_called_once()
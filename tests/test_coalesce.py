@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from ruuvitag_sensor.coalesce import LatestByMac, coalesce_async
+
+
+class TestLatestByMac:
+    def test_keeps_latest_per_mac_in_first_update_order(self):
+        latest = LatestByMac()
+        latest.put(("AA:AA:AA:AA:AA:AA", 1))
+        latest.put(("BB:BB:BB:BB:BB:BB", 2))
+        latest.put(("AA:AA:AA:AA:AA:AA", 3))
+
+        assert len(latest) == 2
+        assert latest.pop() == ("AA:AA:AA:AA:AA:AA", 3)
+        assert latest.take_all() == [("BB:BB:BB:BB:BB:BB", 2)]
+        assert len(latest) == 0
+
+    def test_items_without_mac_are_kept(self):
+        latest = LatestByMac()
+        latest.put(("", 1))
+        latest.put(("", 2))
+
+        assert latest.take_all() == [("", 1), ("", 2)]
+
+
+class TestCoalesceAsync:
+    async def test_interval_delivers_latest_of_updated_macs(self):
+        async def data():
+            yield ("AA:AA:AA:AA:AA:AA", 1)
+            yield ("AA:AA:AA:AA:AA:AA", 2)
+            yield ("BB:BB:BB:BB:BB:BB", 3)
+            await asyncio.sleep(0.2)
+            yield ("BB:BB:BB:BB:BB:BB", 4)
+
+        items = [item async for item in coalesce_async(data(), 0.1)]
+
+        assert items == [("AA:AA:AA:AA:AA:AA", 2), ("BB:BB:BB:BB:BB:BB", 3), ("BB:BB:BB:BB:BB:BB", 4)]
+
+    async def test_adapter_error_is_raised(self):
+        async def data():
+            yield ("AA:AA:AA:AA:AA:AA", 1)
+            raise RuntimeError("Adapter failed")
+
+        gener = coalesce_async(data())
+        assert await gener.__anext__() == ("AA:AA:AA:AA:AA:AA", 1)
+        with pytest.raises(RuntimeError, match="Adapter failed"):
+            await gener.__anext__()
+
+    async def test_close_stops_adapter(self):
+        stopped = asyncio.Event()
+
+        async def data():
+            try:
+                while True:
+                    yield ("AA:AA:AA:AA:AA:AA", 1)
+                    await asyncio.sleep(0.01)
+            finally:
+                stopped.set()
+
+        gener = coalesce_async(data())
+        assert await gener.__anext__() == ("AA:AA:AA:AA:AA:AA", 1)
+        await gener.aclose()
+
+        assert stopped.is_set()
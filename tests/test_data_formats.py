@@ -88,3 +88,82 @@ class TestDataFormats:
         (data_format, data) = DataFormats.convert_data(test_case)
         assert data_format is None
         assert data == ""
+
+    def test_convert_manufacturer_data_valid_data(self):
+        test_cases = [
+            ("0512FC5394C37C0004FFFC040CAC364200CDCBB8334C884F", 5),
+            ("06170C5668C79E007000C90501D9FFCD004C884F", 6),
+            ("E1170C5668C79E0065007004BD11CA00C90A0213E0ACFFFFFFDECDEE11FFFFFFFFFFCBB8334C884F", "E1"),
+            ("03651652CAE900080018041C0C8B", 3),
+        ]
+        for x, data_format in test_cases:
+            raw = bytes.fromhex(x)
+            encoded = DataFormats.convert_manufacturer_data(raw)
+            assert encoded[0] == data_format
+            assert isinstance(encoded[1], memoryview)
+            assert encoded[1] == raw
+
+    def test_convert_manufacturer_data_not_valid(self):
+        assert DataFormats.convert_manufacturer_data(b"") == (None, None)
+        assert DataFormats.convert_manufacturer_data(bytes.fromhex("0700112233")) == (None, None)
+
+    def test_convert_data_rejects_other_devices(self):
+        test_cases = [
+            # Apple iBeacon
+            "1E02011A1AFF4C000215FDA50693A4E24FB1AFCFC6EB0764782500010002C5C4",
+            # Eddystone UID of another service
+            "1D0201060303AAFE1516ABFE00E700010203040506070809000102030405C4",
+            # Manufacturer specific data of Ruuvi Innovations with an unknown data format
+            "0F0201060BFF99040700112233445566C4",
+            # Manufacturer specific data shorter than the company identifier
+            "0702010603FF9904C4",
+        ]
+        for x in test_cases:
+            assert DataFormats.convert_data(x) == (None, None)
+
+    def test_convert_data_local_name(self):
+        assert DataFormats.convert_data("0A02010606095275757669C4") == (None, "")
+        assert DataFormats.convert_data("0A020106060950686F6E65C4") == (None, None)
+
+    def test_convert_advertisement_valid_data(self):
+        test_cases = [
+            ("0201061BFF99040512FC5394C37C0004FFFC040CAC364200CDCBB8334C884F", 5),
+            ("02010617FF990406170C5668C79E007000C90501D9FFCD004C884F", 6),
+            (
+                "0201062BFF9904E1170C5668C79E0065007004BD11CA00C90A0213E0ACFFFFFFDECDEE11FFFFFFFFFFCBB8334C884F",
+                "E1",
+            ),
+            ("02010411FF990403651652CAE900080018041C0C8B", 3),
+        ]
+        for x, data_format in test_cases:
+            raw = bytes.fromhex(x)
+            encoded = DataFormats.convert_advertisement(raw)
+            assert encoded[0] == data_format
+            assert isinstance(encoded[1], memoryview)
+            assert encoded[1].obj is raw
+            assert encoded[1] == raw[raw.index(b"\xff\x99\x04") + 3 :]
+
+    def test_convert_advertisement_not_valid(self):
+        test_cases = [
+            "",
+            # Apple iBeacon
+            "02011A1AFF4C000215FDA50693A4E24FB1AFCFC6EB0764782500010002C5",
+            # Data Formats 2 and 4 are not supported
+            "0201060303AAFE1616AAFE10EE037275752E76692F23416A7759414D4663",
+            "020106060950686F6E65",
+        ]
+        for x in test_cases:
+            assert DataFormats.convert_advertisement(bytes.fromhex(x)) == (None, None)
+
+    def test_convert_advertisement_short_data_and_local_name(self):
+        test_cases = [
+            # Too short
+            "0201061BFF990405",
+            "02010606095275757669",
+        ]
+        for x in test_cases:
+            data_format, encoded = DataFormats.convert_advertisement(bytes.fromhex(x))
+            assert data_format is None
+            assert encoded == b""
+            # Same as convert_data with length byte and RSSI
+            assert DataFormats.convert_data(f"{len(x) // 2:02X}{x}C4") == (None, "")
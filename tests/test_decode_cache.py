@@ -0,0 +1,79 @@
+from unittest.mock import patch
+
+from ruuvitag_sensor.adapters.dummy import BleCommunicationDummy
+from ruuvitag_sensor.decode_cache import DecodeCache, DecodeCacheStats
+from ruuvitag_sensor.decoder import get_decoder
+from ruuvitag_sensor.ruuvi import RuuviTagSensor
+
+DF5_PAYLOAD = "0512FC5394C37C0004FFFC040CAC364200CDCBB8334C884F"
+MAC = "CB:B8:33:4C:88:4F"
+
+
+def get_data(_self, _blacklist=None, _bt_device=""):
+    for rssi in ("C4", "B8", "C4"):
+        yield (MAC, f"1F0201061BFF99040512FC5394C37C0004FFFC040CAC364200CDCBB8334C884F{rssi}")
+    yield ("D5:57:97:65:88:14", "1F0201061BFF99040517B24633FFFFFFFCFFD403E4AF56388D51D55797658814B8")
+
+
+class TestDecodeCache:
+    def test_hit_updates_rssi_from_hex_payload(self):
+        cache = DecodeCache()
+        decoded = get_decoder(5).decode_data(DF5_PAYLOAD + "C4")
+
+        assert cache.get(MAC, 5, DF5_PAYLOAD + "C4") is None
+        cache.put(MAC, 5, DF5_PAYLOAD + "C4", decoded)
+        cached = cache.get(MAC, 5, DF5_PAYLOAD + "B8")
+
+        assert cached == {**decoded, "rssi": -72}
+        assert cache.stats == DecodeCacheStats(hits=1, misses=1)
+
+    def test_hit_updates_rssi_from_bytes(self):
+        cache = DecodeCache()
+        payload = memoryview(bytes.fromhex(DF5_PAYLOAD))
+        cache.put(MAC, 5, payload, get_decoder(5).decode_data(DF5_PAYLOAD + "C4"), -60)
+
+        assert cache.get(MAC, 5, memoryview(bytes.fromhex(DF5_PAYLOAD)), -50)["rssi"] == -50
+        assert cache.get("AA:BB:CC:DD:EE:FF", 5, payload, -50) is None
+
+    def test_cached_data_is_not_changed_by_caller(self):
+        cache = DecodeCache()
+        decoded = get_decoder(5).decode_data(DF5_PAYLOAD)
+        cache.put(MAC, 5, DF5_PAYLOAD, decoded)
+        decoded["temperature"] = 0
+
+        cached = cache.get(MAC, 5, DF5_PAYLOAD)
+        cached["humidity"] = 0
+
+        assert cache.get(MAC, 5, DF5_PAYLOAD)["temperature"] == 24.3
+        assert cache.get(MAC, 5, DF5_PAYLOAD)["humidity"] == 53.49
+
+    def test_least_recently_used_is_evicted(self):
+        cache = DecodeCache(maxsize=2)
+        cache.put("AA:AA:AA:AA:AA:AA", 5, DF5_PAYLOAD, {"temperature": 1})
+        cache.put("BB:BB:BB:BB:BB:BB", 5, DF5_PAYLOAD, {"temperature": 2})
+        cache.get("AA:AA:AA:AA:AA:AA", 5, DF5_PAYLOAD)
+        cache.put("CC:CC:CC:CC:CC:CC", 5, DF5_PAYLOAD, {"temperature": 3})
+
+        assert len(cache) == 2
+        assert cache.get("AA:AA:AA:AA:AA:AA", 5, DF5_PAYLOAD) is not None
+        assert cache.get("BB:BB:BB:BB:BB:BB", 5, DF5_PAYLOAD) is None
+
+
+@patch("ruuvitag_sensor.ruuvi.ble", BleCommunicationDummy())
+@patch("ruuvitag_sensor.adapters.dummy.BleCommunicationDummy.get_data", get_data)
+class TestRuuviTagSensorDecodeCache:
+    def test_get_data_with_cache(self):
+        cache = DecodeCache()
+        data = []
+        with patch.object(RuuviTagSensor, "decode_cache", cache):
+            RuuviTagSensor.get_data(data.append)
+
+        assert [sensor_data["rssi"] for _, sensor_data in data] == [-60, -72, -60, -72]
+        assert cache.stats == DecodeCacheStats(hits=2, misses=2)
+
+    def test_get_data_suppress_duplicates(self):
+        data = []
+        with patch.object(RuuviTagSensor, "decode_cache", DecodeCache(suppress_duplicates=True)):
+            RuuviTagSensor.get_data(data.append)
+
+        assert [mac for mac, _ in data] == [MAC, "D5:57:97:65:88:14"]
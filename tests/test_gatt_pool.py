@@ -0,0 +1,173 @@
+import asyncio
+
+from ruuvitag_sensor.adapters.bleak_ble import BleCommunicationBleak
+from ruuvitag_sensor.adapters.gatt_pool import GattConnection, GattConnectionPool
+
+RUUVITAG_RECORD = bytearray.fromhex("3a3010" + "6757ac00" + "00000a28")
+RUUVITAG_END = bytearray.fromhex("3a3a10ffffffffffffffff")
+
+
+class FakeClient:
+    def __init__(self, address: str, notifications: list[bytearray] | None = None):
+        self.address = address
+        self.is_connected = True
+        self.disconnects = 0
+        self.notifications = notifications or []
+        self.connection: GattConnection | None = None
+
+    async def disconnect(self):
+        self.is_connected = False
+        self.disconnects += 1
+
+    async def write_gatt_char(self, _char, _data):
+        for notification in self.notifications:
+            self.connection.on_notification(None, notification)
+
+
+def _open_connection(opened: list[str]):
+    async def open_connection(mac: str) -> GattConnection:
+        opened.append(mac)
+        return GattConnection(FakeClient(mac), None, None)
+
+    return open_connection
+
+
+async def _use(pool: GattConnectionPool, mac: str, opened: list[str], reusable: bool = True) -> GattConnection:
+    async with pool.connection(mac, _open_connection(opened)) as connection:
+        connection.reusable = reusable
+    return connection
+
+
+class TestGattConnectionPool:
+    async def test_connection_is_reused(self):
+        pool = GattConnectionPool()
+        opened: list[str] = []
+
+        first = await _use(pool, "AA", opened)
+        second = await _use(pool, "AA", opened)
+
+        assert first is second
+        assert opened == ["AA"]
+        assert first.client.disconnects == 0
+
+        await pool.close()
+        assert first.client.disconnects == 1
+        assert len(pool) == 0
+
+    async def test_not_reusable_connection_is_closed(self):
+        pool = GattConnectionPool()
+        opened: list[str] = []
+
+        connection = await _use(pool, "AA", opened, reusable=False)
+        await _use(pool, "AA", opened)
+
+        assert connection.client.disconnects == 1
+        assert opened == ["AA", "AA"]
+
+    async def test_lost_connection_is_reopened(self):
+        pool = GattConnectionPool()
+        opened: list[str] = []
+
+        connection = await _use(pool, "AA", opened)
+        connection.client.is_connected = False
+        await _use(pool, "AA", opened)
+
+        assert opened == ["AA", "AA"]
+
+    async def test_least_recently_used_connection_is_evicted(self):
+        pool = GattConnectionPool(max_connections=2)
+        opened: list[str] = []
+
+        first = await _use(pool, "AA", opened)
+        await _use(pool, "BB", opened)
+        await _use(pool, "AA", opened)
+        await _use(pool, "CC", opened)
+
+        assert opened == ["AA", "BB", "CC"]
+        assert len(pool) == 2
+        assert first.client.disconnects == 0
+        await _use(pool, "BB", opened)
+        assert opened == ["AA", "BB", "CC", "BB"]
+
+    async def test_connection_in_use_is_not_evicted(self):
+        pool = GattConnectionPool(max_connections=1)
+        opened: list[str] = []
+
+        async with pool.connection("AA", _open_connection(opened)) as first:
+            first.reusable = True
+            second = await _use(pool, "BB", opened)
+            assert first.client.disconnects == 0
+
+        assert second.client.disconnects == 1
+        assert len(pool) == 1
+
+    async def test_concurrent_evictions_close_connection_once(self):
+        pool = GattConnectionPool(max_connections=3)
+        opened: list[str] = []
+        connections = [await _use(pool, mac, opened) for mac in ("AA", "BB", "CC")]
+        for connection in connections:
+            disconnect = connection.client.disconnect
+
+            async def slow_disconnect(disconnect=disconnect):
+                await asyncio.sleep(0.01)
+                await disconnect()
+
+            connection.client.disconnect = slow_disconnect
+
+        pool.max_connections = 1
+        await asyncio.gather(_use(pool, "DD", opened), _use(pool, "EE", opened))
+
+        assert [connection.client.disconnects for connection in connections] == [1, 1, 1]
+        assert len(pool) == 1
+
+    async def test_idle_connection_is_closed(self):
+        pool = GattConnectionPool(idle_timeout_sec=0.01)
+        opened: list[str] = []
+
+        connection = await _use(pool, "AA", opened)
+        await asyncio.sleep(0.05)
+
+        assert connection.client.disconnects == 1
+        assert len(pool) == 0
+
+
+class TestBleakHistoryWithPool:
+    async def test_history_reads_share_connection(self):
+        pool = GattConnectionPool()
+        adapter = BleCommunicationBleak(connection_pool=pool)
+        clients: list[FakeClient] = []
+
+        async def open_history_connection(_self, mac, _is_ruuvi_air):
+            client = FakeClient(mac, [RUUVITAG_RECORD, RUUVITAG_END])
+            client.connection = GattConnection(client, None, None)
+            clients.append(client)
+            return client.connection
+
+        adapter._open_history_connection = open_history_connection.__get__(adapter)
+
+        for _ in range(2):
+            data = [packet async for packet in adapter.get_history_data("AA:BB:CC:DD:EE:FF")]
+            assert data == [RUUVITAG_RECORD, RUUVITAG_END]
+
+        assert len(clients) == 1
+        assert clients[0].disconnects == 0
+        await pool.close()
+
+    async def test_incomplete_read_closes_connection(self):
+        pool = GattConnectionPool()
+        adapter = BleCommunicationBleak(connection_pool=pool)
+        clients: list[FakeClient] = []
+
+        async def open_history_connection(_self, mac, _is_ruuvi_air):
+            client = FakeClient(mac, [RUUVITAG_RECORD, RUUVITAG_RECORD, RUUVITAG_END])
+            client.connection = GattConnection(client, None, None)
+            clients.append(client)
+            return client.connection
+
+        adapter._open_history_connection = open_history_connection.__get__(adapter)
+
+        data = [packet async for packet in adapter.get_history_data("AA:BB:CC:DD:EE:FF", max_items=1)]
+
+        assert data == [RUUVITAG_RECORD]
+        assert clients[0].disconnects == 1
+        assert len(pool) == 0
@@ -0,0 +1,81 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from ruuvitag_sensor.adapters.dummy import BleCommunicationAsyncDummy
+from ruuvitag_sensor.history_download import download_many, order_by_staleness
+from ruuvitag_sensor.ruuvi import RuuviTagSensor
+
+
+def test_order_by_staleness():
+    devices = {"AA": "ruuvitag", "BB": "ruuvi_air", "CC": "ruuvitag", "DD": "ruuvitag"}
+    last_downloaded = {
+        "AA": datetime(2025, 1, 3, tzinfo=timezone.utc),
+        "CC": datetime(2025, 1, 1, tzinfo=timezone.utc),
+    }
+
+    ordered = order_by_staleness(devices, last_downloaded)
+
+    assert [mac for mac, _ in ordered] == ["BB", "DD", "CC", "AA"]
+    assert ordered[0] == ("BB", "ruuvi_air")
+
+
+class TestDownloadMany:
+    async def test_concurrency_is_limited(self):
+        running = 0
+        max_running = 0
+
+        async def download(_mac, _device_type):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return [{"temperature": 20.0, "humidity": None, "pressure": None, "timestamp": 1}]
+
+        devices = [(f"MAC{i}", "ruuvitag") for i in range(6)]
+        results = [result async for result in download_many(download, devices, max_concurrent=2)]
+
+        assert max_running == 2
+        assert sorted(result.mac for result in results) == [mac for mac, _ in devices]
+        assert all(result.error is None and len(result.data) == 1 for result in results)
+
+    async def test_results_are_yielded_when_finished(self):
+        async def download(mac, _device_type):
+            await asyncio.sleep(0.05 if mac == "SLOW" else 0)
+            return []
+
+        devices = [("SLOW", "ruuvitag"), ("FAST", "ruuvitag")]
+        results = [result.mac async for result in download_many(download, devices, max_concurrent=2)]
+
+        assert results == ["FAST", "SLOW"]
+
+    async def test_failed_download_is_retried(self):
+        attempts: dict[str, int] = {}
+
+        async def download(mac, _device_type):
+            attempts[mac] = attempts.get(mac, 0) + 1
+            if mac == "BROKEN" or attempts[mac] == 1:
+                raise RuntimeError("Connection failed")
+            return []
+
+        devices = [("FLAKY", "ruuvitag"), ("BROKEN", "ruuvi_air")]
+        results = {
+            result.mac: result
+            async for result in download_many(download, devices, max_retries=2, retry_delay_sec=0.001)
+        }
+
+        assert results["FLAKY"].error is None
+        assert results["FLAKY"].attempts == 2
+        assert isinstance(results["BROKEN"].error, RuntimeError)
+        assert results["BROKEN"].attempts == 3
+
+
+@pytest.mark.asyncio
+@patch("ruuvitag_sensor.ruuvi.ble", BleCommunicationAsyncDummy())
+async def test_download_history_many_invalid_device_type():
+    with pytest.raises(ValueError, match="Invalid device_type"):
+        async for _ in RuuviTagSensor.download_history_many({"AA:BB:CC:DD:EE:FF": "sensor"}):  # type: ignore[dict-item]
+            pass
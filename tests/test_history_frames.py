@@ -0,0 +1,62 @@
+from ruuvitag_sensor.adapters.history_frames import AirHistoryFrameReassembler
+from ruuvitag_sensor.decoders import AirHistoryDecoder
+
+
+def _frame(num_records: int, record: bytes = bytes(range(38))) -> bytearray:
+    return bytearray(bytes([0x3B, 0x3B, 0x20, num_records, 38]) + record * num_records)
+
+
+class TestAirHistoryFrameReassembler:
+    def test_complete_frames_are_views_of_notification(self):
+        frames = AirHistoryFrameReassembler()
+        data = _frame(2) + _frame(1)
+
+        result = frames.feed(data)
+
+        assert [bytes(frame) for frame in result] == [bytes(_frame(2)), bytes(_frame(1))]
+        assert all(frame.obj is data for frame in result)
+        assert len(frames) == 0
+
+    def test_split_frame_is_reassembled(self):
+        frames = AirHistoryFrameReassembler()
+        data = _frame(6) + _frame(0)
+
+        result = []
+        for i in range(0, len(data), 20):
+            result.extend(frames.feed(data[i : i + 20]))
+
+        assert [bytes(frame) for frame in result] == [bytes(_frame(6)), bytes(_frame(0))]
+        assert len(frames) == 0
+
+    def test_garbage_is_skipped(self):
+        frames = AirHistoryFrameReassembler()
+
+        # Header is split between notifications
+        assert frames.feed(bytearray(b"\x01\x02\x3b\x3b")) == []
+        result = frames.feed(bytearray(b"\x20") + _frame(1)[3:])
+
+        assert [bytes(frame) for frame in result] == [bytes(_frame(1))]
+
+    def test_buffer_grows_for_large_frame(self):
+        frames = AirHistoryFrameReassembler(capacity=16)
+        data = _frame(10)
+
+        assert frames.feed(data[:100]) == []
+        result = frames.feed(data[100:])
+
+        assert [bytes(frame) for frame in result] == [bytes(data)]
+
+    def test_frames_can_be_decoded(self):
+        record = bytes.fromhex(
+            "6757ac00e112fc5394c37c0032006400500078" + "01c2" + "3219" + "ffffffffffff" + "00303900" + "ffffffffff"
+        )
+        frames = AirHistoryFrameReassembler()
+        data = _frame(2, record)
+
+        result = frames.feed(data[:50]) + frames.feed(data[50:])
+        decoded = AirHistoryDecoder().decode_data(result[0])
+
+        assert len(decoded) == 2
+        assert decoded[0]["timestamp"] == 0x6757AC00
+        assert decoded[0]["co2"] == 450
+        assert decoded[0]["measurement_sequence_number"] == 12345
@@ -0,0 +1,59 @@
+from unittest.mock import patch
+
+import pytest
+
+from ruuvitag_sensor.history_merge import HistoryRowMerger, merge_history_rows
+from ruuvitag_sensor.ruuvi import RuuviTagSensor
+
+
+def _entry(timestamp, temperature=None, humidity=None, pressure=None):
+    return {"temperature": temperature, "humidity": humidity, "pressure": pressure, "timestamp": timestamp}
+
+
+def _packet(packet_type: int, timestamp: int, value: int) -> bytearray:
+    return bytearray([0x3A, packet_type, 0x10, *timestamp.to_bytes(4, "big"), 0x00, 0x00, *value.to_bytes(2, "big")])
+
+
+class TestHistoryRowMerger:
+    def test_complete_row_is_returned_immediately(self):
+        merger = HistoryRowMerger()
+
+        assert merger.put(_entry(100, temperature=20.0)) == []
+        assert merger.put(_entry(100, humidity=40.0)) == []
+        assert merger.put(_entry(100, pressure=1000.0)) == [_entry(100, 20.0, 40.0, 1000.0)]
+        assert merger.flush() == []
+
+    def test_row_is_returned_when_timestamp_changes(self):
+        merger = HistoryRowMerger()
+
+        merger.put(_entry(100, temperature=20.0))
+        assert merger.put(_entry(200, temperature=21.0)) == [_entry(100, temperature=20.0)]
+        assert merger.flush() == [_entry(200, temperature=21.0)]
+
+
+async def test_merge_history_rows():
+    async def entries():
+        for entry in (_entry(100, temperature=20.0), _entry(100, humidity=40.0), _entry(200, pressure=1000.0)):
+            yield entry
+
+    rows = [row async for row in merge_history_rows(entries())]
+
+    assert rows == [_entry(100, temperature=20.0, humidity=40.0), _entry(200, pressure=1000.0)]
+
+
+@pytest.mark.asyncio
+async def test_get_history_async_merge_rows():
+    class Adapter:
+        async def get_history_data(self, _mac, _start_time=None, _max_items=None, **_kwargs):
+            for timestamp in (1700000000, 1700000300):
+                yield _packet(0x30, timestamp, 2430)
+                yield _packet(0x31, timestamp, 5349)
+                yield _packet(0x32, timestamp, 1000)
+
+    with (
+        patch("ruuvitag_sensor.ruuvi.ble", Adapter()),
+        patch("ruuvitag_sensor.ruuvi.throw_if_not_async_adapter"),
+    ):
+        rows = [row async for row in RuuviTagSensor.get_history_async("AA:BB:CC:DD:EE:FF", merge_rows=True)]
+
+    assert rows == [_entry(1700000000, 24.3, 53.49, 1000.0), _entry(1700000300, 24.3, 53.49, 1000.0)]
@@ -0,0 +1,102 @@
+from unittest.mock import patch
+
+import pytest
+
+from ruuvitag_sensor.adapters.dummy import BleCommunicationAsyncDummy
+from ruuvitag_sensor.history_sync import (
+    JsonWatermarkStore,
+    MemoryWatermarkStore,
+    SqliteWatermarkStore,
+    WatermarkTracker,
+)
+from ruuvitag_sensor.ruuvi import RuuviClient, RuuviTagSensor
+
+MAC = "AA:BB:CC:DD:EE:FF"
+
+
+def _entries(*timestamps):
+    return [{"temperature": 20.0, "humidity": None, "pressure": None, "timestamp": ts} for ts in timestamps]
+
+
+class TestWatermarkStores:
+    def test_json_store_is_persisted(self, tmp_path):
+        path = tmp_path / "watermarks" / "history.json"
+        store = JsonWatermarkStore(path)
+        assert store.get(MAC) is None
+
+        store.set(MAC, 1700000000)
+
+        assert JsonWatermarkStore(path).get(MAC) == 1700000000
+        assert list(path.parent.iterdir()) == [path]
+
+    def test_sqlite_store_is_persisted(self, tmp_path):
+        path = tmp_path / "history.db"
+        store = SqliteWatermarkStore(path)
+        assert store.get(MAC) is None
+
+        store.set(MAC, 1700000000)
+        store.set(MAC, 1700000300)
+        store.close()
+
+        store = SqliteWatermarkStore(path)
+        assert store.get(MAC) == 1700000300
+        store.close()
+
+
+class TestWatermarkTracker:
+    def test_entries_up_to_watermark_are_not_new(self):
+        tracker = WatermarkTracker(100)
+
+        assert [tracker.is_new(ts) for ts in (99, 100, 101)] == [False, False, True]
+
+    def test_timestamp_is_complete_when_next_timestamp_is_received(self):
+        tracker = WatermarkTracker(None)
+
+        for ts in (100, 100, 100, 200, 200):
+            tracker.is_new(ts)
+        assert tracker.complete == 100
+
+        tracker.finish()
+        assert tracker.complete == 200
+
+
+@pytest.mark.asyncio
+@patch("ruuvitag_sensor.ruuvi.ble", BleCommunicationAsyncDummy())
+class TestSyncHistory:
+    async def test_sync_continues_from_watermark(self):
+        store = MemoryWatermarkStore()
+        requested_start_times = []
+
+        async def get_history_async(_self, _mac, start_time=None, _max_items=None, **_kwargs):
+            requested_start_times.append(start_time)
+            for entry in _entries(100, 100, 200, 200, 300):
+                yield entry
+
+        with patch.object(RuuviClient, "get_history_async", get_history_async):
+            first = [entry async for entry in RuuviTagSensor.sync_history_async(MAC, store)]
+            assert store.get(MAC) == 300
+            # Device sends entries from the start time onwards, so overlapping entries are skipped
+            second = [entry async for entry in RuuviTagSensor.sync_history_async(MAC, store)]
+
+        assert len(first) == 5
+        assert second == []
+        assert requested_start_times[0] is None
+        assert requested_start_times[1].timestamp() == 300
+
+    async def test_interrupted_sync_stores_complete_timestamps(self):
+        store = MemoryWatermarkStore()
+
+        async def get_history_async(_self, _mac, _start_time=None, _max_items=None, **_kwargs):
+            for entry in _entries(100, 100, 200):
+                yield entry
+            raise RuntimeError("Connection lost")
+
+        with (
+            patch.object(RuuviClient, "get_history_async", get_history_async),
+            pytest.raises(RuntimeError),
+        ):
+            async for _ in RuuviTagSensor.sync_history_async(MAC, store):
+                pass
+
+        # Entries of 200 may be incomplete, so they are downloaded again in the next sync
+        assert store.get(MAC) == 100
@@ -0,0 +1,153 @@
+import pytest
+
+from ruuvitag_sensor.adapters.bleak_ble import BleCommunicationBleak
+from ruuvitag_sensor.adapters.gatt_pool import GattConnection
+from ruuvitag_sensor.adapters.history_transfer import (
+    AdaptiveTimeout,
+    HistoryTransferStats,
+    HistoryTransferTimeoutError,
+)
+from ruuvitag_sensor.history_sync import MemoryWatermarkStore
+from ruuvitag_sensor.ruuvi import RuuviClient
+
+HEARTBEAT = bytearray([0x05, 0x01, 0x02])
+RUUVITAG_RECORD = bytearray.fromhex("3a3010" + "6757ac00" + "00000a28")
+RUUVITAG_END = bytearray.fromhex("3a3a10ffffffffffffffff")
+
+
+class FakeClient:
+    address = "AA:BB:CC:DD:EE:FF"
+    is_connected = True
+    mtu_size = 247
+
+    def __init__(self, notifications: list[bytearray]):
+        self.notifications = notifications
+        self.connection = GattConnection(self, None, None)
+
+    async def disconnect(self):
+        pass
+
+    async def write_gatt_char(self, _char, _data):
+        for notification in self.notifications:
+            self.connection.on_notification(None, notification)
+
+
+def _adapter(notifications: list[bytearray], stats: list[HistoryTransferStats], **kwargs) -> BleCommunicationBleak:
+    adapter = BleCommunicationBleak(history_stats_callback=stats.append, **kwargs)
+
+    async def open_history_connection(_mac, _is_ruuvi_air):
+        return FakeClient(notifications).connection
+
+    adapter._open_history_connection = open_history_connection
+    return adapter
+
+
+class TestAdaptiveTimeout:
+    def test_initial_timeout_before_first_notification(self):
+        assert AdaptiveTimeout(initial_sec=10.0).timeout_sec == 10.0
+
+    def test_regular_notifications_use_minimum(self):
+        timeout = AdaptiveTimeout(initial_sec=10.0, min_sec=2.0, max_sec=10.0)
+        for i in range(20):
+            timeout.observe(i * 0.05)
+
+        assert timeout.timeout_sec == 2.0
+
+    def test_timeout_follows_gaps(self):
+        timeout = AdaptiveTimeout(initial_sec=10.0, min_sec=0.1, max_sec=10.0)
+        for i in range(20):
+            timeout.observe(i * 0.5)
+
+        assert timeout.timeout_sec == pytest.approx(0.5, abs=0.1)
+
+        timeout.observe(9.5 + 5.0)
+        assert timeout.timeout_sec > 2.0
+
+    def test_timeout_is_limited_to_maximum(self):
+        timeout = AdaptiveTimeout(initial_sec=1.0, min_sec=0.1, max_sec=5.0)
+        timeout.observe(0.0)
+        timeout.observe(30.0)
+
+        assert timeout.timeout_sec == 5.0
+
+
+class TestHistoryTransferStats:
+    def test_rates(self):
+        stats = HistoryTransferStats("AA:BB:CC:DD:EE:FF", "ruuvitag", bytes_received=2000, records=100)
+        stats.ended = stats.started + 2.0
+
+        assert stats.elapsed_sec == 2.0
+        assert stats.bytes_per_sec == 1000.0
+        assert stats.records_per_sec == 50.0
+
+    async def test_stats_of_completed_transfer(self):
+        stats: list[HistoryTransferStats] = []
+        adapter = _adapter([RUUVITAG_RECORD, HEARTBEAT, RUUVITAG_RECORD, RUUVITAG_END], stats)
+
+        data = [packet async for packet in adapter.get_history_data("AA:BB:CC:DD:EE:FF")]
+
+        assert len(data) == 3
+        assert len(stats) == 1
+        assert stats[0].notifications == 4
+        assert stats[0].bytes_received == 2 * len(RUUVITAG_RECORD) + len(HEARTBEAT) + len(RUUVITAG_END)
+        assert stats[0].heartbeats_ignored == 1
+        assert stats[0].records == 2
+        assert stats[0].mtu == 247
+        assert stats[0].finished
+        assert not stats[0].timed_out
+        assert stats[0].ended is not None
+
+    async def test_stalled_transfer_times_out(self):
+        stats: list[HistoryTransferStats] = []
+        adapter = _adapter(
+            [RUUVITAG_RECORD, RUUVITAG_RECORD],
+            stats,
+            history_timeout_sec=0.2,
+            history_min_timeout_sec=0.05,
+        )
+
+        with pytest.raises(HistoryTransferTimeoutError):
+            async for _ in adapter.get_history_data("AA:BB:CC:DD:EE:FF"):
+                pass
+
+        assert stats[0].records == 2
+        assert stats[0].timed_out
+        assert not stats[0].finished
+        assert stats[0].elapsed_sec < 0.2
+
+    async def test_stalled_download_keeps_received_entries(self):
+        records = [RUUVITAG_RECORD, RUUVITAG_RECORD]
+        adapter = _adapter(records, [], history_timeout_sec=0.2, history_min_timeout_sec=0.05)
+
+        with pytest.raises(HistoryTransferTimeoutError, match="Timeout waiting for history data") as exc_info:
+            await RuuviClient(adapter).download_history("AA:BB:CC:DD:EE:FF", timeout=300)
+
+        assert [entry["temperature"] for entry in exc_info.value.history] == [26.0, 26.0]
+
+    async def test_stalled_sync_download_keeps_received_entries(self):
+        adapter = _adapter([RUUVITAG_RECORD], [], history_timeout_sec=0.2, history_min_timeout_sec=0.05)
+        devices = {"AA:BB:CC:DD:EE:FF": "ruuvitag"}
+        client = RuuviClient(adapter)
+
+        results = [
+            result
+            async for result in client.download_history_many(
+                devices, max_retries=0, watermark_store=MemoryWatermarkStore()
+            )
+        ]
+
+        assert isinstance(results[0].error, HistoryTransferTimeoutError)
+        assert len(results[0].error.history) == 1
+
+    async def test_interrupted_transfer_does_not_complete_sync(self):
+        first = bytearray.fromhex("3a3010" + "6757ac00" + "00000a28")
+        second = bytearray.fromhex("3a3010" + "6757ad2c" + "00000a28")
+        adapter = _adapter([first, second], [], history_timeout_sec=0.2, history_min_timeout_sec=0.05)
+        store = MemoryWatermarkStore()
+
+        with pytest.raises(TimeoutError):
+            async for _ in RuuviClient(adapter).sync_history_async("AA:BB:CC:DD:EE:FF", store):
+                pass
+
+        # Entries of the last timestamp may be incomplete, so they are downloaded again in the next sync
+        assert store.get("AA:BB:CC:DD:EE:FF") == 0x6757AC00
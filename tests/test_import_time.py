@@ -0,0 +1,84 @@
+import logging
+import subprocess
+import sys
+from unittest.mock import patch
+
+import pytest
+
+import ruuvitag_sensor.log
+import ruuvitag_sensor.ruuvi
+from ruuvitag_sensor.adapters.dummy import BleCommunicationDummy
+
+# Modules that are imported only when they are used, e.g. asyncio and Bleak when scanning is started
+DEFERRED_MODULES = ("asyncio", "bleak", "importlib.metadata", "multiprocessing.managers", "numpy")
+
+
+def import_time(module: str, cwd: str | None = None) -> tuple[int, dict[str, int]]:
+    """
+    Import module in a new interpreter with python -X importtime.
+
+    Returns:
+        tuple: Cumulative import time of the module in microseconds and the cumulative times of the modules
+            imported by it. Modules that the interpreter imported at startup are not included.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=cwd,
+    )
+    # Lines are in the order the imports finish, so the modules imported by the module are listed
+    # after the previous top-level import and before the module itself
+    imports: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        if name.strip() == module and not name.startswith("  "):
+            return (int(cumulative), imports)
+        if not name.startswith("  "):
+            imports = {}
+            continue
+        imports[name.strip()] = int(cumulative)
+    raise AssertionError(f"{module} not found from import time output")
+
+
+@pytest.mark.parametrize("module", ["ruuvitag_sensor.ruuvi", "ruuvitag_sensor.decoder", "ruuvitag_sensor.log"])
+def test_import_defers_heavy_modules(module):
+    total, imports = import_time(module)
+    deferred = {name: imports[name] for name in DEFERRED_MODULES if name in imports}
+    assert not deferred, f"Importing {module} took {total} us and imported {deferred}"
+
+
+def test_import_log_does_not_create_file(tmp_path):
+    import_time("ruuvitag_sensor.log", cwd=str(tmp_path))
+    assert not list(tmp_path.iterdir())
+
+
+def test_enable_file(tmp_path):
+    filename = tmp_path / "ruuvitag_sensor.log"
+    handler = ruuvitag_sensor.log.enable_file(str(filename))
+    try:
+        assert ruuvitag_sensor.log.enable_file(str(filename)) is handler
+        logging.getLogger("ruuvitag_sensor.ruuvi").info("Not logged")
+        logging.getLogger("ruuvitag_sensor.ruuvi").error("Logged")
+    finally:
+        ruuvitag_sensor.log.log.removeHandler(handler)
+        handler.close()
+
+    lines = filename.read_text().splitlines()
+    assert len(lines) == 1
+    assert lines[0].endswith("ruuvitag_sensor.ruuvi - ERROR - Logged")
+
+
+def test_ble_adapter_is_resolved_on_first_use(monkeypatch):
+    monkeypatch.delitem(vars(ruuvitag_sensor.ruuvi), "ble", raising=False)
+    adapter = BleCommunicationDummy()
+
+    with patch("ruuvitag_sensor.ruuvi.get_ble_adapter", return_value=adapter) as get_ble_adapter:
+        assert ruuvitag_sensor.ruuvi.ble is adapter
+        assert ruuvitag_sensor.ruuvi.ble is adapter
+
+    get_ble_adapter.assert_called_once()
+    monkeypatch.delitem(vars(ruuvitag_sensor.ruuvi), "ble")
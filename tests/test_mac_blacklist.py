@@ -0,0 +1,63 @@
+from unittest.mock import patch
+
+from ruuvitag_sensor.adapters.dummy import BleCommunicationDummy
+from ruuvitag_sensor.mac_blacklist import MacBlacklist
+from ruuvitag_sensor.ruuvi import RuuviTagSensor
+
+
+class TestMacBlacklist:
+    def test_append_and_contains(self):
+        blacklist = MacBlacklist()
+        assert not blacklist
+        assert "AA:BB:CC:DD:EE:FF" not in blacklist
+
+        blacklist.append("AA:BB:CC:DD:EE:FF")
+
+        assert blacklist
+        assert "AA:BB:CC:DD:EE:FF" in blacklist
+        assert "11:22:33:44:55:66" not in blacklist
+        assert list(blacklist) == ["AA:BB:CC:DD:EE:FF"]
+
+        blacklist.remove("AA:BB:CC:DD:EE:FF")
+        assert "AA:BB:CC:DD:EE:FF" not in blacklist
+
+    @patch("ruuvitag_sensor.mac_blacklist.time.monotonic")
+    def test_ttl_expiry(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+        blacklist = MacBlacklist(ttl_sec=10)
+        blacklist.append("AA:BB:CC:DD:EE:FF")
+
+        mock_monotonic.return_value = 109.0
+        assert "AA:BB:CC:DD:EE:FF" in blacklist
+
+        mock_monotonic.return_value = 110.0
+        assert list(blacklist) == []
+        assert "AA:BB:CC:DD:EE:FF" not in blacklist
+        assert len(blacklist) == 0
+
+    def test_mac_removed_by_other_thread_during_check(self):
+        class ExpiringDict(dict):
+            def __contains__(self, key):
+                # Another thread removes the expired MAC right after a membership check
+                found = super().__contains__(key)
+                self.pop(key, None)
+                return found
+
+        blacklist = MacBlacklist(ttl_sec=10)
+        blacklist.append("AA:BB:CC:DD:EE:FF")
+        blacklist._macs = ExpiringDict(blacklist._macs)
+
+        # MAC is looked up once, so the check doesn't raise KeyError
+        assert "AA:BB:CC:DD:EE:FF" in blacklist
+
+    @patch("ruuvitag_sensor.ruuvi.ble", BleCommunicationDummy())
+    def test_local_blacklist_for_in_process_adapter(self):
+        blacklist = RuuviTagSensor._create_mac_blacklist()
+        assert isinstance(blacklist, MacBlacklist)
+
+    @patch("ruuvitag_sensor.ruuvi.ble", BleCommunicationDummy())
+    def test_parse_data_blacklists_mac(self):
+        blacklist = MacBlacklist()
+
+        assert RuuviTagSensor._parse_data(("BB:2C:6A:1E:59:3D", "some other device"), blacklist) is None
+        assert "BB:2C:6A:1E:59:3D" in blacklist
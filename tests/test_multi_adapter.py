@@ -0,0 +1,105 @@
+import asyncio
+
+from ruuvitag_sensor.multi_adapter import DuplicateFilter, merge, merge_async, tag_with_device
+
+DF5_DATA = bytes.fromhex("0513844533c43dffe0ffd804189ff645fcffeba5d102ce68")
+
+
+class TestTagWithDevice:
+    def test_bytes_data_keeps_rssi(self):
+        assert tag_with_device(("AA:AA:AA:AA:AA:AA", DF5_DATA, -60), "hci1") == (
+            "AA:AA:AA:AA:AA:AA",
+            DF5_DATA,
+            -60,
+            "hci1",
+        )
+
+    def test_hex_data_rssi_from_last_byte(self):
+        tagged = tag_with_device(("AA:AA:AA:AA:AA:AA", "1E0201060303AAFE10EE03CD"), "hci0")
+        assert tagged[2] == -51
+        assert tagged[3] == "hci0"
+
+
+class TestDuplicateFilter:
+    def test_same_data_from_other_device_is_duplicate(self):
+        duplicates = DuplicateFilter()
+
+        assert not duplicates.is_duplicate(("AA:AA:AA:AA:AA:AA", DF5_DATA, -60, "hci0"))
+        assert duplicates.is_duplicate(("AA:AA:AA:AA:AA:AA", DF5_DATA, -80, "hci1"))
+        assert not duplicates.is_duplicate(("BB:BB:BB:BB:BB:BB", DF5_DATA, -80, "hci1"))
+
+    def test_hex_data_ignores_rssi(self):
+        duplicates = DuplicateFilter()
+
+        assert not duplicates.is_duplicate(("AA:AA:AA:AA:AA:AA", "1E020106CD", -51, "hci0"))
+        assert duplicates.is_duplicate(("AA:AA:AA:AA:AA:AA", "1E020106B0", -80, "hci1"))
+
+    def test_same_data_from_same_device_is_not_duplicate(self):
+        duplicates = DuplicateFilter()
+
+        assert not duplicates.is_duplicate(("AA:AA:AA:AA:AA:AA", DF5_DATA, -60, "hci0"))
+        assert not duplicates.is_duplicate(("AA:AA:AA:AA:AA:AA", DF5_DATA, -62, "hci0"))
+        assert duplicates.is_duplicate(("AA:AA:AA:AA:AA:AA", DF5_DATA, -80, "hci1"))
+
+    def test_window_expires(self):
+        duplicates = DuplicateFilter(0)
+
+        assert not duplicates.is_duplicate(("AA:AA:AA:AA:AA:AA", DF5_DATA, -60, "hci0"))
+        assert not duplicates.is_duplicate(("AA:AA:AA:AA:AA:AA", DF5_DATA, -80, "hci1"))
+
+
+def _adapter_data(macs, rssi):
+    for mac in macs:
+        yield (mac, DF5_DATA, rssi)
+
+
+async def _adapter_data_async(macs, rssi):
+    for mac in macs:
+        await asyncio.sleep(0.01)
+        yield (mac, DF5_DATA, rssi)
+
+
+class TestMerge:
+    def test_merge_drops_duplicates(self):
+        data = list(
+            merge(
+                {
+                    "hci0": _adapter_data(["AA:AA:AA:AA:AA:AA", "BB:BB:BB:BB:BB:BB"], -60),
+                    "hci1": _adapter_data(["AA:AA:AA:AA:AA:AA", "CC:CC:CC:CC:CC:CC"], -80),
+                }
+            )
+        )
+
+        assert sorted(item[0] for item in data) == ["AA:AA:AA:AA:AA:AA", "BB:BB:BB:BB:BB:BB", "CC:CC:CC:CC:CC:CC"]
+        assert {item[3] for item in data if item[0] == "CC:CC:CC:CC:CC:CC"} == {"hci1"}
+
+    async def test_merge_async_drops_duplicates(self):
+        data = [
+            item
+            async for item in merge_async(
+                {
+                    "hci0": _adapter_data_async(["AA:AA:AA:AA:AA:AA", "BB:BB:BB:BB:BB:BB"], -60),
+                    "hci1": _adapter_data_async(["AA:AA:AA:AA:AA:AA", "CC:CC:CC:CC:CC:CC"], -80),
+                }
+            )
+        ]
+
+        assert sorted(item[0] for item in data) == ["AA:AA:AA:AA:AA:AA", "BB:BB:BB:BB:BB:BB", "CC:CC:CC:CC:CC:CC"]
+        assert [item[2:] for item in data if item[0] == "BB:BB:BB:BB:BB:BB"] == [(-60, "hci0")]
+
+    async def test_merge_async_close_stops_adapters(self):
+        stopped = []
+
+        async def data(bt_device):
+            try:
+                while True:
+                    yield ("AA:AA:AA:AA:AA:AA", DF5_DATA, -60)
+                    await asyncio.sleep(0.01)
+            finally:
+                stopped.append(bt_device)
+
+        gener = merge_async({"hci0": data("hci0"), "hci1": data("hci1")})
+        await gener.__anext__()
+        await gener.aclose()
+
+        assert sorted(stopped) == ["hci0", "hci1"]
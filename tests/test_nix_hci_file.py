@@ -0,0 +1,18 @@
+from pathlib import Path
+
+from ruuvitag_sensor.adapters.nix_hci_file import BleCommunicationNixFile
+
+CAPTURE = Path(__file__).parent / "hcidump-3.x.txt"
+
+
+class TestNixHciFile:
+    def test_get_data_from_hcidump_capture(self):
+        data = list(BleCommunicationNixFile.get_data([], str(CAPTURE)))
+
+        assert len(data) == 302
+        assert data[0] == ("E7:E7:3E:12:73:2C", "1F020106030307FE10FFA705051001000000000000011900CA03190000020A00C5")
+
+    def test_get_data_with_blacklist(self):
+        data = list(BleCommunicationNixFile.get_data(["E7:E7:3E:12:73:2C"], str(CAPTURE)))
+
+        assert all(mac != "E7:E7:3E:12:73:2C" for mac, _ in data)
@@ -0,0 +1,128 @@
+import struct
+from unittest.mock import patch
+
+import pytest
+
+from ruuvitag_sensor.adapters.nix_hci_socket import (
+    BleCommunicationNixSocketFile,
+    parse_advertising_reports,
+    read_btsnoop,
+)
+from ruuvitag_sensor.data_formats import DataFormats
+from ruuvitag_sensor.ruuvi import RuuviTagSensor
+
+DF5_AD = bytes.fromhex("0201061BFF99040512FC5394C37C0004FFFC040CAC364200CDCBB8334C884F")
+OTHER_AD = bytes.fromhex("0201060AFF4C001005031C0E1A1B")
+RUUVI_NAME_AD = bytes.fromhex("0201060609") + b"Ruuvi"
+
+
+def create_report(mac: str, data: bytes, rssi: int) -> bytes:
+    address = bytes.fromhex(mac.replace(":", ""))[::-1]
+    return struct.pack("<BB6sB", 0x00, 0x01, address, len(data)) + data + struct.pack("<b", rssi)
+
+
+def create_event(*reports: bytes) -> bytes:
+    params = bytes((0x02, len(reports))) + b"".join(reports)
+    return bytes((0x04, 0x3E, len(params))) + params
+
+
+def create_btsnoop(packets: list[bytes], datalink: int = 1002) -> bytes:
+    data = struct.pack(">8sII", b"btsnoop\x00", 1, datalink)
+    for packet in packets:
+        if datalink == 1001:
+            # Unencapsulated packets don't have the packet type, flags mark received event
+            packet = packet[1:]  # noqa: PLW2901
+        data += struct.pack(">IIIIq", len(packet), len(packet), 0x03, 0, 0) + packet
+    return data
+
+
+class TestHciParsing:
+    def test_parse_multiple_reports(self):
+        event = create_event(
+            create_report("CB:B8:33:4C:88:4F", DF5_AD, -60),
+            create_report("11:22:33:44:55:66", OTHER_AD, -90),
+        )
+
+        reports = [(mac, bytes(data), rssi) for mac, data, rssi in parse_advertising_reports(event)]
+
+        assert reports == [("CB:B8:33:4C:88:4F", DF5_AD, -60), ("11:22:33:44:55:66", OTHER_AD, -90)]
+
+    def test_parse_truncated_and_other_events(self):
+        event = create_event(create_report("CB:B8:33:4C:88:4F", DF5_AD, -60))
+
+        assert list(parse_advertising_reports(event[:-5])) == []
+        assert list(parse_advertising_reports(bytes.fromhex("040E0401010C00"))) == []
+
+    @pytest.mark.parametrize("datalink", [1001, 1002])
+    def test_read_btsnoop(self, tmp_path, datalink):
+        event = create_event(create_report("CB:B8:33:4C:88:4F", DF5_AD, -60))
+        path = tmp_path / "scan.btsnoop"
+        path.write_bytes(create_btsnoop([event, event], datalink))
+
+        with path.open("rb") as stream:
+            assert list(read_btsnoop(stream)) == [event, event]
+
+    def test_read_btsnoop_invalid_file(self, tmp_path):
+        path = tmp_path / "scan.btsnoop"
+        path.write_bytes(b"not a btsnoop file")
+
+        with path.open("rb") as stream, pytest.raises(ValueError, match="Not a btsnoop file"):
+            list(read_btsnoop(stream))
+
+
+class TestNixSocketAdapter:
+    @pytest.fixture
+    def btsnoop_file(self, tmp_path):
+        path = tmp_path / "scan.btsnoop"
+        path.write_bytes(
+            create_btsnoop(
+                [
+                    create_event(
+                        create_report("CB:B8:33:4C:88:4F", DF5_AD, -60),
+                        create_report("11:22:33:44:55:66", OTHER_AD, -90),
+                    ),
+                    create_event(create_report("CB:B8:33:4C:88:4F", DF5_AD, -62)),
+                ]
+            )
+        )
+        return str(path)
+
+    def test_get_data_bytes(self, btsnoop_file):
+        data = list(BleCommunicationNixSocketFile.get_data_bytes([], btsnoop_file))
+
+        assert data == [("CB:B8:33:4C:88:4F", DF5_AD[7:], -60), ("CB:B8:33:4C:88:4F", DF5_AD[7:], -62)]
+
+    def test_get_data_bytes_skips_advertisements_without_sensor_data(self, tmp_path):
+        path = tmp_path / "scan.btsnoop"
+        event = create_event(
+            create_report("CB:B8:33:4C:88:4F", DF5_AD[:10], -60),
+            create_report("CB:B8:33:4C:88:4F", RUUVI_NAME_AD, -60),
+            create_report("CB:B8:33:4C:88:4F", DF5_AD, -61),
+        )
+        path.write_bytes(create_btsnoop([event]))
+
+        data = list(BleCommunicationNixSocketFile.get_data_bytes([], str(path)))
+
+        assert data == [("CB:B8:33:4C:88:4F", DF5_AD[7:], -61)]
+
+    def test_get_data_hex_matches_hcidump_format(self, btsnoop_file):
+        data = list(BleCommunicationNixSocketFile.get_data(["11:22:33:44:55:66"], btsnoop_file))
+
+        assert data[0] == ("CB:B8:33:4C:88:4F", "1F" + DF5_AD.hex().upper() + "C4")
+        assert len(data) == 2
+
+    def test_get_data_with_convert_data(self, btsnoop_file):
+        _, raw = next(BleCommunicationNixSocketFile.get_data([], btsnoop_file))
+
+        assert DataFormats.convert_data(raw) == (5, DF5_AD[7:].hex().upper() + "C4")
+
+    def test_get_data_with_ruuvitag_sensor(self, btsnoop_file):
+        received = []
+        with patch("ruuvitag_sensor.ruuvi.ble", BleCommunicationNixSocketFile()):
+            RuuviTagSensor.get_data(received.append, bt_device=btsnoop_file)
+
+        assert [(mac, data["rssi"]) for mac, data in received] == [
+            ("CB:B8:33:4C:88:4F", -60),
+            ("CB:B8:33:4C:88:4F", -62),
+        ]
+        assert received[0][1]["temperature"] == 24.3
@@ -0,0 +1,83 @@
+import sys
+
+import pytest
+
+from ruuvitag_sensor.decode_cache import DecodeCache
+from ruuvitag_sensor.decoders import Df5Decoder, Df6Decoder, DfE1Decoder
+from ruuvitag_sensor.readings import SensorReading5, SensorReading6, SensorReadingE1
+
+DF5_PAYLOAD = "0512FC5394C37C0004FFFC040CAC364200CDCBB8334C884F"
+DF6_PAYLOAD = "06170C5668C79E007000C90501D9FFCD004C884F"
+DFE1_PAYLOAD = "E1170C5668C79E0065007004BD11CA00C90A0213E0ACFFFFFFDECDEE11FFFFFFFFFFCBB8334C884F"
+
+
+class TestSensorReadings:
+    @pytest.mark.parametrize(
+        ("decoder", "payload", "reading_type"),
+        [
+            (Df5Decoder(), DF5_PAYLOAD + "C6", SensorReading5),
+            (Df6Decoder(), DF6_PAYLOAD, SensorReading6),
+            (DfE1Decoder(), DFE1_PAYLOAD, SensorReadingE1),
+        ],
+    )
+    def test_reading_matches_dict(self, decoder, payload, reading_type):
+        expected = decoder.decode_data(payload)
+
+        reading = decoder.decode_reading(payload)
+
+        assert isinstance(reading, reading_type)
+        assert reading.to_dict() == expected
+        assert list(reading.to_dict()) == list(expected)
+        assert reading == expected
+        assert dict(reading) == expected
+
+    def test_reading_from_bytes(self):
+        decoder = Df5Decoder()
+
+        reading = decoder.decode_reading(memoryview(bytes.fromhex(DF5_PAYLOAD)), -58)
+
+        assert reading == decoder.decode_data(DF5_PAYLOAD + "C6")
+        assert reading.temperature == 24.3
+        assert reading["rssi"] == -58
+
+    def test_invalid_data(self):
+        assert Df5Decoder().decode_reading(bytes.fromhex("0512FC5394")) is None
+        assert Df6Decoder().decode_reading("06170C") is None
+
+    def test_reading_has_no_instance_dict(self):
+        reading = Df5Decoder().decode_reading(DF5_PAYLOAD)
+
+        assert not hasattr(reading, "__dict__")
+        assert sys.getsizeof(reading) < sys.getsizeof(reading.to_dict())
+        with pytest.raises(AttributeError):
+            reading.unknown = 1
+
+    def test_mapping_access(self):
+        reading = Df6Decoder().decode_reading(DF6_PAYLOAD)
+
+        assert reading["co2"] == reading.co2
+        assert reading.get("rssi") is None
+        assert "rssi" not in reading
+        with pytest.raises(KeyError):
+            reading["unknown"]
+        with pytest.raises(KeyError):
+            reading["data_format"] = 5
+
+    def test_device_keys(self):
+        reading = Df6Decoder().decode_reading(DF6_PAYLOAD)
+
+        reading["bt_device"] = "hci1"
+        reading["rssi"] = -70
+
+        assert reading.to_dict() == {**Df6Decoder().decode_data(DF6_PAYLOAD), "bt_device": "hci1", "rssi": -70}
+
+    def test_decode_cache(self):
+        cache = DecodeCache()
+        cache.put("AA:BB:CC:DD:EE:FF", 5, DF5_PAYLOAD + "C4", Df5Decoder().decode_reading(DF5_PAYLOAD + "C4"))
+
+        cached = cache.get("AA:BB:CC:DD:EE:FF", 5, DF5_PAYLOAD + "B8")
+        cached["temperature"] = 0
+
+        assert isinstance(cached, SensorReading5)
+        assert cached["rssi"] == -72
+        assert cache.get("AA:BB:CC:DD:EE:FF", 5, DF5_PAYLOAD)["temperature"] == 24.3
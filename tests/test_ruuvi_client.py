@@ -0,0 +1,135 @@
+import asyncio
+
+import pytest
+
+from ruuvitag_sensor.adapters import BleCommunication, BleCommunicationAsync
+from ruuvitag_sensor.decoder import Df5Decoder
+from ruuvitag_sensor.readings import SensorReading5
+from ruuvitag_sensor.ruuvi import RuuviClient
+
+DATA_A = [
+    ("EB:A5:D1:02:CE:68", "1c1bFF99040513844533c43dffe0ffd804189ff645fcffeba5d102ce68"),
+    ("CD:D4:FA:52:7A:F2", "1c1bFF990405128a423bc45fffd8ff98040cafd6497a83cdd4fa527af2"),
+]
+DATA_B = [
+    ("EC:4D:A7:95:08:6B", "1c1bFF9904050d3f5306c4df0024ffe404108f562787f1ec4da795086b"),
+]
+
+
+class Adapter(BleCommunication):
+    def __init__(self, data):
+        self.data = data
+
+    def get_first_data(self, mac, _bt_device=""):
+        return next(raw for data_mac, raw in self.data if data_mac == mac)
+
+    def get_data(self, _blacklist=None, _bt_device=""):
+        yield from self.data
+
+
+class BytesAdapter(Adapter):
+    def get_data_bytes(self, _blacklist=None, _bt_device=""):
+        for mac, raw in self.data:
+            yield (mac, _manufacturer_data(raw), -60)
+
+
+class AsyncAdapter(BleCommunicationAsync):
+    def __init__(self, data):
+        self.data = data
+
+    async def get_first_data(self, mac, _bt_device=""):
+        return next(raw for data_mac, raw in self.data if data_mac == mac)
+
+    async def get_data(self, _blacklist=None, _bt_device=""):
+        for data in self.data:
+            await asyncio.sleep(0)
+            yield data
+
+
+class AsyncBytesAdapter(AsyncAdapter):
+    async def get_data_bytes(self, _blacklist=None, _bt_device=""):
+        for mac, raw in self.data:
+            await asyncio.sleep(0)
+            yield (mac, _manufacturer_data(raw), -60)
+
+
+def _manufacturer_data(raw):
+    data = bytes.fromhex(raw)
+    return data[data.index(b"\xff\x99\x04") + 3 :]
+
+
+class TemperatureDecoder(Df5Decoder):
+    def decode_data(self, data):
+        return {"temperature": super().decode_data(data)["temperature"]}
+
+
+class HexOnlyDecoder:
+    def decode_data(self, data):
+        decoded = Df5Decoder().decode_data(data)
+        return {"temperature": decoded["temperature"], "rssi": decoded["rssi"]}
+
+
+@pytest.mark.asyncio
+async def test_clients_are_independent():
+    client_a = RuuviClient(AsyncAdapter(DATA_A), compact_readings=True)
+    client_b = RuuviClient(AsyncAdapter(DATA_B))
+
+    async def collect(client):
+        return [data async for data in client.get_data_async()]
+
+    data_a, data_b = await asyncio.gather(collect(client_a), collect(client_b))
+
+    assert [mac for mac, _ in data_a] == ["EB:A5:D1:02:CE:68", "CD:D4:FA:52:7A:F2"]
+    assert all(isinstance(sensor_data, SensorReading5) for _, sensor_data in data_a)
+    assert [mac for mac, _ in data_b] == ["EC:4D:A7:95:08:6B"]
+    assert isinstance(data_b[0][1], dict)
+
+
+def test_filters():
+    client = RuuviClient(
+        Adapter(DATA_A + DATA_B),
+        filters=[lambda _mac, data: data["temperature"] > 20, lambda mac, _data: mac != "CD:D4:FA:52:7A:F2"],
+    )
+    data = client.get_data_for_sensors(search_duration_sec=0)
+
+    assert list(data) == ["EB:A5:D1:02:CE:68"]
+
+
+@pytest.mark.parametrize("adapter_type", [Adapter, BytesAdapter])
+def test_decoders(adapter_type):
+    client = RuuviClient(adapter_type(DATA_A), decoders={5: TemperatureDecoder()})
+    received = []
+    client.get_data(received.append)
+
+    assert received == [("EB:A5:D1:02:CE:68", {"temperature": 24.98}), ("CD:D4:FA:52:7A:F2", {"temperature": 23.73})]
+
+
+@pytest.mark.asyncio
+async def test_decoder_without_decode_bytes():
+    client = RuuviClient(AsyncBytesAdapter(DATA_A), decoders={5: HexOnlyDecoder()})
+    received = [data async for data in client.get_data_async()]
+
+    assert received == [
+        ("EB:A5:D1:02:CE:68", {"temperature": 24.98, "rssi": -60}),
+        ("CD:D4:FA:52:7A:F2", {"temperature": 23.73, "rssi": -60}),
+    ]
+
+
+def test_sync_adapter_required():
+    client = RuuviClient(AsyncAdapter(DATA_A))
+
+    with pytest.raises(RuntimeError, match="Sync BLE adapter required"):
+        client.get_first_raw_data("EB:A5:D1:02:CE:68")
+
+
+@pytest.mark.asyncio
+async def test_get_history_async():
+    class HistoryAdapter(AsyncAdapter):
+        async def get_history_data(self, _mac, _start_time=None, _max_items=None, **_kwargs):
+            # Temperature 24.30 at 1700000000
+            yield bytearray.fromhex("3a30106553f1000000097e")
+
+    client = RuuviClient(HistoryAdapter([]))
+    history = [entry async for entry in client.get_history_async("EB:A5:D1:02:CE:68")]
+
+    assert history == [{"temperature": 24.3, "humidity": None, "pressure": None, "timestamp": 1700000000}]
@@ -0,0 +1,78 @@
+import asyncio
+from queue import Queue
+from threading import Thread
+from unittest.mock import patch
+
+import pytest
+from reactivex import Subject
+
+from ruuvitag_sensor.adapters.dummy import BleCommunicationAsyncDummy, BleCommunicationDummy
+from ruuvitag_sensor.ruuvi import RunFlag, RuuviTagSensor
+from ruuvitag_sensor.ruuvi_rx import RuuviTagReactive, _run_get_data_background
+
+READING_SETTINGS = ["dict", "compact_readings", "lazy_readings"]
+
+
+async def _get_data(_self, _blacklist=None, _bt_device=""):
+    yield ("EB:A5:D1:02:CE:68", "1c1bFF99040513844533c43dffe0ffd804189ff645fcffeba5d102ce68")
+    yield ("CD:D4:FA:52:7A:F2", "1c1bFF990405128a423bc45fffd8ff98040cafd6497a83cdd4fa527af2")
+    # Keep scanning until stopped
+    await asyncio.get_running_loop().create_future()
+
+
+def _get_data_sync(_self, _blacklist=None, _bt_device=""):
+    yield ("EB:A5:D1:02:CE:68", "1c1bFF99040513844533c43dffe0ffd804189ff645fcffeba5d102ce68")
+
+
+class TestRuuviTagReactive:
+    @patch("ruuvitag_sensor.ruuvi_rx.ble", BleCommunicationAsyncDummy())
+    @patch("ruuvitag_sensor.ruuvi.ble", BleCommunicationAsyncDummy())
+    @patch("ruuvitag_sensor.adapters.dummy.BleCommunicationAsyncDummy.get_data", _get_data)
+    @pytest.mark.parametrize("setting", READING_SETTINGS)
+    async def test_async_adapter_notifies_subjects_on_loop(self, setting, monkeypatch):
+        if setting != "dict":
+            monkeypatch.setattr(RuuviTagSensor, setting, True)
+        ruuvi_rx = RuuviTagReactive()
+        received = []
+        ruuvi_rx.get_subject().subscribe(received.append)
+
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        assert [mac for mac, _ in received] == ["EB:A5:D1:02:CE:68", "CD:D4:FA:52:7A:F2"]
+        assert "time" in received[0][1]
+        assert received[0][1]["temperature"] == 24.98
+
+        ruuvi_rx.stop()
+        await asyncio.sleep(0)
+        assert ruuvi_rx._task.cancelled()
+
+    def test_data_update_waits_for_data_and_stops_on_none(self):
+        queue: Queue = Queue()
+        subject: Subject = Subject()
+        received = []
+        subject.subscribe(received.append)
+        update_thread = Thread(target=RuuviTagReactive._data_update, args=([subject], queue, RunFlag()))
+        update_thread.start()
+
+        queue.put(("AA:BB:CC:DD:EE:FF", {"temperature": 20.0}))
+        queue.put(None)
+        update_thread.join(timeout=1)
+
+        assert not update_thread.is_alive()
+        assert received == [("AA:BB:CC:DD:EE:FF", {"temperature": 20.0})]
+
+    @patch("ruuvitag_sensor.ruuvi.ble", BleCommunicationDummy())
+    @patch("ruuvitag_sensor.adapters.dummy.BleCommunicationDummy.get_data", _get_data_sync)
+    @pytest.mark.parametrize("setting", READING_SETTINGS)
+    def test_background_adds_time(self, setting, monkeypatch):
+        if setting != "dict":
+            monkeypatch.setattr(RuuviTagSensor, setting, True)
+        queue: Queue = Queue()
+
+        _run_get_data_background([], queue, {"run_flag": True}, "")  # type: ignore
+
+        mac, data = queue.get_nowait()
+        assert mac == "EB:A5:D1:02:CE:68"
+        assert data["temperature"] == 24.98
+        assert "time" in data
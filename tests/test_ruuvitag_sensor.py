@@ -3,7 +3,8 @@ from unittest.mock import patch
 from pytest import raises
 
 from ruuvitag_sensor.adapters.dummy import BleCommunicationDummy
-from ruuvitag_sensor.ruuvi import RuuviTagSensor
+from ruuvitag_sensor.readings import SensorReading
+from ruuvitag_sensor.ruuvi import RunFlag, RuuviTagSensor
 from ruuvitag_sensor.ruuvitag import RuuviTag
 
 
@@ -91,9 +92,78 @@ class TestRuuviTagSensor:
         RuuviTagSensor.get_data(data.append)
         assert len(data) == 9
 
+    @patch("ruuvitag_sensor.adapters.dummy.BleCommunicationDummy.get_data", get_data)
+    def test_get_data_compact_readings(self):
+        data = []
+        RuuviTagSensor.get_data(data.append)
+        with patch.object(RuuviTagSensor, "compact_readings", True):
+            readings = []
+            RuuviTagSensor.get_data(readings.append)
+
+        assert readings == data
+        assert [isinstance(sensor_data, SensorReading) for _, sensor_data in readings].count(True) == 4
+
+    @patch("ruuvitag_sensor.adapters.dummy.BleCommunicationDummy.get_data", get_data)
+    def test_get_data_lazy_readings(self):
+        data = []
+        RuuviTagSensor.get_data(data.append)
+        with patch.object(RuuviTagSensor, "lazy_readings", True):
+            readings = []
+            RuuviTagSensor.get_data(readings.append)
+
+        assert readings == data
+        assert [
+            sensor_data["data_format"] for _, sensor_data in readings if isinstance(sensor_data, SensorReading)
+        ] == [5] * 4
+
     @patch("ruuvitag_sensor.adapters.dummy.BleCommunicationDummy.get_data", get_data)
     def test_get_data_with_macs(self):
         data = []
         macs = ["CC:2C:6A:1E:59:3D", "DD:2C:6A:1E:59:3D"]
         RuuviTagSensor.get_data(data.append, macs)
         assert len(data) == 2
+
+    def get_duplicate_data(self, _blacklist=None, _bt_device=""):
+        for temperature in ("12FC", "1300", "1304"):
+            yield ("11:2C:6A:1E:59:3D", f"1F0201061BFF990405{temperature}5394C37C0004FFFC040CAC364200CDCBB8334C884FC4")
+            yield ("D5:57:97:65:88:14", "1F0201061BFF99040517B24633FFFFFFFCFFD403E4AF56388D51D55797658814B8")
+
+    @patch("ruuvitag_sensor.adapters.dummy.BleCommunicationDummy.get_data", get_duplicate_data)
+    def test_get_data_coalesced(self):
+        data = []
+        RuuviTagSensor.get_data(data.append, coalesce_interval_sec=3600)
+        assert [mac for mac, _ in data] == ["11:2C:6A:1E:59:3D", "D5:57:97:65:88:14"]
+        assert data[0][1]["temperature"] == 24.34
+
+    def test_get_data_coalesced_delivers_pending_data_when_stopped(self):
+        run_flag = RunFlag()
+
+        def get_data(_self, _blacklist=None, _bt_device=""):
+            duplicate_data = list(self.get_duplicate_data())
+            yield from duplicate_data[:3]
+            run_flag.running = False
+            yield from duplicate_data[3:]
+
+        data = []
+        with patch.object(BleCommunicationDummy, "get_data", get_data):
+            RuuviTagSensor.get_data(data.append, run_flag=run_flag, coalesce_interval_sec=3600)
+
+        assert [mac for mac, _ in data] == ["11:2C:6A:1E:59:3D", "D5:57:97:65:88:14"]
+        assert data[0][1]["temperature"] == 24.32
+
+    @patch("ruuvitag_sensor.adapters.dummy.BleCommunicationDummy.get_data", get_duplicate_data)
+    def test_get_data_coalesced_zero_interval(self):
+        data = []
+        RuuviTagSensor.get_data(data.append, coalesce_interval_sec=0)
+        assert len(data) == 6
+
+    @patch("ruuvitag_sensor.adapters.dummy.BleCommunicationDummy.get_data", get_duplicate_data)
+    def test_get_data_from_multiple_devices(self):
+        data = []
+        RuuviTagSensor.get_data(data.append, bt_device=["hci0", "hci1"])
+        # Both devices receive the same advertisements, so the copies from the other device are dropped.
+        # Repeated advertisements of D5:57:97:65:88:14 are delivered from the device that received them first
+        assert len(data) == 6
+        assert len({sensor_data["bt_device"] for mac, sensor_data in data if mac == "D5:57:97:65:88:14"}) == 1
+        assert all(sensor_data["bt_device"] in ("hci0", "hci1") for _, sensor_data in data)
+        assert data[0][1]["rssi"] == -60
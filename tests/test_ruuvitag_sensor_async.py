@@ -6,7 +6,7 @@ import pytest
 
 from ruuvitag_sensor.adapters.dummy import BleCommunicationAsyncDummy, BleCommunicationDummy
 from ruuvitag_sensor.ruuvi import RuuviTagSensor
-from ruuvitag_sensor.ruuvi_types import MacAndRawData
+from ruuvitag_sensor.ruuvi_types import MacAndRawBytes, MacAndRawData
 from ruuvitag_sensor.ruuvitag import RuuviTagAsync
 
 
@@ -93,3 +93,56 @@ class TestRuuviTagSensorAsync:
         assert data["EB:A5:D1:02:CE:68"]["temperature"] == 24.98
         assert data["CD:D4:FA:52:7A:F2"]["temperature"] == 23.73
         assert data["CE:D6:05:F5:17:AA"]["rssi"] == -90
+
+    async def _get_data_bytes(self, _blacklist=None, _bt_device="") -> AsyncGenerator[MacAndRawBytes, None]:
+        tag_data = [
+            ("EB:A5:D1:02:CE:68", bytes.fromhex("0513844533c43dffe0ffd804189ff645fcffeba5d102ce68"), -60),
+            ("CD:D4:FA:52:7A:F2", bytes.fromhex("05128a423bc45fffd8ff98040cafd6497a83cdd4fa527af2"), -90),
+            ("AA:BB:CC:4C:88:4F", bytes.fromhex("06170C5668C79E007000C90501D9FFCD004C884F"), -70),
+            # Unknown data format is blacklisted
+            ("11:22:33:44:55:66", bytes.fromhex("0700112233"), -70),
+        ]
+
+        for data in tag_data:
+            yield data
+
+    @patch("ruuvitag_sensor.ruuvi.ble", BleCommunicationAsyncDummy())
+    @patch("ruuvitag_sensor.adapters.dummy.BleCommunicationAsyncDummy.get_data_bytes", _get_data_bytes, create=True)
+    async def test_get_data_async_with_bytes_adapter(self):
+        gener = RuuviTagSensor.get_data_async()
+        data = dict([received async for received in gener])
+
+        assert len(data) == 3
+        assert data["EB:A5:D1:02:CE:68"]["temperature"] == 24.98
+        assert data["EB:A5:D1:02:CE:68"]["rssi"] == -60
+        assert data["CD:D4:FA:52:7A:F2"]["rssi"] == -90
+        assert data["AA:BB:CC:4C:88:4F"]["temperature"] == 29.5
+
+    async def _get_duplicate_data_bytes(self, _blacklist=None, _bt_device="") -> AsyncGenerator[MacAndRawBytes, None]:
+        for rssi in (-80, -70, -60):
+            yield ("EB:A5:D1:02:CE:68", bytes.fromhex("0513844533c43dffe0ffd804189ff645fcffeba5d102ce68"), rssi)
+            yield ("CD:D4:FA:52:7A:F2", bytes.fromhex("05128a423bc45fffd8ff98040cafd6497a83cdd4fa527af2"), rssi)
+
+    @patch("ruuvitag_sensor.ruuvi.ble", BleCommunicationAsyncDummy())
+    @patch(
+        "ruuvitag_sensor.adapters.dummy.BleCommunicationAsyncDummy.get_data_bytes",
+        _get_duplicate_data_bytes,
+        create=True,
+    )
+    async def test_get_data_async_coalesced(self):
+        gener = RuuviTagSensor.get_data_async(coalesce_interval_sec=0)
+        data = [received async for received in gener]
+
+        assert [mac for mac, _ in data] == ["EB:A5:D1:02:CE:68", "CD:D4:FA:52:7A:F2"]
+        assert all(sensor_data["rssi"] == -60 for _, sensor_data in data)
+
+    @patch("ruuvitag_sensor.ruuvi.ble", BleCommunicationAsyncDummy())
+    @patch("ruuvitag_sensor.adapters.dummy.BleCommunicationAsyncDummy.get_data_bytes", _get_data_bytes, create=True)
+    async def test_get_data_async_from_multiple_devices(self):
+        gener = RuuviTagSensor.get_data_async(bt_device=["hci0", "hci1"])
+        data = [received async for received in gener]
+
+        # Both devices receive the same advertisements, so duplicates are dropped
+        assert sorted(mac for mac, _ in data) == ["AA:BB:CC:4C:88:4F", "CD:D4:FA:52:7A:F2", "EB:A5:D1:02:CE:68"]
+        assert all(sensor_data["bt_device"] in ("hci0", "hci1") for _, sensor_data in data)
+        assert {sensor_data["rssi"] for _, sensor_data in data} == {-60, -90, -70}
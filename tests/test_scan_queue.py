@@ -0,0 +1,105 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from ruuvitag_sensor.adapters.bleak_ble import BleCommunicationBleak
+from ruuvitag_sensor.adapters.scan_queue import OverflowPolicy, ScanQueue, ScanQueueStats
+
+
+async def _drain(queue: ScanQueue) -> list:
+    items = []
+    while not queue.empty():
+        items.append(await queue.get())
+    return items
+
+
+class TestScanQueue:
+    async def test_unbounded(self):
+        queue = ScanQueue()
+        for i in range(5):
+            queue.put_nowait(("AA:BB:CC:DD:EE:FF", i))
+
+        assert queue.qsize() == 5
+        assert [item[1] for item in await _drain(queue)] == [0, 1, 2, 3, 4]
+        assert queue.stats == ScanQueueStats(received=5, dropped=0)
+
+    async def test_drop_oldest(self):
+        queue = ScanQueue(2, OverflowPolicy.DROP_OLDEST)
+        for i in range(4):
+            queue.put_nowait(("AA:BB:CC:DD:EE:FF", i))
+
+        assert [item[1] for item in await _drain(queue)] == [2, 3]
+        assert queue.stats == ScanQueueStats(received=4, dropped=2)
+
+    async def test_drop_newest(self):
+        queue = ScanQueue(2, OverflowPolicy.DROP_NEWEST)
+        for i in range(4):
+            queue.put_nowait(("AA:BB:CC:DD:EE:FF", i))
+
+        assert [item[1] for item in await _drain(queue)] == [0, 1]
+        assert queue.stats == ScanQueueStats(received=4, dropped=2)
+
+    async def test_coalesce_keeps_latest_per_mac_in_place(self):
+        queue = ScanQueue(0, OverflowPolicy.COALESCE)
+        queue.put_nowait(("AA:AA:AA:AA:AA:AA", 1))
+        queue.put_nowait(("BB:BB:BB:BB:BB:BB", 2))
+        queue.put_nowait(("AA:AA:AA:AA:AA:AA", 3))
+
+        assert await _drain(queue) == [("AA:AA:AA:AA:AA:AA", 3), ("BB:BB:BB:BB:BB:BB", 2)]
+        assert queue.stats == ScanQueueStats(received=3, dropped=1)
+
+    async def test_coalesce_full_drops_oldest(self):
+        queue = ScanQueue(2, "coalesce")
+        queue.put_nowait(("AA:AA:AA:AA:AA:AA", 1))
+        queue.put_nowait(("BB:BB:BB:BB:BB:BB", 2))
+        queue.put_nowait(("CC:CC:CC:CC:CC:CC", 3))
+
+        assert await _drain(queue) == [("BB:BB:BB:BB:BB:BB", 2), ("CC:CC:CC:CC:CC:CC", 3)]
+        assert queue.stats.dropped == 1
+
+    async def test_coalesce_without_mac(self):
+        queue = ScanQueue(0, OverflowPolicy.COALESCE)
+        queue.put_nowait(("", 1))
+        queue.put_nowait(("", 2))
+
+        assert await _drain(queue) == [("", 1), ("", 2)]
+
+    async def test_get_waits_for_item(self):
+        queue = ScanQueue()
+        get_task = asyncio.create_task(queue.get())
+        await asyncio.sleep(0)
+        assert not get_task.done()
+
+        queue.put_nowait(("AA:BB:CC:DD:EE:FF", 1))
+
+        assert await asyncio.wait_for(get_task, timeout=1) == ("AA:BB:CC:DD:EE:FF", 1)
+
+
+class TestBleakScanQueue:
+    @patch("ruuvitag_sensor.adapters.bleak_ble._get_scanner")
+    async def test_scanners_have_own_queues(self, mock_get_scanner):
+        callbacks = []
+
+        def get_scanner(detection_callback, _bt_device=""):
+            callbacks.append(detection_callback)
+            return AsyncMock()
+
+        mock_get_scanner.side_effect = get_scanner
+
+        adapter = BleCommunicationBleak(queue_maxsize=1, overflow_policy=OverflowPolicy.DROP_OLDEST)
+        first = adapter.get_data_bytes()
+        second = adapter.get_data_bytes()
+        first_task = asyncio.create_task(first.__anext__())
+        second_task = asyncio.create_task(second.__anext__())
+        await asyncio.sleep(0)
+
+        for i, callback in enumerate(callbacks):
+            for rssi in (-60, -50):
+                device = MagicMock(address=f"aa:bb:cc:dd:ee:0{i}")
+                await callback(device, MagicMock(manufacturer_data={1177: b"\x05"}, rssi=rssi))
+
+        assert await asyncio.wait_for(first_task, timeout=1) == ("aa:bb:cc:dd:ee:00", b"\x05", -50)
+        assert await asyncio.wait_for(second_task, timeout=1) == ("aa:bb:cc:dd:ee:01", b"\x05", -50)
+        assert adapter.queue_stats == ScanQueueStats(received=4, dropped=2)
+
+        await first.aclose()
+        await second.aclose()